@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# ==========================================================
+# BOOTSTRAP: adiciona /src no PYTHONPATH
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parent
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from consulta_ecom.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
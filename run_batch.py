@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# ==========================================================
+# BOOTSTRAP: adiciona /src no PYTHONPATH
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parent
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from consulta_ecom.config.env import load_environment
+from consulta_ecom.runner.batch import BatchRunner, SiteLimits
+from consulta_ecom.sites.registry import create_client, get_site
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    v = os.getenv(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "sim", "y")
+
+
+def _env_int(name: str, default: int) -> int:
+    v = os.getenv(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return int(v)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    v = os.getenv(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return float(v)
+    except ValueError:
+        return default
+
+
+def _read_queries(path: str) -> List[str]:
+    text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+    out = []
+    for line in text.splitlines():
+        q = line.strip()
+        if q and not q.startswith("#"):
+            out.append(q)
+    return out
+
+
+def _site_limits(site: str, concurrency: int) -> SiteLimits:
+    prefix = site.upper()
+    return SiteLimits(
+        concurrency=_env_int(f"{prefix}_CONCURRENCY", concurrency),
+        rate_per_min=_env_float(f"{prefix}_RATE_PER_MIN", 30.0),
+        max_retries=_env_int(f"{prefix}_MAX_RETRIES", 2),
+        backoff_base=_env_float(f"{prefix}_BACKOFF_BASE", 5.0),
+    )
+
+
+async def _enrich(results: List[Any], clients: Dict[str, Any], args: argparse.Namespace, timer: Any) -> None:
+    """Páginas de produto dos itens encontrados, um enricher por site em paralelo, nos mesmos runtimes."""
+    from consulta_ecom.cache.detail_cache import DetailCache
+    from consulta_ecom.runner.enrich import AsyncDetailEnricher
+
+    cache = DetailCache(
+        root=os.getenv("DETAIL_CACHE_DIR", "data/detail_cache"),
+        ttl=_env_float("DETAIL_CACHE_TTL", 6 * 3600.0),
+    )
+    enrichers = {}
+    for site, client in clients.items():
+        items = [it for r in results if r.site == site for it in r.items]
+        if items:
+            enricher = AsyncDetailEnricher(
+                runtime=client.runtime,
+                concurrency=_env_int(f"{site.upper()}_DETAIL_CONCURRENCY", client.runtime.max_contexts),
+                cache=cache,
+                block_profile=client.block_profile,
+                timer=timer,
+            )
+            enrichers[site] = (enricher, items)
+
+    found = await asyncio.gather(*(e.enrich(items) for e, items in enrichers.values()))
+
+    print("\n================ DETALHES ================\n")
+    for site, (enricher, _) in enrichers.items():
+        print(f"🔎 {site}: {enricher.format_stats()}")
+    if args.details_out:
+        Path(args.details_out).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.details_out, "w", encoding="utf-8") as f:
+            for details in found:
+                for d in details.values():
+                    f.write(json.dumps(asdict(d), ensure_ascii=False) + "\n")
+        print(f"💾 {sum(len(d) for d in found)} detalhes em {args.details_out}")
+
+
+async def _run(sites: List[str], queries: List[str], args: argparse.Namespace) -> None:
+    headless = _env_bool("HEADLESS", True)
+    clients = {}
+    limits = {}
+    runtimes = []
+
+    # cache de páginas opt-in: retries e queries repetidas não navegam de novo
+    page_cache = None
+    cache_ttl = _env_float("PAGE_CACHE_TTL", 0.0)
+    if cache_ttl > 0:
+        from consulta_ecom.cache.page_cache import PageCache
+
+        page_cache = PageCache(
+            root=os.getenv("PAGE_CACHE_DIR", "data/page_cache"),
+            ttl=cache_ttl,
+            max_bytes=_env_int("PAGE_CACHE_MAX_MB", 200) * 1024 * 1024,
+        )
+
+    # tempos por fase: JSON lines durante a execução, Prometheus no final
+    timer = None
+    timings_jsonl = os.getenv("TIMINGS_JSONL")
+    timings_prom = os.getenv("TIMINGS_PROM")
+    if timings_jsonl or timings_prom:
+        from consulta_ecom.utils.timing import PhaseTimer
+
+        timer = PhaseTimer(jsonl_path=timings_jsonl)
+
+    db = None
+    if args.save or args.incremental:
+        from consulta_ecom.db.postgres import DatabaseManager
+
+        db = DatabaseManager()
+        db.init_db()
+
+    if "kabum" in sites:
+        limits["kabum"] = _site_limits("kabum", 4)
+        kabum = create_client(
+            "kabum",
+            use_async=True,
+            headless=headless,
+            concurrency=_env_int("KABUM_PAGE_CONCURRENCY", 2),
+            page_cache=page_cache,
+            timer=timer,
+        )
+        if db is not None and args.incremental:
+            kabum.known_prices = db.load_prices("kabum")
+        kabum.runtime = kabum.build_runtime(max_contexts=limits["kabum"].concurrency * kabum.concurrency)
+        runtimes.append(kabum.runtime)
+        clients["kabum"] = kabum
+
+    if "pichau" in sites:
+        # perfil persistente: um único context, então uma busca por vez
+        limits["pichau"] = _site_limits("pichau", 1)
+        pichau = create_client(
+            "pichau",
+            use_async=True,
+            headless=_env_bool("PICHAU_HEADLESS", False),
+            page_cache=page_cache,
+            timer=timer,
+        )
+        pichau.runtime = pichau.build_runtime()
+        runtimes.append(pichau.runtime)
+        clients["pichau"] = pichau
+
+    jobs: List[Tuple[str, str]] = [(site, q) for q in queries for site in sites if site in clients]
+    runner = BatchRunner(
+        clients,
+        limits,
+        workers=args.workers,
+        limit=args.limit,
+        max_pages=args.max_pages,
+    )
+    try:
+        report = await runner.run(jobs)
+        if args.details:
+            await _enrich(report.results, clients, args, timer)
+    finally:
+        for rt in runtimes:
+            await rt.close()
+        if timer is not None:
+            timer.close()   # spans ainda em buffer vão para TIMINGS_JSONL
+
+    print("\n================ BATCH ================\n")
+    print(report.format())
+
+    if db is not None:
+        try:
+            if args.save:
+                saved = db.save_products(report.to_batch())
+                # incremental: os conhecidos sem mudança não vêm nos itens, só o last_seen é atualizado
+                touched = db.touch(h for r in report.results for h in r.unchanged)
+                print(f"\n💾 DB: {saved} itens gravados | {touched} inalterados com last_seen atualizado")
+            elif args.incremental:
+                print(f"\n🔁 Inalterados (conhecidos, mesmo preço): {sum(len(r.unchanged) for r in report.results)}")
+        finally:
+            db.close()
+
+    if args.csv:
+        batch = report.to_batch()
+        batch.to_csv(args.csv)
+        print(f"\n💾 {len(batch)} itens em {args.csv}")
+
+    if args.best_prices > 0:
+        from consulta_ecom.matching.index import ProductMatcher, best_price_view, format_best_prices
+
+        # mesmo produto nas duas lojas -> menor preço
+        matcher = ProductMatcher()
+        for r in report.results:
+            matcher.add(r.items)
+        print("\n================ MELHOR PREÇO ================\n")
+        print(format_best_prices(best_price_view(matcher.groups()), top=args.best_prices))
+        print(f"\n🔗 {matcher.format_stats()}")
+
+    if timer is not None:
+        print(f"\n⏱️ {timer.format_summary()}")
+        if timings_prom:
+            Path(timings_prom).parent.mkdir(parents=True, exist_ok=True)
+            Path(timings_prom).write_text(timer.prometheus_text(), encoding="utf-8")
+
+
+def main() -> None:
+    env = load_environment()
+    print(f"🚀 Ambiente ativo: {env.upper()}")
+
+    # muitos workers logando: I/O do log num thread próprio (LOG_QUEUE=0 desliga)
+    os.environ.setdefault("LOG_QUEUE", "1")
+
+    parser = argparse.ArgumentParser(description="Executa várias queries em vários sites.")
+    parser.add_argument("queries", help="arquivo com uma query por linha ('-' = stdin)")
+    parser.add_argument("--sites", default=os.getenv("SITES", "kabum,pichau"))
+    parser.add_argument("--workers", type=int, default=_env_int("WORKERS", 8))
+    parser.add_argument("--limit", type=int, default=_env_int("LIMIT", 50))
+    parser.add_argument("--max-pages", type=int, default=_env_int("MAX_PAGES", 3))
+    parser.add_argument("--best-prices", type=int, default=_env_int("BEST_PRICES", 0),
+                        help="mostra os N produtos encontrados em mais de uma loja, com o menor preço")
+    parser.add_argument("--details", action="store_true", default=_env_bool("DETAILS", False),
+                        help="visita a página de cada produto novo ou com preço alterado (cache por URL)")
+    parser.add_argument("--save", action="store_true", default=_env_bool("SAVE", False),
+                        help="grava os itens no banco (DatabaseManager) no fim do batch")
+    parser.add_argument("--incremental", action="store_true", default=_env_bool("INCREMENTAL", False),
+                        help="Kabum: usa os preços do banco e devolve só itens novos ou com preço alterado")
+    parser.add_argument("--csv", default=os.getenv("BATCH_CSV"), help="grava todos os itens em CSV")
+    parser.add_argument("--details-out", default=os.getenv("DETAILS_OUT"), help="grava os detalhes em JSON lines")
+    args = parser.parse_args()
+
+    sites = [s.strip().lower() for s in args.sites.split(",") if s.strip()]
+    try:
+        for site in sites:
+            get_site(site)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    queries = _read_queries(args.queries)
+    if not queries:
+        print("⚠️ Nenhuma query informada.")
+        return
+
+    asyncio.run(_run(sites, queries, args))
+
+
+if __name__ == "__main__":
+    main()
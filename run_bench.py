@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+# ==========================================================
+# BOOTSTRAP: adiciona /src no PYTHONPATH
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parent
+SRC_DIR = ROOT_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from consulta_ecom.bench.fixtures import FixtureServer, write_synthetic_fixtures
+from consulta_ecom.bench.runner import (
+    SITES,
+    default_matrix,
+    find_regressions,
+    format_results,
+    run_config,
+    save_results,
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    v = os.getenv(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return int(v)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    v = os.getenv(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return float(v)
+    except ValueError:
+        return default
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip().lower() for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark offline: páginas gravadas servidas localmente, sem tocar nos sites reais."
+    )
+    parser.add_argument("--fixtures", default=os.getenv("BENCH_FIXTURES", "data/bench_fixtures"),
+                        help="diretório com HTML no formato do _dump_debug (vazio -> gera sintéticos)")
+    parser.add_argument("--query", action="append", dest="queries",
+                        help="query a buscar (repetível; padrão: 'controle ps5')")
+    parser.add_argument("--sites", default=",".join(SITES))
+    parser.add_argument("--modes", default="batch,html,locator", help="modos de extração da Kabum")
+    parser.add_argument("--concurrency", default="1,2,4", help="páginas em paralelo na Kabum")
+    parser.add_argument("--next-data", action="store_true",
+                        help="mede também o caminho __NEXT_DATA__ da Kabum (os modos de DOM rodam sem ele)")
+    parser.add_argument("--headed", action="store_true", help="roda também com janela (headless=False)")
+    parser.add_argument("--max-pages", type=int, default=_env_int("BENCH_MAX_PAGES", 5))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=_env_float("BENCH_LATENCY_MS", 0.0),
+                        help="latência artificial por página servida")
+    parser.add_argument("--json", dest="json_out", help="grava os resultados em JSON (serve de baseline)")
+    parser.add_argument("--baseline", help="JSON de uma rodada anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="queda máxima aceita em pág/s antes de acusar regressão (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    queries = args.queries or ["controle ps5"]
+    fixtures = Path(args.fixtures)
+    # dumps do _dump_debug vêm como .html.gz
+    if not any(fixtures.glob("*.html*")):
+        n = write_synthetic_fixtures(str(fixtures), query=queries[0], pages=args.max_pages)
+        print(f"🧪 {n} fixtures sintéticas geradas em {fixtures}")
+
+    modes = set(_csv(args.modes))
+    concurrency = [int(c) for c in _csv(args.concurrency)]
+    configs = [
+        c for c in default_matrix(_csv(args.sites), concurrency, headed=args.headed, next_data=args.next_data)
+        if c.site != "kabum" or c.extraction_mode in modes
+    ]
+
+    results = []
+    with FixtureServer(str(fixtures), latency_ms=args.latency_ms) as server:
+        print(f"🌐 Fixtures em {server.base_url} ({len(server.fixtures)} páginas)")
+        for config in configs:
+            print(f"▶️ {config.name}")
+            results.append(run_config(config, server.base_url, queries, max_pages=args.max_pages, repeat=args.repeat))
+        print(f"📦 Requests servidos: {server.requests} | sem fixture: {server.misses}")
+
+    print("\n================ BENCH ================\n")
+    print(format_results(results))
+
+    if args.json_out:
+        Path(args.json_out).parent.mkdir(parents=True, exist_ok=True)
+        save_results(results, args.json_out)
+        print(f"\n💾 Resultados: {args.json_out}")
+
+    if args.baseline:
+        regressions = find_regressions(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n🛑 Regressões (> {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ Sem regressões acima de {args.tolerance:.0%} em relação a {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import html
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from consulta_ecom.utils.debug_capture import read_debug_html
+
+# Mesmo formato do _dump_debug: <site>_<query>_p<página>_<tag>.html[.gz]
+_FIXTURE_RE = re.compile(r"^(kabum|pichau)_(.+)_p(\d+)_([^.]+)\.html(?:\.gz)?$")
+
+_EMPTY_PAGE = b"<html><body><main></main></body></html>"
+
+
+def _stamp(query: str) -> str:
+    """Chave de query tolerante a slug/acentos: 'CONTROLE-PS5' == 'controle ps5'."""
+    return re.sub(r"[^a-z0-9]+", "_", query.lower()).strip("_")
+
+
+@dataclass
+class FixtureSet:
+    """Índice de páginas gravadas por (site, query, página), com fallback por (site, página)."""
+
+    root: str
+    by_query: Dict[Tuple[str, str, int], Path] = field(default_factory=dict, init=False)
+    by_page: Dict[Tuple[str, int], Path] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        for path in sorted(Path(self.root).glob("*.html*")):
+            m = _FIXTURE_RE.match(path.name)
+            if not m:
+                continue
+            site, query, page = m.group(1), _stamp(m.group(2)), int(m.group(3))
+            self.by_query.setdefault((site, query, page), path)
+            self.by_page.setdefault((site, page), path)
+
+    def __len__(self) -> int:
+        return len(self.by_query)
+
+    def lookup(self, site: str, query: str, page: int) -> Optional[Path]:
+        return self.by_query.get((site, _stamp(query), page)) or self.by_page.get((site, page))
+
+
+def _route(path: str) -> Optional[Tuple[str, str, int]]:
+    parts = urlsplit(path)
+    qs = parse_qs(parts.query)
+    if parts.path.startswith("/busca/"):
+        slug = unquote(parts.path[len("/busca/"):]).replace("-", " ")
+        return "kabum", slug, int((qs.get("page_number") or ["1"])[0])
+    if parts.path == "/search":
+        return "pichau", (qs.get("q") or [""])[0], int((qs.get("p") or ["1"])[0])
+    return None
+
+
+class FixtureServer:
+    """
+    Servidor HTTP local (thread daemon) que responde às URLs de busca da Kabum
+    (/busca/<slug>?page_number=N) e da Pichau (/search?q=...&p=N) com as
+    páginas gravadas. `latency_ms` simula a rede; `requests` conta o que foi servido.
+    """
+
+    def __init__(self, root: str, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0) -> None:
+        self.fixtures = FixtureSet(root)
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 (API do http.server)
+                route = _route(self.path)
+                if route is None:
+                    self.send_response(204)
+                    self.end_headers()
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+                fixture = server.fixtures.lookup(*route)
+                body = read_debug_html(fixture).encode("utf-8") if fixture is not None else _EMPTY_PAGE
+                with server._lock:
+                    server.requests += 1
+                    server.misses += int(fixture is None)
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# fixtures sintéticas (quando ainda não há páginas gravadas)
+# ----------------------------------------------------------------------
+_VARIANTS = ("Branco", "Preto", "Cosmic Red", "Midnight Black", "Starlight Blue", "Edge", "Galactic Purple")
+
+
+def _kabum_card(pid: int, n: int) -> str:
+    title = f"Controle Sony DualSense PS5, Sem Fio, {_VARIANTS[n % len(_VARIANTS)]} #{pid}"
+    cash = 300 + (pid * 37) % 900
+    return (
+        f'<div class="productCard"><article>'
+        f'<a href="/produto/{pid}/controle-dualsense-{pid}"><img src="/img/{pid}.jpg">'
+        f"<span>{html.escape(title)}</span></a>"
+        f"<div><span>R$ {cash + 150},90</span><span>R$ {cash},90</span><span>À vista no PIX</span>"
+        f"<span>10x de R$ {cash // 10 + 5},99</span></div>"
+        f"</article></div>"
+    )
+
+
+def _pichau_card(pid: int, n: int) -> str:
+    title = f"Controle Sony DualSense PS5 {_VARIANTS[n % len(_VARIANTS)]} {pid}"
+    cash = 300 + (pid * 41) % 900
+    return (
+        f'<a href="/controle-dualsense-ps5-{pid}"><div class="MuiCard-root MuiPaper-root">'
+        f'<img src="/img/{pid}.jpg"><h2>{html.escape(title)}</h2>'
+        f"<div>de R$ {cash + 120},90 por:</div><div>R$ {cash},90</div><div>à vista</div>"
+        f"<div>em até 12x de R$ {cash // 12 + 3},49</div>"
+        f"</div></a>"
+    )
+
+
+def write_synthetic_fixtures(
+    root: str,
+    query: str = "controle ps5",
+    pages: int = 5,
+    kabum_cards: int = 100,
+    pichau_cards: int = 36,
+) -> int:
+    """Gera páginas no formato do _dump_debug para as duas lojas. Retorna quantos arquivos."""
+    out = Path(root)
+    out.mkdir(parents=True, exist_ok=True)
+    stamp = _stamp(query)
+    written = 0
+    for page in range(1, pages + 1):
+        kabum = "".join(_kabum_card(page * 1000 + i, i) for i in range(kabum_cards))
+        (out / f"kabum_{stamp}_p{page}_fixture.html").write_text(
+            f"<html><body><main>{kabum}</main></body></html>", encoding="utf-8"
+        )
+        pichau = "".join(_pichau_card(page * 1000 + i, i) for i in range(pichau_cards))
+        (out / f"pichau_{stamp}_p{page}_fixture.html").write_text(
+            f"<html><body><div id='grid'>{pichau}</div></body></html>", encoding="utf-8"
+        )
+        written += 2
+    return written
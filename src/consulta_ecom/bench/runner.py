@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from consulta_ecom.sites.registry import create_client
+from consulta_ecom.utils.timing import PhaseTimer, percentile
+
+SITES = ("kabum", "pichau")
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    site: str
+    headless: bool = True
+    extraction_mode: str = "batch"       # só Kabum: batch | html | locator
+    concurrency: int = 1                 # só Kabum: páginas em paralelo
+    # só Kabum: lê o __NEXT_DATA__ do HTML do servidor antes do DOM. Desligado
+    # por padrão: com ele, fixtures com o JSON medem o mesmo caminho nos três modos
+    next_data: bool = False
+
+    @property
+    def name(self) -> str:
+        parts = [self.site, "headless" if self.headless else "headed"]
+        if self.site == "kabum":
+            parts += [self.extraction_mode, f"c{self.concurrency}"]
+            if self.next_data:
+                parts.append("next_data")
+        return "/".join(parts)
+
+
+@dataclass
+class BenchResult:
+    config: BenchConfig
+    wall: float = 0.0                    # segundos, só buscas (sem launch do browser)
+    pages: int = 0
+    items: int = 0
+    peak_rss_mb: float = 0.0
+    phases: Dict[str, Dict[str, float]] = field(default_factory=dict)   # fase -> {n, avg_ms, p95_ms}
+    error: Optional[str] = None
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.wall if self.wall else 0.0
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.items / self.wall if self.wall else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["name"] = self.config.name
+        d["pages_per_sec"] = round(self.pages_per_sec, 3)
+        d["items_per_sec"] = round(self.items_per_sec, 3)
+        return d
+
+
+def _phase_stats(timer: PhaseTimer) -> Dict[str, Dict[str, float]]:
+    by_phase: Dict[str, List[float]] = {}
+    for span in timer.spans():
+        by_phase.setdefault(span.phase, []).append(span.seconds)
+    return {
+        phase: {
+            "n": len(vals),
+            "avg_ms": round(sum(vals) / len(vals) * 1000, 1),
+            "p95_ms": round(percentile(vals, 95) * 1000, 1),
+        }
+        for phase, vals in sorted(by_phase.items())
+    }
+
+
+class _RssSampler:
+    """
+    Pico de RSS do processo + filhos (Chromium roda em processos próprios).
+    Com psutil amostra a árvore inteira; sem ele, cai no ru_maxrss deste
+    processo, e sem os dois (Windows sem psutil) reporta 0.
+    """
+
+    def __init__(self, interval: float = 0.2) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        try:
+            import psutil  # opcional
+
+            self._proc: Any = psutil.Process(os.getpid())
+        except ImportError:
+            self._proc = None
+
+    def _sample(self) -> int:
+        if self._proc is None:
+            try:
+                import resource  # só Unix
+            except ImportError:
+                return 0
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return rss if sys.platform == "darwin" else rss * 1024
+        total = 0
+        for p in [self._proc, *self._proc.children(recursive=True)]:
+            try:
+                total += p.memory_info().rss
+            except Exception:
+                continue
+        return total
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self._sample())
+
+    def __enter__(self) -> "_RssSampler":
+        self.peak = self._sample()
+        self._thread = threading.Thread(target=self._loop, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak = max(self.peak, self._sample())
+
+
+def _build_client(config: BenchConfig, base_url: str, timer: PhaseTimer, profile_dir: str) -> Any:
+    common: Dict[str, Any] = dict(headless=config.headless, log_console=False, debug_enabled=False, timer=timer)
+    if config.site == "kabum":
+        client = create_client(
+            "kabum",
+            base_url=base_url,
+            extraction_mode=config.extraction_mode,
+            concurrency=config.concurrency,
+            next_data=config.next_data,
+            **common,
+        )
+    elif config.site == "pichau":
+        client = create_client("pichau", BASE_URL=base_url, USER_DATA_DIR=profile_dir, **common)
+    else:
+        raise ValueError(f"Site sem benchmark: {config.site!r}")
+    client.runtime = client.build_runtime()
+    return client
+
+
+def run_config(
+    config: BenchConfig,
+    base_url: str,
+    queries: Sequence[str],
+    max_pages: int = 5,
+    repeat: int = 1,
+) -> BenchResult:
+    """Roda as queries `repeat` vezes com um runtime já aquecido e mede o conjunto."""
+    result = BenchResult(config)
+    timer = PhaseTimer()
+    with tempfile.TemporaryDirectory(prefix="bench_profile_") as profile_dir:
+        client = _build_client(config, base_url, timer, profile_dir)
+        try:
+            client.runtime.warm_up()
+            with _RssSampler() as rss:
+                t0 = time.perf_counter()
+                for _ in range(repeat):
+                    for query in queries:
+                        report = client.search_report(query, limit=100_000, max_pages=max_pages)
+                        result.pages += len(report.links_per_page)
+                        result.items += len(report.items)
+                result.wall = time.perf_counter() - t0
+            result.peak_rss_mb = round(rss.peak / (1024 * 1024), 1)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            client.runtime.close()
+    result.phases = _phase_stats(timer)
+    return result
+
+
+def default_matrix(
+    sites: Sequence[str] = SITES,
+    concurrency: Sequence[int] = (1, 2, 4),
+    headed: bool = False,
+    next_data: bool = False,
+) -> List[BenchConfig]:
+    """Kabum: os três modos de DOM; com `next_data`, também o caminho JSON (fallback batch)."""
+    modes = [True, False] if headed else [True]
+    configs: List[BenchConfig] = []
+    for headless in modes:
+        if "kabum" in sites:
+            for mode in ("batch", "html", "locator"):
+                for c in concurrency:
+                    configs.append(BenchConfig("kabum", headless, mode, c))
+            if next_data:
+                for c in concurrency:
+                    configs.append(BenchConfig("kabum", headless, "batch", c, next_data=True))
+        if "pichau" in sites:
+            configs.append(BenchConfig("pichau", headless))
+    return configs
+
+
+def format_results(results: Sequence[BenchResult]) -> str:
+    header = f"{'config':<28} {'pág':>5} {'itens':>6} {'pág/s':>7} {'itens/s':>8} {'RSS MB':>7}  fases (avg/p95 ms)"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.config.name:<28} ERRO: {r.error}")
+            continue
+        phases = " ".join(
+            f"{ph}={st['avg_ms']:.0f}/{st['p95_ms']:.0f}"
+            for ph, st in r.phases.items()
+            if ph in ("goto", "networkidle", "render", "extract", "page")
+        )
+        rss = f"{r.peak_rss_mb:>7.0f}" if r.peak_rss_mb else f"{'n/a':>7}"
+        lines.append(
+            f"{r.config.name:<28} {r.pages:>5} {r.items:>6} {r.pages_per_sec:>7.2f} "
+            f"{r.items_per_sec:>8.1f} {rss}  {phases}"
+        )
+    return "\n".join(lines)
+
+
+def save_results(results: Sequence[BenchResult], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump([r.to_dict() for r in results], fh, ensure_ascii=False, indent=2)
+
+
+def find_regressions(results: Sequence[BenchResult], baseline_path: str, tolerance: float = 0.15) -> List[str]:
+    """Configs cujo pages/sec caiu mais que `tolerance` em relação ao baseline (JSON de save_results)."""
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = {row["name"]: row for row in json.load(fh)}
+
+    out: List[str] = []
+    for r in results:
+        base = baseline.get(r.config.name)
+        if base is None or r.error or not base.get("pages_per_sec"):
+            continue
+        drop = 1.0 - r.pages_per_sec / base["pages_per_sec"]
+        if drop > tolerance:
+            out.append(
+                f"{r.config.name}: {r.pages_per_sec:.2f} pág/s vs baseline {base['pages_per_sec']:.2f} (-{drop:.0%})"
+            )
+    return out
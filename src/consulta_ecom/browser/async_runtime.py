@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from consulta_ecom.utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+
+class _Slot:
+    __slots__ = ("context", "page", "navs")
+
+    def __init__(self, context: BrowserContext, page: Page) -> None:
+        self.context = context
+        self.page = page
+        self.navs = 0
+
+
+@dataclass
+class AsyncBrowserRuntime:
+    """
+    Equivalente asyncio do BrowserRuntime: um único Chromium no event loop e
+    um pool de até `max_contexts` contexts emprestados via `async with page()`.
+    """
+
+    headless: bool = True
+    max_contexts: int = 4
+    recycle_after: int = 50               # navegações por context antes de reciclar (0 = nunca)
+    launch_args: List[str] = field(default_factory=list)
+    context_options: Dict[str, Any] = field(default_factory=dict)
+    user_data_dir: Optional[str] = None   # perfil persistente (força max_contexts=1)
+    log_level: str = "INFO"
+    log_file: str = "logs/consulta_ecom.log"
+    log_console: bool = True
+
+    def __post_init__(self) -> None:
+        self.logger = setup_logger(
+            name="AsyncBrowserRuntime",
+            level=self.log_level,
+            log_file=self.log_file,
+            console=self.log_console,
+        )
+        if self.user_data_dir and self.max_contexts != 1:
+            self.logger.warning("Perfil persistente não pode ser compartilhado: max_contexts=1")
+            self.max_contexts = 1
+        self.max_contexts = max(1, self.max_contexts)
+
+        self._pw: Any = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[_Slot] = []
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+        self.stats: Dict[str, int] = {
+            "launches": 0,
+            "contexts": 0,
+            "recycles": 0,
+            "navigations": 0,
+            "jobs": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # ciclo de vida
+    # ------------------------------------------------------------------
+    async def start(self) -> "AsyncBrowserRuntime":
+        if self._closed:
+            raise RuntimeError("AsyncBrowserRuntime já foi encerrado")
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._pw is None:
+                from playwright.async_api import async_playwright
+
+                self._pw = await async_playwright().start()
+                self._sem = asyncio.Semaphore(self.max_contexts)
+                if not self.user_data_dir:
+                    self._browser = await self._pw.chromium.launch(headless=self.headless, args=self.launch_args)
+                    self.stats["launches"] += 1
+        return self
+
+    async def warm_up(self) -> None:
+        t0 = time.perf_counter()
+        await self.start()
+        missing = self.max_contexts - len(self._idle)
+        slots = await asyncio.gather(*(self._open_slot() for _ in range(max(0, missing))))
+        self._idle.extend(slots)
+        self.logger.info(
+            f"Runtime aquecido: {len(self._idle)} contexts em {(time.perf_counter() - t0) * 1000:.0f} ms"
+        )
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for slot in idle:
+            await self._close_slot(slot)
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            await self._pw.stop()
+        self.logger.info(f"Runtime encerrado | stats={self.stats}")
+
+    async def __aenter__(self) -> "AsyncBrowserRuntime":
+        return await self.start()
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------
+    # empréstimo de pages
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        await self.start()
+        assert self._sem is not None
+        async with self._sem:
+            slot = self._idle.pop() if self._idle else await self._open_slot()
+            keep = False
+            try:
+                if slot.page.is_closed():
+                    slot.page = await slot.context.new_page()
+                    self._watch_navigations(slot)
+                self.stats["jobs"] += 1
+                yield slot.page
+                keep = True
+            finally:
+                if keep and self.recycle_after and slot.navs >= self.recycle_after:
+                    self.logger.info(f"Reciclando context após {slot.navs} navegações")
+                    self.stats["recycles"] += 1
+                    keep = False
+                if keep and not self._closed:
+                    self._idle.append(slot)
+                else:
+                    await self._close_slot(slot)
+
+    async def _open_slot(self) -> _Slot:
+        if self.user_data_dir:
+            context = await self._pw.chromium.launch_persistent_context(
+                user_data_dir=self.user_data_dir,
+                headless=self.headless,
+                args=self.launch_args,
+                **self.context_options,
+            )
+            self.stats["launches"] += 1
+            page = context.pages[0] if context.pages else await context.new_page()
+        else:
+            assert self._browser is not None
+            context = await self._browser.new_context(**self.context_options)
+            page = await context.new_page()
+
+        self.stats["contexts"] += 1
+        slot = _Slot(context, page)
+        self._watch_navigations(slot)
+        return slot
+
+    def _watch_navigations(self, slot: _Slot) -> None:
+        def on_nav(frame: Any) -> None:
+            if frame.parent_frame is None:
+                slot.navs += 1
+                self.stats["navigations"] += 1
+
+        slot.page.on("framenavigated", on_nav)
+
+    async def _close_slot(self, slot: _Slot) -> None:
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
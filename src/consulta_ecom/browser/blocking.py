@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import re
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+# Domínios de analytics/ads/tracking que nunca influenciam a extração.
+TRACKER_PATTERNS: Tuple[str, ...] = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"googleadservices\.com",
+    r"doubleclick\.net",
+    r"googlesyndication\.com",
+    r"facebook\.(?:net|com)/.*(?:tr|fbevents)",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"criteo\.(?:com|net)",
+    r"tiktok\.com",
+    r"taboola\.com",
+    r"outbrain\.com",
+    r"bing\.com/bat",
+    r"sentry\.io",
+    r"newrelic\.com|nr-data\.net",
+    r"rtbhouse\.com",
+)
+
+# Tamanho médio assumido (bytes) por tipo quando ainda não há amostra real.
+DEFAULT_SIZE_ESTIMATE: Dict[str, int] = {
+    "image": 45_000,
+    "media": 400_000,
+    "font": 35_000,
+    "stylesheet": 25_000,
+    "script": 30_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+
+def _compile(patterns: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    """
+    Regras de bloqueio por site. `allow_patterns` tem precedência sobre tudo;
+    depois `deny_patterns` (URL) e `block_types` (resource_type do Playwright).
+    """
+
+    name: str = "default"
+    block_types: FrozenSet[str] = frozenset({"image", "media", "font"})
+    deny_patterns: Tuple[str, ...] = TRACKER_PATTERNS
+    allow_patterns: Tuple[str, ...] = ()
+    _deny_re: Optional["re.Pattern[str]"] = field(default=None, init=False, repr=False, compare=False)
+    _allow_re: Optional["re.Pattern[str]"] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_deny_re", _compile(self.deny_patterns))
+        object.__setattr__(self, "_allow_re", _compile(self.allow_patterns))
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if self._allow_re is not None and self._allow_re.search(url):
+            return False
+        if resource_type in self.block_types:
+            return True
+        return self._deny_re is not None and self._deny_re.search(url) is not None
+
+
+class RequestCounter:
+    """Contadores de uma page; reset() a cada navegação para obter números por página."""
+
+    def __init__(self, profile: BlockProfile) -> None:
+        self.profile = profile
+        self._avg_bytes: Dict[str, Tuple[int, int]] = {}  # tipo -> (soma, n) das respostas permitidas
+        self.reset()
+
+    def reset(self) -> None:
+        self.allowed = 0
+        self.blocked = 0
+        self.bytes_allowed = 0
+        self.bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "profile": self.profile.name,
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "bytes_allowed": self.bytes_allowed,
+            "bytes_saved_est": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+    def _estimate(self, resource_type: str) -> int:
+        total, n = self._avg_bytes.get(resource_type, (0, 0))
+        if n:
+            return total // n
+        return DEFAULT_SIZE_ESTIMATE.get(resource_type, DEFAULT_SIZE_ESTIMATE["other"])
+
+    def _decide(self, request: Any) -> bool:
+        rtype = request.resource_type
+        if self.profile.should_block(rtype, request.url):
+            self.blocked += 1
+            self.blocked_by_type[rtype] = self.blocked_by_type.get(rtype, 0) + 1
+            self.bytes_saved += self._estimate(rtype)
+            return True
+        self.allowed += 1
+        return False
+
+    def on_route(self, route: Any, request: Any) -> None:
+        if self._decide(request):
+            route.abort()
+        else:
+            route.continue_()
+
+    async def on_route_async(self, route: Any, request: Any) -> None:
+        if self._decide(request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def on_response(self, response: Any) -> None:
+        try:
+            size = int(response.headers.get("content-length") or 0)
+        except (TypeError, ValueError):
+            return
+        if size <= 0:
+            return
+        self.bytes_allowed += size
+        rtype = response.request.resource_type
+        total, n = self._avg_bytes.get(rtype, (0, 0))
+        self._avg_bytes[rtype] = (total + size, n + 1)
+
+
+_COUNTERS: "weakref.WeakKeyDictionary[Any, RequestCounter]" = weakref.WeakKeyDictionary()
+
+
+def install_blocking(page: Any, profile: BlockProfile) -> RequestCounter:
+    """Instala a interceptação na page (uma vez) e devolve o contador dela."""
+    counter = _COUNTERS.get(page)
+    if counter is not None and counter.profile == profile:
+        return counter
+    if counter is not None:
+        page.unroute("**/*", counter.on_route)
+        page.remove_listener("response", counter.on_response)
+
+    counter = RequestCounter(profile)
+    page.route("**/*", counter.on_route)
+    page.on("response", counter.on_response)
+    _COUNTERS[page] = counter
+    return counter
+
+
+async def install_blocking_async(page: Any, profile: BlockProfile) -> RequestCounter:
+    """Versão para playwright.async_api de install_blocking()."""
+    counter = _COUNTERS.get(page)
+    if counter is not None and counter.profile == profile:
+        return counter
+    if counter is not None:
+        await page.unroute("**/*", counter.on_route_async)
+        page.remove_listener("response", counter.on_response)
+
+    counter = RequestCounter(profile)
+    await page.route("**/*", counter.on_route_async)
+    page.on("response", counter.on_response)
+    _COUNTERS[page] = counter
+    return counter
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    return (
+        f"rede[{stats['profile']}]: permitidos={stats['allowed']} | bloqueados={stats['blocked']} "
+        f"| baixados={stats['bytes_allowed'] / 1024:.0f} KB | economia≈{stats['bytes_saved_est'] / 1024:.0f} KB"
+    )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, List
+
+# Roda inteiro dentro da página (um único evaluate, sem round-trips de polling):
+# conta os cards a cada `poll`, um MutationObserver marca a última mudança no
+# DOM e a página é dada como pronta quando a contagem parou de subir e o DOM
+# ficou quieto. Só rola a página enquanto o scroll anterior trouxe cards novos.
+_READY_JS = r"""
+async ([sel, expected, uniqueAttr, quietMs, stableMs, timeoutMs, pollMs, maxScrolls, scrollPx]) => {
+  const t0 = performance.now();
+  const count = () => {
+    const els = document.querySelectorAll(sel);
+    if (!uniqueAttr) return els.length;
+    const seen = new Set();
+    for (const el of els) {
+      const v = el.getAttribute(uniqueAttr);
+      if (v) seen.add(v);
+    }
+    return seen.size;
+  };
+  const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+
+  let lastMutation = performance.now();
+  const obs = new MutationObserver(() => { lastMutation = performance.now(); });
+  obs.observe(document, { childList: true, subtree: true, characterData: true });
+
+  let n = count(), changedAt = performance.now(), base = -1, scrolls = 0, reason = "timeout";
+  try {
+    while (performance.now() - t0 < timeoutMs) {
+      await sleep(pollMs);
+      const now = performance.now();
+      const c = count();
+      if (c !== n) { n = c; changedAt = now; continue; }
+      // DOM ainda mexendo (preços hidratando, cards entrando): espera
+      if (now - lastMutation < quietMs && now - changedAt < stableMs) continue;
+
+      if (n > 0 && expected > 0 && n >= expected) { reason = "full"; break; }
+      if (n > 0 && (scrolls >= maxScrolls || (scrolls > 0 && n === base))) { reason = "stable"; break; }
+      if (scrolls >= maxScrolls) continue;  // nada renderizou: só resta esperar o timeout
+
+      base = n;
+      window.scrollBy(0, scrollPx);
+      scrolls += 1;
+      lastMutation = changedAt = performance.now();
+    }
+  } finally {
+    obs.disconnect();
+  }
+  return { reason, count: n, scrolls, elapsed: performance.now() - t0 };
+}
+"""
+
+
+@dataclass(frozen=True)
+class ReadyConfig:
+    """
+    Quando considerar uma página de busca pronta para extração.
+    `expected` = cards esperados (page_size); 0 quando não se sabe.
+    `unique_attr` conta valores distintos do atributo (ex.: href) em vez de
+    elementos, para cards com mais de um link para o mesmo produto.
+    """
+
+    selector: str
+    expected: int = 0
+    unique_attr: str = ""
+    quiet_ms: int = 400                   # DOM sem mutações por esse tempo = quieto
+    stable_ms: int = 1500                 # contagem parada por esse tempo basta (páginas com carrossel nunca ficam quietas)
+    timeout_ms: int = 15000
+    poll_ms: int = 100
+    max_scrolls: int = 8
+    scroll_px: int = 2600
+
+    def _args(self, timeout_ms: float) -> List[Any]:
+        return [
+            self.selector,
+            self.expected,
+            self.unique_attr,
+            self.quiet_ms,
+            self.stable_ms,
+            max(0, int(timeout_ms)),
+            self.poll_ms,
+            self.max_scrolls,
+            self.scroll_px,
+        ]
+
+
+@dataclass(frozen=True)
+class ReadyResult:
+    reason: str                           # full | stable | timeout | error
+    count: int = 0
+    scrolls: int = 0
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.count > 0
+
+    def describe(self) -> str:
+        return f"pronta em {self.elapsed_ms:.0f} ms ({self.reason}, cards={self.count}, scrolls={self.scrolls})"
+
+
+def _result(payload: Any, t0: float) -> ReadyResult:
+    payload = payload or {}
+    return ReadyResult(
+        reason=str(payload.get("reason") or "timeout"),
+        count=int(payload.get("count") or 0),
+        scrolls=int(payload.get("scrolls") or 0),
+        elapsed_ms=(time.perf_counter() - t0) * 1000,
+    )
+
+
+def wait_ready(page: Any, config: ReadyConfig) -> ReadyResult:
+    """
+    Espera a página ficar pronta segundo `config`. Se o evaluate cair por
+    navegação no meio (redirect, desafio do Cloudflare), espera o novo
+    documento e tenta mais uma vez com o tempo que sobrou.
+    """
+    t0 = time.perf_counter()
+    for attempt in range(2):
+        remaining = config.timeout_ms - (time.perf_counter() - t0) * 1000
+        try:
+            return _result(page.evaluate(_READY_JS, config._args(remaining)), t0)
+        except Exception:
+            remaining = config.timeout_ms - (time.perf_counter() - t0) * 1000
+            if attempt or remaining <= 0:
+                break
+            try:
+                page.wait_for_load_state("domcontentloaded", timeout=remaining)
+            except Exception:
+                break
+    return ReadyResult("error", elapsed_ms=(time.perf_counter() - t0) * 1000)
+
+
+async def wait_ready_async(page: Any, config: ReadyConfig) -> ReadyResult:
+    """Versão playwright.async_api de wait_ready."""
+    t0 = time.perf_counter()
+    for attempt in range(2):
+        remaining = config.timeout_ms - (time.perf_counter() - t0) * 1000
+        try:
+            return _result(await page.evaluate(_READY_JS, config._args(remaining)), t0)
+        except Exception:
+            remaining = config.timeout_ms - (time.perf_counter() - t0) * 1000
+            if attempt or remaining <= 0:
+                break
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=remaining)
+            except Exception:
+                break
+    return ReadyResult("error", elapsed_ms=(time.perf_counter() - t0) * 1000)
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, TypeVar
+
+from consulta_ecom.utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+@dataclass
+class BrowserRuntime:
+    """
+    Browser de vida longa compartilhado entre várias chamadas de search().
+
+    A sync API do Playwright é presa à thread que a iniciou, então cada slot
+    (até `max_contexts`) é uma thread com o próprio Chromium + context + page.
+    Os clients emprestam uma page enviando jobs `fn(page)` via submit()/run();
+    qualquer slot livre executa o próximo job da fila.
+    """
+
+    headless: bool = True
+    max_contexts: int = 2
+    recycle_after: int = 50               # navegações por context antes de reciclar (0 = nunca)
+    launch_args: List[str] = field(default_factory=list)
+    context_options: Dict[str, Any] = field(default_factory=dict)
+    user_data_dir: Optional[str] = None   # perfil persistente (força max_contexts=1)
+    log_level: str = "INFO"
+    log_file: str = "logs/consulta_ecom.log"
+    log_console: bool = True
+
+    def __post_init__(self) -> None:
+        self.logger = setup_logger(
+            name="BrowserRuntime",
+            level=self.log_level,
+            log_file=self.log_file,
+            console=self.log_console,
+        )
+        if self.user_data_dir and self.max_contexts != 1:
+            self.logger.warning("Perfil persistente não pode ser compartilhado: max_contexts=1")
+            self.max_contexts = 1
+        self.max_contexts = max(1, self.max_contexts)
+
+        self._jobs: "queue.Queue[object]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._slots: List[tuple[threading.Thread, threading.Event]] = []
+        self._closed = False
+        self.stats: Dict[str, int] = {
+            "launches": 0,
+            "contexts": 0,
+            "recycles": 0,
+            "navigations": 0,
+            "jobs": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # ciclo de vida
+    # ------------------------------------------------------------------
+    def start(self) -> "BrowserRuntime":
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserRuntime já foi encerrado")
+            while len(self._slots) < self.max_contexts:
+                ready = threading.Event()
+                t = threading.Thread(
+                    target=self._slot_loop,
+                    args=(len(self._slots), ready),
+                    name=f"browser-slot-{len(self._slots)}",
+                    daemon=True,
+                )
+                self._slots.append((t, ready))
+                t.start()
+        return self
+
+    def warm_up(self, timeout: float = 60.0) -> None:
+        t0 = time.perf_counter()
+        self.start()
+        for _, ready in self._slots:
+            ready.wait(timeout)
+        self.logger.info(
+            f"Runtime aquecido: {len(self._slots)} contexts em {(time.perf_counter() - t0) * 1000:.0f} ms"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            slots = list(self._slots)
+        for _ in slots:
+            self._jobs.put(_STOP)
+        for t, _ in slots:
+            t.join()
+        self.logger.info(f"Runtime encerrado | stats={self.stats}")
+
+    def __enter__(self) -> "BrowserRuntime":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # empréstimo de pages
+    # ------------------------------------------------------------------
+    def submit(self, fn: Callable[[Page], T]) -> "Future[T]":
+        if self._closed:
+            raise RuntimeError("BrowserRuntime já foi encerrado")
+        self.start()
+        fut: "Future[T]" = Future()
+        self._jobs.put((fn, fut))
+        return fut
+
+    def run(self, fn: Callable[[Page], T]) -> T:
+        return self.submit(fn).result()
+
+    # ------------------------------------------------------------------
+    # slot (thread dona do browser)
+    # ------------------------------------------------------------------
+    def _slot_loop(self, idx: int, ready: threading.Event) -> None:
+        pw: Any = None
+        slot: Dict[str, Any] = {"browser": None, "context": None, "page": None, "navs": 0}
+
+        try:
+            try:
+                # Playwright só é importado quando um slot sobe de fato
+                from playwright.sync_api import sync_playwright
+
+                pw = sync_playwright().start()
+            except Exception as e:
+                # sem driver não há retry: os jobs falham com o erro em vez de ficar pendentes
+                self.logger.error(f"Slot {idx}: falha ao iniciar o Playwright: {e}")
+                ready.set()
+                self._fail_jobs(e)
+                return
+
+            try:
+                self._open_context(pw, slot)
+            except Exception as e:
+                # o próximo job tenta de novo e recebe o erro se persistir
+                self.logger.error(f"Slot {idx}: falha no launch inicial: {e}")
+            ready.set()
+
+            while True:
+                job = self._jobs.get()
+                if job is _STOP:
+                    break
+                fn, fut = job  # type: ignore[misc]
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    page = self._ensure_page(pw, slot, idx)
+                    self._count("jobs")
+                    fut.set_result(fn(page))
+                except BaseException as e:
+                    fut.set_exception(e)
+        finally:
+            ready.set()
+            self._close_context(slot)
+            if slot["browser"] is not None:
+                try:
+                    slot["browser"].close()
+                except Exception:
+                    pass
+            if pw is not None:
+                pw.stop()
+
+    def _fail_jobs(self, error: BaseException) -> None:
+        """Slot sem Playwright: responde cada job com `error` até o close()."""
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            _, fut = job  # type: ignore[misc]
+            if fut.set_running_or_notify_cancel():
+                fut.set_exception(error)
+
+    def _count(self, key: str, n: int = 1) -> None:
+        # stats é atualizado por todas as threads de slot
+        with self._lock:
+            self.stats[key] += n
+
+    def _ensure_page(self, pw: Any, slot: Dict[str, Any], idx: int) -> Page:
+        if slot["context"] is not None and self.recycle_after and slot["navs"] >= self.recycle_after:
+            self.logger.info(f"Slot {idx}: reciclando context após {slot['navs']} navegações")
+            self._count("recycles")
+            self._close_context(slot)
+
+        if slot["context"] is None:
+            self._open_context(pw, slot)
+
+        page: Page = slot["page"]
+        if page is None or page.is_closed():
+            page = slot["context"].new_page()
+            self._watch_navigations(page, slot)
+            slot["page"] = page
+        return page
+
+    def _open_context(self, pw: Any, slot: Dict[str, Any]) -> None:
+        context: BrowserContext
+        if self.user_data_dir:
+            context = pw.chromium.launch_persistent_context(
+                user_data_dir=self.user_data_dir,
+                headless=self.headless,
+                args=self.launch_args,
+                **self.context_options,
+            )
+            self._count("launches")
+            page = context.pages[0] if context.pages else context.new_page()
+        else:
+            if slot["browser"] is None:
+                slot["browser"] = pw.chromium.launch(headless=self.headless, args=self.launch_args)
+                self._count("launches")
+            context = slot["browser"].new_context(**self.context_options)
+            page = context.new_page()
+
+        self._count("contexts")
+        slot["context"] = context
+        slot["page"] = page
+        slot["navs"] = 0
+        self._watch_navigations(page, slot)
+
+    def _watch_navigations(self, page: Page, slot: Dict[str, Any]) -> None:
+        def on_nav(frame: Any) -> None:
+            if frame.parent_frame is None:
+                slot["navs"] += 1
+                self._count("navigations")
+
+        page.on("framenavigated", on_nav)
+
+    def _close_context(self, slot: Dict[str, Any]) -> None:
+        ctx = slot.get("context")
+        slot["context"] = None
+        slot["page"] = None
+        if ctx is None:
+            return
+        try:
+            ctx.close()
+        except Exception:
+            pass
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from consulta_ecom.cache.page_cache import _key
+from consulta_ecom.clients.base import ProductDetail
+
+_DETAIL_FIELDS = frozenset(f.name for f in fields(ProductDetail))
+
+
+@dataclass
+class DetailCache:
+    """
+    Resultado do enriquecimento por URL de produto (`root/<sha1>.json`),
+    junto com o preço do card de busca no momento da leitura. Uma entrada
+    só vale enquanto estiver dentro do TTL *e* o card ainda mostrar o mesmo
+    preço: mudou o preço, a página do produto é lida de novo.
+    """
+
+    root: str = "data/detail_cache"
+    ttl: float = 6 * 3600.0               # segundos
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"hits": 0, "misses": 0, "expired": 0, "changed": 0, "stores": 0},
+        init=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> Path:
+        return Path(self.root) / f"{_key(url)}.json"
+
+    def _miss(self, reason: Optional[str] = None) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+            if reason:
+                self.stats[reason] += 1
+
+    def get(self, url: str, card_price: Optional[float]) -> Optional[ProductDetail]:
+        path = self._path(url)
+        try:
+            entry: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._miss()
+            return None
+
+        if time.time() - float(entry.get("fetched_at") or 0) > self.ttl:
+            self._miss("expired")
+            return None
+        if entry.get("card_price") != card_price:
+            self._miss("changed")
+            return None
+
+        data = entry.get("detail") or {}
+        with self._lock:
+            self.stats["hits"] += 1
+        return ProductDetail(**{k: v for k, v in data.items() if k in _DETAIL_FIELDS})
+
+    def put(self, url: str, card_price: Optional[float], detail: ProductDetail) -> None:
+        path = self._path(url)
+        entry = {"card_price": card_price, "fetched_at": time.time(), "detail": asdict(detail)}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        with self._lock:
+            self.stats["stores"] += 1
+
+    def prune(self) -> int:
+        """Apaga entradas fora do TTL (pelo mtime); devolve quantas saíram."""
+        base = Path(self.root)
+        if not base.exists():
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for p in base.glob("*.json"):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def format_stats(self) -> str:
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        ratio = s["hits"] / lookups if lookups else 0.0
+        return (
+            f"hits={s['hits']} | misses={s['misses']} ({ratio:.0%} hit) | expirados={s['expired']} "
+            f"| preço mudou={s['changed']} | gravados={s['stores']}"
+        )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    """Chave estável: esquema/host minúsculos, query ordenada, sem fragmento."""
+    parts = urlsplit((url or "").strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def _key(url: str) -> str:
+    return hashlib.sha1(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageCache:
+    """
+    Cache em disco do HTML renderizado das páginas de busca, por URL
+    normalizada. Uma entrada = `root/<sha1>.html.gz`; mtime marca quando foi
+    gravada (TTL) e atime o último acesso (LRU). Ao passar de `max_bytes`, as
+    entradas menos usadas saem primeiro. Seguro entre threads; a escrita é
+    atômica (tmp + replace), então processos podem compartilhar o diretório.
+    """
+
+    root: str = "data/page_cache"
+    ttl: float = 600.0                    # segundos
+    max_bytes: int = 200 * 1024 * 1024
+    stats: Dict[str, int] = field(
+        default_factory=lambda: {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0},
+        init=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None   # key -> (bytes, último acesso)
+        self._total = 0
+
+    def _path(self, key: str) -> Path:
+        return Path(self.root) / f"{key}.html.gz"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            index: Dict[str, Tuple[int, float]] = {}
+            base = Path(self.root)
+            if base.exists():
+                for p in base.glob("*.html.gz"):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    index[p.name[: -len(".html.gz")]] = (st.st_size, st.st_atime)
+            self._index = index
+            self._total = sum(size for size, _ in index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        size, _ = self._load_index().pop(key, (0, 0.0))
+        self._total -= size
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def get(self, url: str) -> Optional[str]:
+        key = _key(url)
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                st = path.stat()
+            except OSError:
+                size, _ = index.pop(key, (0, 0.0))
+                self._total -= size
+                self.stats["misses"] += 1
+                return None
+
+            now = time.time()
+            if now - st.st_mtime > self.ttl:
+                self._drop(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            try:
+                html = gzip.decompress(path.read_bytes()).decode("utf-8")
+            except (OSError, EOFError, UnicodeDecodeError):
+                self._drop(key)
+                self.stats["misses"] += 1
+                return None
+
+            # atime explícito: não depende de o filesystem estar montado com atime
+            os.utime(path, (now, st.st_mtime))
+            index[key] = (st.st_size, now)
+            self.stats["hits"] += 1
+            return html
+
+    def put(self, url: str, html: str) -> None:
+        if not html:
+            return
+        key = _key(url)
+        path = self._path(key)
+        data = gzip.compress(html.encode("utf-8"), compresslevel=5)
+        with self._lock:
+            index = self._load_index()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+
+            old_size, _ = index.get(key, (0, 0.0))
+            index[key] = (len(data), time.time())
+            self._total += len(data) - old_size
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        if self._total <= self.max_bytes:
+            return
+        for key, _ in sorted(index.items(), key=lambda kv: kv[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            self._drop(key)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total
+
+    def format_stats(self) -> str:
+        s = self.stats
+        lookups = s["hits"] + s["misses"]
+        ratio = s["hits"] / lookups if lookups else 0.0
+        return (
+            f"hits={s['hits']} | misses={s['misses']} ({ratio:.0%} hit) | expirados={s['expired']} "
+            f"| gravados={s['stores']} | evictions={s['evictions']} | {self._total / 1024:.0f} KB"
+        )
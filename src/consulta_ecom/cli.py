@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Só stdlib e o registro aqui em cima: client, Playwright, lxml e driver do
+# banco são importados dentro de cada comando, quando ele precisa.
+from consulta_ecom.sites.registry import available_sites, create_client, get_site
+
+# Módulos medidos por `imports` quando nenhum é informado
+IMPORT_PROBES = (
+    "consulta_ecom.cli",
+    "consulta_ecom.sites.registry",
+    "consulta_ecom.parsers.kabum",
+    "consulta_ecom.matching.index",
+    "consulta_ecom.sites.kabum",
+    "consulta_ecom.db.postgres",
+    "playwright.sync_api",
+)
+
+_HEAVY = ("playwright", "pydantic", "psycopg", "lxml")
+
+# Dependências conferidas pelo `doctor` (sem importar nada)
+_DEPENDENCIES = (
+    ("playwright", "browser (search)"),
+    ("lxml", "parse offline / extração html"),
+    ("dotenv", "arquivos .env"),
+    ("pydantic", "ProductSchema"),
+    ("psycopg", "Postgres (DATABASE_URL)"),
+    ("psutil", "RSS no benchmark (opcional)"),
+)
+
+
+def _env_bool(name: str, default: Optional[bool] = None) -> Optional[bool]:
+    v = os.getenv(name)
+    if v is None or not v.strip():
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "sim", "y")
+
+
+def _env_int(name: str, default: int) -> int:
+    v = os.getenv(name)
+    if v is None or not str(v).strip():
+        return default
+    try:
+        return int(v)
+    except ValueError:
+        return default
+
+
+def _brl(value: Optional[float]) -> str:
+    return f"R$ {value:.2f}" if value is not None else "N/A"
+
+
+def _print_items(items: Sequence[Any], details: Optional[Dict[str, Any]] = None) -> None:
+    for i, p in enumerate(items, start=1):
+        print(f"{i:02d}. {p.title}")
+        print(f"    Preço : {'R$ ' + str(p.price) if p.price is not None else 'N/A'}")
+        print(f"    URL   : {p.url}")
+        print(f"    Img   : {p.image}")
+        print(f"    Pagina: {p.page}")
+        d = (details or {}).get(p.url)
+        if d is not None:
+            stock = "sim" if d.in_stock else ("não" if d.in_stock is False else "?")
+            parcelas = f"{d.installments}x {_brl(d.installment_value)}" if d.installments else "N/A"
+            print(f"    Estoque: {stock} | PIX: {_brl(d.price_pix)} | Parcelado: {parcelas} | Vendedor: {d.seller or '?'}")
+            if d.specs:
+                print(f"    Specs : {len(d.specs)} campos")
+        print()
+
+
+# ==========================================================
+# search: busca no site com o browser
+# ==========================================================
+def _client_options(site: str, args: argparse.Namespace) -> Dict[str, Any]:
+    opts: Dict[str, Any] = dict(
+        verbose=args.verbose or bool(_env_bool("VERBOSE", False)),
+        log_level=os.getenv("LOG_LEVEL", "INFO"),
+        log_file=os.getenv("LOG_FILE", "logs/consulta_ecom.log"),
+        log_console=bool(_env_bool("LOG_CONSOLE", True)),
+        debug_enabled=bool(_env_bool("DEBUG_ENABLED", True)),
+        debug_dir=os.getenv("DEBUG_DIR", "logs/debug"),
+    )
+    # sem flag nem env, vale o padrão do client (Pichau roda com janela por causa do Cloudflare)
+    headless = args.headless
+    if headless is None:
+        headless = _env_bool(f"{site.upper()}_HEADLESS", _env_bool("HEADLESS"))
+    if headless is not None:
+        opts["headless"] = headless
+
+    if site == "pichau":
+        opts["stealth_enabled"] = bool(_env_bool("PICHAU_STEALTH", True))
+        opts["page_size"] = _env_int("PICHAU_PAGE_SIZE", 36)
+        if os.getenv("USER_AGENT"):
+            opts["user_agent"] = os.getenv("USER_AGENT")
+        if args.profile:
+            opts["USER_DATA_DIR"] = args.profile
+    return opts
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    site = get_site(args.site).name
+    if site == "pichau":
+        profile = args.profile or "./chrome_perfil"
+        if not Path(profile).exists():
+            print(f"⚠️  Perfil '{profile}' não encontrado. Rode 'setup_perfil.py' primeiro!")
+
+    db = None
+    if args.save or args.incremental:
+        from consulta_ecom.db.postgres import DatabaseManager
+
+        db = DatabaseManager()
+        db.init_db()
+
+    client = create_client(site, **_client_options(site, args))
+    touched = 0
+    if args.incremental:
+        if not hasattr(client, "known_prices"):
+            print(f"⚠️  {site} não tem modo incremental; busca completa.")
+        else:
+            # conhecidos com o mesmo preço não voltam nos lotes; com --save, só têm o last_seen atualizado
+            client.known_prices = db.load_prices(site)
+
+            def on_unchanged(hashes: List[str]) -> None:
+                nonlocal touched
+                touched += db.touch(hashes) if args.save else len(hashes)
+
+            client.on_unchanged = on_unchanged
+    enricher = None
+    if args.details:
+        from consulta_ecom.cache.detail_cache import DetailCache
+        from consulta_ecom.runner.enrich import DetailEnricher
+
+        # runtime único: os contexts do search servem depois as páginas de produto
+        client.runtime = client.build_runtime(max_contexts=max(1, args.detail_concurrency))
+        enricher = DetailEnricher(
+            runtime=client.runtime,
+            concurrency=args.detail_concurrency,
+            cache=DetailCache(
+                root=os.getenv("DETAIL_CACHE_DIR", "data/detail_cache"),
+                ttl=_env_int("DETAIL_CACHE_TTL", 6 * 3600),
+            ),
+            block_profile=getattr(client, "block_profile", None),
+            log_file=os.getenv("LOG_FILE", "logs/consulta_ecom.log"),
+            log_console=bool(_env_bool("LOG_CONSOLE", True)),
+        )
+    print(f"🔎 Buscando '{args.query}' na {site.upper()} | limit={args.limit} | páginas={args.max_pages}")
+
+    t0 = time.perf_counter()
+    items: List[Any] = []
+    details = None
+    try:
+        # cada página vai para o banco assim que extraída: falha na página N não perde as anteriores
+        for batch in client.iter_pages(args.query, limit=args.limit, max_pages=args.max_pages):
+            if db is not None and args.save:
+                db.save_products(batch, history=False)
+            items.extend(batch)
+        if db is not None and args.save:
+            # histórico: a busca inteira é um ciclo (não um segmento por página)
+            db.append_history(items)
+        elapsed = time.perf_counter() - t0
+        if enricher is not None:
+            details = enricher.enrich(items)
+    finally:
+        if enricher is not None:
+            client.runtime.close()
+        if db is not None:
+            db.close()
+
+    print("\n================ RESULTADOS ================\n")
+    print(f"Site: {site.upper()}")
+    print(f"Busca: {args.query}")
+    print(f"Encontrados: {len(items)} em {elapsed:.2f}s")
+    if args.incremental:
+        print(f"Inalterados (conhecidos, mesmo preço): {touched}")
+    print()
+    _print_items(items, details)
+    if enricher is not None:
+        print(f"🔎 Detalhes: {enricher.format_stats()}")
+    return 0
+
+
+# ==========================================================
+# parse: HTML salvo (debug/cache/fixture) -> itens, sem browser
+# ==========================================================
+_DEBUG_NAME_RE = re.compile(r"_p(\d+)_[^.]+\.html(?:\.gz)?$")
+
+
+def cmd_parse(args: argparse.Namespace) -> int:
+    from consulta_ecom.utils.debug_capture import read_debug_html
+
+    parse = get_site(args.site).parse_function()
+    total = 0
+    for path in args.files:
+        m = _DEBUG_NAME_RE.search(Path(path).name)
+        page_idx = int(m.group(1)) if m else 1
+        items = parse(read_debug_html(Path(path)), args.query, page_idx)
+        total += len(items)
+        print(f"📄 {path}: {len(items)} itens")
+        if args.show:
+            _print_items(items)
+    print(f"Total: {total}")
+    return 0
+
+
+# ==========================================================
+# history: série de preços / quedas (PriceHistoryStore)
+# ==========================================================
+def cmd_history(args: argparse.Namespace) -> int:
+    from consulta_ecom.db.history import PriceHistoryStore
+
+    store = PriceHistoryStore(root=args.root)
+    if args.drops is not None:
+        drops = store.price_drops(args.drops, source=args.source)
+        for d in drops[: args.top]:
+            print(f"{d.source:<8} {d.url_hash}  {_brl(d.old_price)} -> {_brl(d.new_price)}  (-{d.pct:.1f}%)")
+        print(f"Total: {len(drops)} quedas >= {args.drops:g}%")
+        return 0
+    if not args.url:
+        print("❌ informe a URL (ou url_hash) ou --drops PCT")
+        return 2
+    series = store.history(args.url, source=args.source)
+    for obs in series:
+        print(f"{obs.ts:%Y-%m-%d %H:%M}  {obs.source:<8} {_brl(obs.price)}")
+    print(f"Total: {len(series)} observações")
+    return 0
+
+
+# ==========================================================
+# sites / doctor
+# ==========================================================
+def cmd_sites(args: argparse.Namespace) -> int:
+    for name in available_sites():
+        spec = get_site(name)
+        print(f"{name:<10} {spec.description}")
+    return 0
+
+
+def cmd_doctor(args: argparse.Namespace) -> int:
+    print("🔍 Diagnóstico\n")
+    ok = True
+    for module, purpose in _DEPENDENCIES:
+        found = importlib.util.find_spec(module) is not None
+        print(f"{'✅' if found else '⚠️ '} {module:<11} {purpose}")
+        ok = ok and (found or module in ("psycopg", "psutil"))
+
+    print()
+    for name in available_sites():
+        spec = get_site(name)
+        for path in filter(None, (spec.client, spec.async_client, spec.parser)):
+            module = path.partition(":")[0]
+            found = importlib.util.find_spec(module) is not None
+            print(f"{'✅' if found else '❌'} {name:<8} {path}")
+            ok = ok and found
+
+    root = Path(__file__).resolve().parents[2]
+    env_files = [p.name for p in (root / ".env", root / ".env.dev", root / ".env.prd") if p.exists()]
+    print(f"\n.env: {', '.join(env_files) if env_files else 'nenhum (usando só o ambiente)'}")
+    print("\n✅ Tudo pronto." if ok else "\n❌ Há dependências faltando (veja acima).")
+    return 0 if ok else 1
+
+
+# ==========================================================
+# imports: custo de import de cada módulo num processo novo
+# ==========================================================
+def measure_import(module: str, python: str = sys.executable) -> Dict[str, Any]:
+    """
+    `python -X importtime -c "import <module>"` num processo limpo: tempo
+    acumulado (ms) dos imports, módulos carregados e quais deps pesadas vieram junto.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    total_us = 0
+    loaded: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        loaded.append(name.strip())
+        if not name.startswith("  "):        # linha de topo: o acumulado já inclui os filhos
+            total_us += int(parts[1])
+    heavy = sorted({m.split(".")[0] for m in loaded if m.split(".")[0] in _HEAVY})
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "ms": total_us / 1000,
+        "modules": len(loaded),
+        "heavy": heavy,
+    }
+
+
+def cmd_imports(args: argparse.Namespace) -> int:
+    modules = args.modules or list(IMPORT_PROBES)
+    print(f"{'módulo':<32} {'ms':>8} {'módulos':>8}  deps pesadas")
+    for module in modules:
+        # melhor de N: o primeiro processo ainda pode pagar disco/pyc
+        runs = [measure_import(module) for _ in range(max(1, args.repeat))]
+        best = min(runs, key=lambda r: r["ms"])
+        if not best["ok"]:
+            print(f"{module:<32} {'falhou':>8}")
+            continue
+        heavy = ", ".join(best["heavy"]) or "-"
+        print(f"{module:<32} {best['ms']:>8.1f} {best['modules']:>8}  {heavy}")
+    return 0
+
+
+# ==========================================================
+# entrada
+# ==========================================================
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="consulta", description="Consulta de preços em e-commerce.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="busca num site com o browser")
+    p.add_argument("site", help="nome do site (ver 'sites')")
+    p.add_argument("query", nargs="?", default=os.getenv("QUERY", "controle ps5"))
+    p.add_argument("--limit", type=int, default=_env_int("LIMIT", 50))
+    p.add_argument("--max-pages", type=int, default=_env_int("MAX_PAGES", 3))
+    p.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None,
+                   help="padrão: <SITE>_HEADLESS / HEADLESS / padrão do client")
+    p.add_argument("--profile", default=os.getenv("USER_DATA_DIR"), help="perfil persistente (Pichau)")
+    p.add_argument("--save", action="store_true", help="grava cada página no banco (DatabaseManager)")
+    p.add_argument("--incremental", action="store_true",
+                   help="usa os preços do banco: lista só itens novos ou com preço alterado (com --save, "
+                        "os inalterados têm o last_seen atualizado)")
+    p.add_argument("--details", action="store_true",
+                   help="visita a página de cada produto (estoque, vendedor, PIX/parcelado, specs), com cache por URL")
+    p.add_argument("--detail-concurrency", type=int, default=_env_int("DETAIL_CONCURRENCY", 4))
+    p.add_argument("-v", "--verbose", action="store_true")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("parse", help="extrai itens de HTML salvo (debug/cache), sem browser")
+    p.add_argument("site")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--query", required=True, help="query da busca (regras de relevância)")
+    p.add_argument("--show", action="store_true", help="lista os itens")
+    p.set_defaults(func=cmd_parse)
+
+    p = sub.add_parser("history", help="histórico de preços gravado pelos saves (PriceHistoryStore)")
+    p.add_argument("url", nargs="?", help="URL do produto ou url_hash")
+    p.add_argument("--source", default=None)
+    p.add_argument("--drops", type=float, default=None, metavar="PCT",
+                   help="quedas de pelo menos PCT%% no último ciclo, contra o preço anterior de cada item")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--root", default=os.getenv("PRICE_HISTORY_DIR", "data/price_history"))
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("sites", help="sites registrados")
+    p.set_defaults(func=cmd_sites)
+
+    p = sub.add_parser("doctor", help="confere dependências e módulos dos sites")
+    p.set_defaults(func=cmd_doctor)
+
+    p = sub.add_parser("imports", help="tempo de import de cada módulo num processo novo")
+    p.add_argument("modules", nargs="*")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=cmd_imports)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from consulta_ecom.config.env import load_environment
+
+    # antes do parser: QUERY/LIMIT/MAX_PAGES do .env viram os padrões das flags
+    load_environment()
+    args = build_parser().parse_args(argv)
+    if getattr(args, "site", None):
+        try:
+            get_site(args.site)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 2
+    return int(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
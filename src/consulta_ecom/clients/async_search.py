@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+from consulta_ecom.clients.base import AsyncBaseEcomClient, ProductItem
+
+
+@dataclass
+class SearchOutcome:
+    site: str
+    query: str
+    items: List[ProductItem] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def search_many(
+    clients: Mapping[str, AsyncBaseEcomClient],
+    jobs: Iterable[Tuple[str, str]],
+    concurrency: int = 4,
+    limit: int = 10,
+    max_pages: int = 1,
+) -> List[SearchOutcome]:
+    """
+    Executa vários pares (site, query) no mesmo event loop, com no máximo
+    `concurrency` buscas simultâneas. Erros de uma busca não derrubam as
+    demais: ficam em SearchOutcome.error. A ordem de saída é a de `jobs`.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(site: str, query: str) -> SearchOutcome:
+        client = clients[site]
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                items = await client.search(query, limit=limit, max_pages=max_pages)
+                return SearchOutcome(site, query, items, time.perf_counter() - t0)
+            except Exception as e:
+                return SearchOutcome(site, query, [], time.perf_counter() - t0, e)
+
+    return list(await asyncio.gather(*(run_one(site, query) for site, query in jobs)))
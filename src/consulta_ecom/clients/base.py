@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional, Protocol, List
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Protocol, List
 
 
 @dataclass(frozen=True, slots=True)
@@ -14,6 +15,49 @@ class ProductItem:
     page: int = 1
 
 
+@dataclass
+class ProductDetail:
+    """O que só a página do produto tem: estoque, vendedor, PIX/parcelado e ficha técnica."""
+
+    url: str
+    in_stock: Optional[bool] = None
+    seller: Optional[str] = None
+    price_pix: Optional[float] = None             # à vista (PIX/boleto)
+    price_installments: Optional[float] = None    # total no parcelado
+    installments: Optional[int] = None            # nº máximo de parcelas
+    installment_value: Optional[float] = None
+    specs: Dict[str, str] = field(default_factory=dict)
+
+
+def url_hash(url: str) -> str:
+    """Chave estável de um produto (sha1 da URL absoluta)."""
+    return hashlib.sha1((url or "").encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SearchReport:
+    items: List[ProductItem] = field(default_factory=list)
+    links_per_page: List[int] = field(default_factory=list)   # links/cards no DOM por página visitada
+    rejections: Dict[str, int] = field(default_factory=dict)  # regra de relevância -> títulos descartados
+    unchanged: List[str] = field(default_factory=list)        # modo incremental: url_hash dos conhecidos sem mudança (fora de items)
+
+    @property
+    def blocked(self) -> bool:
+        # primeira página sem nenhum card = bloqueio/captcha, não "sem resultados"
+        return bool(self.links_per_page) and self.links_per_page[0] == 0
+
+
 class BaseEcomClient(Protocol):
     def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:
         ...
+
+    def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:
+        ...
+
+
+class AsyncBaseEcomClient(Protocol):
+    async def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:
+        ...
+
+    async def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:
+        ...
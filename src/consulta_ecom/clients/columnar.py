@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import csv
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union, overload
+
+from consulta_ecom.clients.base import ProductItem
+
+CSV_COLUMNS = ("title", "price", "url", "image", "source", "page")
+
+_NAN = float("nan")
+_NO_IMAGE = -1
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.compute  # noqa: F401 (registra pyarrow.compute)
+    except ImportError as e:
+        raise ImportError("ProductBatch.to_arrow/from_arrow precisam do pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def _split_url(url: str) -> Tuple[str, str]:
+    """'https://host/produto/123/x' -> ('https://host/produto/', '123/x'): prefixo = host + 1º segmento."""
+    i = url.find("://")
+    host_end = url.find("/", i + 3) if i >= 0 else -1
+    if host_end < 0:
+        return "", url
+    seg_end = url.find("/", host_end + 1)
+    cut = seg_end + 1 if 0 < seg_end < len(url) - 1 else host_end + 1
+    return url[:cut], url[cut:]
+
+
+class _Strings:
+    """Tabela de strings repetidas (lojas, prefixos de URL) -> código."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for v in values:
+            self.code(v)
+
+    def code(self, value: str) -> int:
+        c = self._codes.get(value)
+        if c is None:
+            c = self._codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return c
+
+
+class ProductBatch(Sequence[ProductItem]):
+    """
+    ProductItem guardados por coluna: preço (float64, NaN = sem preço) e
+    página em array; loja como código numa tabela interna; URL e imagem como
+    código do prefixo compartilhado (host + 1º segmento) + o resto. Indexa e
+    itera como uma lista de ProductItem (criados sob demanda), então quem já
+    consome listas não muda; NumPy/Arrow/CSV saem direto das colunas.
+    """
+
+    __slots__ = (
+        "titles", "prices", "pages", "source_codes",
+        "url_codes", "url_rests", "image_codes", "image_rests",
+        "_sources", "_prefixes",
+    )
+
+    def __init__(self, items: Iterable[ProductItem] = ()) -> None:
+        self.titles: List[str] = []
+        self.prices = array("d")
+        self.pages = array("i")
+        self.source_codes = array("H")
+        self.url_codes = array("i")
+        self.url_rests: List[str] = []
+        self.image_codes = array("i")           # -1 = sem imagem
+        self.image_rests: List[str] = []
+        self._sources = _Strings()
+        self._prefixes = _Strings()
+        self.extend(items)
+
+    # ------------------------------------------------------------------
+    # escrita
+    # ------------------------------------------------------------------
+    def _append(
+        self, title: str, price: Optional[float], url: str, image: Optional[str], source: str, page: int
+    ) -> None:
+        self.titles.append(title)
+        self.prices.append(_NAN if price is None else price)
+        self.pages.append(page)
+        self.source_codes.append(self._sources.code(source))
+        prefix, rest = _split_url(url)
+        self.url_codes.append(self._prefixes.code(prefix))
+        self.url_rests.append(rest)
+        if image is None:
+            self.image_codes.append(_NO_IMAGE)
+            self.image_rests.append("")
+        else:
+            prefix, rest = _split_url(image)
+            self.image_codes.append(self._prefixes.code(prefix))
+            self.image_rests.append(rest)
+
+    def append(self, item: ProductItem) -> None:
+        self._append(item.title, item.price, item.url, item.image, item.source, item.page)
+
+    def extend(self, items: Iterable[ProductItem]) -> None:
+        if isinstance(items, ProductBatch):
+            self._extend_batch(items)
+            return
+        for item in items:
+            self._append(item.title, item.price, item.url, item.image, item.source, item.page)
+
+    def _extend_batch(self, other: "ProductBatch") -> None:
+        # só as tabelas são remapeadas; as colunas são copiadas em bloco
+        src_map = [self._sources.code(s) for s in other._sources.values]
+        pre_map = [self._prefixes.code(p) for p in other._prefixes.values]
+        self.titles.extend(other.titles)
+        self.prices.extend(other.prices)
+        self.pages.extend(other.pages)
+        self.source_codes.extend(array("H", [src_map[c] for c in other.source_codes]))
+        self.url_codes.extend(array("i", [pre_map[c] for c in other.url_codes]))
+        self.url_rests.extend(other.url_rests)
+        self.image_codes.extend(array("i", [c if c < 0 else pre_map[c] for c in other.image_codes]))
+        self.image_rests.extend(other.image_rests)
+
+    @classmethod
+    def concat(cls, batches: Iterable[Iterable[ProductItem]]) -> "ProductBatch":
+        out = cls()
+        for b in batches:
+            out.extend(b)
+        return out
+
+    # ------------------------------------------------------------------
+    # leitura como Sequence[ProductItem]
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _item(self, i: int) -> ProductItem:
+        price = self.prices[i]
+        img = self.image_codes[i]
+        return ProductItem(
+            title=self.titles[i],
+            price=None if price != price else price,
+            url=self._prefixes.values[self.url_codes[i]] + self.url_rests[i],
+            image=None if img < 0 else self._prefixes.values[img] + self.image_rests[i],
+            source=self._sources.values[self.source_codes[i]],
+            page=self.pages[i],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> ProductItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ProductBatch": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ProductItem, "ProductBatch"]:
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("ProductBatch index out of range")
+        return self._item(index)
+
+    def __iter__(self) -> Iterator[ProductItem]:
+        for i in range(len(self)):
+            yield self._item(i)
+
+    def __repr__(self) -> str:
+        return f"ProductBatch({len(self)} itens, lojas={self.sources})"
+
+    @property
+    def sources(self) -> List[str]:
+        return list(self._sources.values)
+
+    def urls(self) -> List[str]:
+        pre = self._prefixes.values
+        return [pre[c] + r for c, r in zip(self.url_codes, self.url_rests)]
+
+    def images(self) -> List[Optional[str]]:
+        pre = self._prefixes.values
+        return [None if c < 0 else pre[c] + r for c, r in zip(self.image_codes, self.image_rests)]
+
+    def source_column(self) -> List[str]:
+        vals = self._sources.values
+        return [vals[c] for c in self.source_codes]
+
+    def take(self, indices: Iterable[int]) -> "ProductBatch":
+        """Novo batch só com as linhas `indices` (mesmas tabelas de loja/prefixo)."""
+        idx = list(indices)
+        out = ProductBatch()
+        out._sources = _Strings(self._sources.values)
+        out._prefixes = _Strings(self._prefixes.values)
+        out.titles = [self.titles[i] for i in idx]
+        out.prices = array("d", [self.prices[i] for i in idx])
+        out.pages = array("i", [self.pages[i] for i in idx])
+        out.source_codes = array("H", [self.source_codes[i] for i in idx])
+        out.url_codes = array("i", [self.url_codes[i] for i in idx])
+        out.url_rests = [self.url_rests[i] for i in idx]
+        out.image_codes = array("i", [self.image_codes[i] for i in idx])
+        out.image_rests = [self.image_rests[i] for i in idx]
+        return out
+
+    def by_source(self, source: str) -> "ProductBatch":
+        code = self._sources._codes.get(source)
+        if code is None:
+            return ProductBatch()
+        return self.take(i for i, c in enumerate(self.source_codes) if c == code)
+
+    # ------------------------------------------------------------------
+    # agregações por loja (NumPy quando instalado)
+    # ------------------------------------------------------------------
+    def count_by_source(self) -> Dict[str, int]:
+        vals = self._sources.values
+        return {vals[c]: n for c, n in Counter(self.source_codes).items()}
+
+    def min_price_by_source(self) -> Dict[str, float]:
+        """Menor preço de cada loja (itens sem preço ignorados)."""
+        np = _numpy()
+        vals = self._sources.values
+        if np is not None:
+            out = np.full(len(vals), np.inf)
+            np.fmin.at(out, np.frombuffer(self.source_codes, dtype=np.uint16), np.frombuffer(self.prices, dtype=np.float64))
+            return {vals[c]: float(v) for c, v in enumerate(out) if v != np.inf}
+
+        best: Dict[int, float] = {}
+        for code, price in zip(self.source_codes, self.prices):
+            if price == price and (code not in best or price < best[code]):
+                best[code] = price
+        return {vals[c]: p for c, p in best.items()}
+
+    def cheapest_by_source(self) -> Dict[str, ProductItem]:
+        """O item mais barato de cada loja."""
+        np = _numpy()
+        vals = self._sources.values
+        if np is not None and len(self):
+            codes = np.frombuffer(self.source_codes, dtype=np.uint16)
+            prices = np.frombuffer(self.prices, dtype=np.float64)
+            order = np.lexsort((np.where(np.isnan(prices), np.inf, prices), codes))
+            first = np.unique(codes[order], return_index=True)[1]
+            return {vals[codes[i]]: self._item(int(i)) for i in order[first] if not np.isnan(prices[i])}
+
+        best: Dict[int, int] = {}
+        for i, (code, price) in enumerate(zip(self.source_codes, self.prices)):
+            if price == price and (code not in best or price < self.prices[best[code]]):
+                best[code] = i
+        return {vals[c]: self._item(i) for c, i in best.items()}
+
+    # ------------------------------------------------------------------
+    # NumPy
+    # ------------------------------------------------------------------
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Colunas como ndarray: price (float64, NaN = sem preço), page (int32),
+        source_code (uint16) + `sources` (a tabela), e as strings como
+        arrays de objeto (reaproveitam os mesmos str, sem ProductItem).
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError("ProductBatch.to_numpy precisa do numpy (pip install numpy)")
+        sources = np.array(self._sources.values, dtype=object)
+        codes = np.frombuffer(self.source_codes, dtype=np.uint16).copy()
+        return {
+            "title": np.array(self.titles, dtype=object),
+            "price": np.frombuffer(self.prices, dtype=np.float64).copy(),
+            "url": np.array(self.urls(), dtype=object),
+            "image": np.array(self.images(), dtype=object),
+            "source": sources[codes] if len(sources) else np.array([], dtype=object),
+            "source_code": codes,
+            "sources": sources,
+            "page": np.frombuffer(self.pages, dtype=np.int32).copy(),
+        }
+
+    @classmethod
+    def from_columns(
+        cls,
+        title: Sequence[str],
+        price: Iterable[Optional[float]],
+        url: Sequence[str],
+        image: Sequence[Optional[str]],
+        source: Sequence[str],
+        page: Iterable[int],
+    ) -> "ProductBatch":
+        """Monta direto das colunas (listas, ndarrays ...): NaN/None em price = sem preço."""
+        out = cls()
+        for t, p, u, im, s, pg in zip(title, price, url, image, source, page):
+            p = None if p is None or p != p else float(p)
+            out._append(str(t), p, str(u), None if im is None or im == "" else str(im), str(s), int(pg))
+        return out
+
+    @classmethod
+    def from_numpy(cls, columns: Mapping[str, Any]) -> "ProductBatch":
+        return cls.from_columns(
+            columns["title"], columns["price"], columns["url"], columns["image"], columns["source"], columns["page"]
+        )
+
+    # ------------------------------------------------------------------
+    # Arrow
+    # ------------------------------------------------------------------
+    def to_arrow(self) -> Any:
+        """pyarrow.Table; price/page/source saem dos buffers das colunas, sem passar por Python."""
+        pa = _pyarrow()
+        pc = pa.compute
+        n = len(self)
+
+        def from_buffer(kind: Any, data: array) -> Any:
+            return pa.Array.from_buffers(kind, n, [None, pa.py_buffer(data)])
+
+        price = from_buffer(pa.float64(), self.prices)
+        price = pc.if_else(pc.is_nan(price), pa.scalar(None, pa.float64()), price)
+        prefixes = pa.array(self._prefixes.values, pa.string())
+
+        url = pc.binary_join_element_wise(
+            pa.DictionaryArray.from_arrays(from_buffer(pa.int32(), self.url_codes), prefixes).dictionary_decode(),
+            pa.array(self.url_rests, pa.string()),
+            "",
+        )
+        img_codes = from_buffer(pa.int32(), self.image_codes)
+        img_codes = pc.if_else(pc.less(img_codes, 0), pa.scalar(None, pa.int32()), img_codes)
+        image = pc.binary_join_element_wise(
+            pa.DictionaryArray.from_arrays(img_codes, prefixes).dictionary_decode(),
+            pa.array(self.image_rests, pa.string()),
+            "",
+        )
+        source = pa.DictionaryArray.from_arrays(
+            from_buffer(pa.uint16(), self.source_codes), pa.array(self._sources.values, pa.string())
+        )
+        return pa.table({
+            "title": pa.array(self.titles, pa.string()),
+            "price": price,
+            "url": url,
+            "image": image,
+            "source": source,
+            "page": from_buffer(pa.int32(), self.pages),
+        })
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> "ProductBatch":
+        pa = _pyarrow()
+        pc = pa.compute
+
+        def buffer_column(name: str, kind: Any, typecode: str, fill: Any) -> array:
+            arr = pc.fill_null(table.column(name).cast(kind), fill).combine_chunks()
+            width = array(typecode).itemsize
+            data = arr.buffers()[1]
+            out = array(typecode)
+            out.frombytes(data.to_pybytes()[arr.offset * width:(arr.offset + len(arr)) * width])
+            return out
+
+        src = table.column("source").combine_chunks()
+        if not pa.types.is_dictionary(src.type):
+            src = pc.dictionary_encode(src)
+
+        out = cls()
+        out.titles = [str(t) for t in table.column("title").to_pylist()]
+        out.prices = buffer_column("price", pa.float64(), "d", _NAN)
+        out.pages = buffer_column("page", pa.int32(), "i", 1)
+        out._sources = _Strings(str(s) for s in src.dictionary.to_pylist())
+        out.source_codes = array("H", src.indices.to_pylist())
+        for url, image in zip(table.column("url").to_pylist(), table.column("image").to_pylist()):
+            prefix, rest = _split_url(url or "")
+            out.url_codes.append(out._prefixes.code(prefix))
+            out.url_rests.append(rest)
+            if image is None:
+                out.image_codes.append(_NO_IMAGE)
+                out.image_rests.append("")
+            else:
+                prefix, rest = _split_url(image)
+                out.image_codes.append(out._prefixes.code(prefix))
+                out.image_rests.append(rest)
+        return out
+
+    # ------------------------------------------------------------------
+    # CSV
+    # ------------------------------------------------------------------
+    def to_csv(self, dest: Union[str, Path, TextIO]) -> None:
+        """Colunas de CSV_COLUMNS, com cabeçalho; preço vazio = sem preço."""
+        if isinstance(dest, (str, Path)):
+            Path(dest).parent.mkdir(parents=True, exist_ok=True)
+            with open(dest, "w", encoding="utf-8", newline="") as f:
+                self.to_csv(f)
+            return
+        writer = csv.writer(dest)
+        writer.writerow(CSV_COLUMNS)
+        prices = ("" if p != p else repr(p) for p in self.prices)
+        images = (i or "" for i in self.images())
+        writer.writerows(zip(self.titles, prices, self.urls(), images, self.source_column(), self.pages))
+
+    @classmethod
+    def from_csv(cls, src: Union[str, Path, TextIO]) -> "ProductBatch":
+        if isinstance(src, (str, Path)):
+            with open(src, encoding="utf-8", newline="") as f:
+                return cls.from_csv(f)
+        out = cls()
+        reader = csv.reader(src)
+        header = next(reader, None)
+        if header is None:
+            return out
+        pos = [header.index(c) for c in CSV_COLUMNS]
+        for row in reader:
+            title, price, url, image, source, page = (row[i] for i in pos)
+            out._append(title, float(price) if price else None, url, image or None, source, int(page or 1))
+        return out
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class BoundedStream(Generic[T]):
+    """
+    Fila limitada entre um produtor em outra thread (ex.: slot do
+    BrowserRuntime) e um consumidor que itera. `put` bloqueia com a fila
+    cheia — é isso que segura o scraping quando quem grava está atrasado — e
+    devolve False quando o consumidor desistiu (close/break), para o produtor
+    parar na próxima página.
+    """
+
+    def __init__(self, maxsize: int = 2) -> None:
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, maxsize))
+        self._closed = threading.Event()
+        self._finished = False
+        self._error: Optional[BaseException] = None
+
+    def put(self, item: T) -> bool:
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Fim do produtor; com `error`, o consumidor recebe a exceção. Idempotente."""
+        if self._finished:
+            return
+        self._finished = True
+        self._error = error
+        self.put(_DONE)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def __iter__(self) -> Iterator[T]:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                yield item  # type: ignore[misc]
+        finally:
+            self.close()
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import math
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from consulta_ecom.clients.base import url_hash
+
+# Segmento colunar imutável, um por (source, ciclo):
+#   MAGIC | n (uint32) | n x sha1 (20 bytes) | n x price (float64) | n x ts (float64)
+# Preço ausente = NaN. Floats em little-endian.
+_MAGIC = b"PHS1"
+_HEADER = struct.Struct("<4sI")
+_DIGEST = 20
+_CHUNK = 4096  # registros lidos por vez ao varrer a coluna de hashes
+
+# Índice ao lado de cada segmento (<ciclo>.bloom): bloom filter dos hashes,
+#   MAGIC | m bits (uint32) | k (uint32) | bits
+# ~10 bits por item e 7 posições -> ~1% de falso positivo; history() e
+# price_drops() só abrem os segmentos que podem conter as URLs procuradas.
+_BLOOM_MAGIC = b"PHB1"
+_BLOOM_HEADER = struct.Struct("<4sII")
+_BLOOM_BITS_PER_ITEM = 10
+_BLOOM_HASHES = 7
+
+
+@dataclass(frozen=True)
+class PriceObservation:
+    url_hash: str
+    source: str
+    price: Optional[float]
+    ts: datetime
+
+
+@dataclass(frozen=True)
+class PriceDrop:
+    url_hash: str
+    source: str
+    old_price: float
+    new_price: float
+    pct: float
+
+
+def _to_le(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(raw: bytes) -> array:
+    values = array("d")
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class _Bloom:
+    __slots__ = ("m", "k", "bits")
+
+    def __init__(self, m: int, k: int, bits: bytearray) -> None:
+        self.m, self.k, self.bits = m, k, bits
+
+    @staticmethod
+    def _positions(digest: bytes, m: int, k: int) -> Iterator[int]:
+        # o sha1 já é uniforme: double hashing sobre dois pedaços do próprio digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(k):
+            yield (h1 + i * h2) % m
+
+    @classmethod
+    def build(cls, digests: bytes, n: int) -> "_Bloom":
+        m = max(64, n * _BLOOM_BITS_PER_ITEM)
+        bits = bytearray((m + 7) // 8)
+        for i in range(n):
+            for pos in cls._positions(digests[i * _DIGEST:(i + 1) * _DIGEST], m, _BLOOM_HASHES):
+                bits[pos >> 3] |= 1 << (pos & 7)
+        return cls(m, _BLOOM_HASHES, bits)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest, self.m, self.k))
+
+    def to_bytes(self) -> bytes:
+        return _BLOOM_HEADER.pack(_BLOOM_MAGIC, self.m, self.k) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> Optional["_Bloom"]:
+        if len(raw) < _BLOOM_HEADER.size:
+            return None
+        magic, m, k = _BLOOM_HEADER.unpack_from(raw)
+        bits = bytearray(raw[_BLOOM_HEADER.size:])
+        if magic != _BLOOM_MAGIC or not m or len(bits) != (m + 7) // 8:
+            return None
+        return cls(m, k, bits)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _read_header(fh: BinaryIO, path: Path) -> int:
+    magic, n = _HEADER.unpack(fh.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError(f"Segmento inválido: {path}")
+    return n
+
+
+@dataclass
+class PriceHistoryStore:
+    """
+    Histórico append-only de preços particionado por fonte e ciclo de crawl:
+    `root/source=<fonte>/<ciclo>.seg`. Cada ciclo grava um segmento novo;
+    nada é reescrito. As consultas leem só a coluna de hashes em blocos
+    (history) ou só os ciclos com itens ainda pendentes (price_drops), nunca
+    o histórico inteiro em memória. Cada segmento tem um bloom filter ao lado
+    (`<ciclo>.bloom`), então as duas pulam os ciclos em que a URL não está.
+    """
+
+    root: str = "data/price_history"
+    _blooms: Dict[Path, _Bloom] = field(default_factory=dict, init=False, repr=False)
+
+    def _source_dir(self, source: str) -> Path:
+        return Path(self.root) / f"source={source}"
+
+    def sources(self) -> List[str]:
+        base = Path(self.root)
+        if not base.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in base.iterdir() if p.is_dir() and p.name.startswith("source="))
+
+    def cycles(self, source: str) -> List[str]:
+        d = self._source_dir(source)
+        if not d.exists():
+            return []
+        return sorted(p.stem for p in d.glob("*.seg"))
+
+    # ------------------------------------------------------------------
+    # escrita
+    # ------------------------------------------------------------------
+    def append(self, items: Iterable[object], ts: Optional[datetime] = None) -> List[Path]:
+        """Grava um ciclo (um segmento por fonte) com os ProductItem recebidos."""
+        ts = ts or datetime.now(timezone.utc)
+        cycle = ts.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        epoch = ts.timestamp()
+
+        by_source: Dict[str, Dict[bytes, float]] = {}
+        for it in items:
+            price = getattr(it, "price", None)
+            digest = bytes.fromhex(url_hash(getattr(it, "url")))
+            by_source.setdefault(getattr(it, "source", "unknown"), {})[digest] = (
+                float(price) if price is not None else math.nan
+            )
+
+        written: List[Path] = []
+        for source, rows in by_source.items():
+            d = self._source_dir(source)
+            d.mkdir(parents=True, exist_ok=True)
+            path = d / f"{cycle}.seg"
+            tmp = path.with_suffix(".tmp")
+
+            n = len(rows)
+            digests = b"".join(rows.keys())
+            with open(tmp, "wb") as fh:
+                fh.write(_HEADER.pack(_MAGIC, n))
+                fh.write(digests)
+                fh.write(_to_le(array("d", rows.values())))
+                fh.write(_to_le(array("d", [epoch]) * n))
+            bloom = _Bloom.build(digests, n)
+            _write_atomic(path.with_suffix(".bloom"), bloom.to_bytes())
+            os.replace(tmp, path)
+            self._blooms[path] = bloom
+            written.append(path)
+        return written
+
+    # ------------------------------------------------------------------
+    # leitura
+    # ------------------------------------------------------------------
+    def _segments(self, source: Optional[str]) -> Iterator[Tuple[str, Path]]:
+        for src in ([source] if source else self.sources()):
+            for cycle in self.cycles(src):
+                yield src, self._source_dir(src) / f"{cycle}.seg"
+
+    def _bloom(self, path: Path) -> _Bloom:
+        """Índice do segmento (segmentos são imutáveis: lido uma vez por processo)."""
+        bloom = self._blooms.get(path)
+        if bloom is not None:
+            return bloom
+        side = path.with_suffix(".bloom")
+        try:
+            bloom = _Bloom.from_bytes(side.read_bytes())
+        except OSError:
+            bloom = None
+        if bloom is None:
+            # segmento gravado antes do índice: monta a partir da coluna de hashes e grava
+            with open(path, "rb") as fh:
+                n = _read_header(fh, path)
+                bloom = _Bloom.build(fh.read(n * _DIGEST), n)
+            try:
+                _write_atomic(side, bloom.to_bytes())
+            except OSError:
+                pass
+        self._blooms[path] = bloom
+        return bloom
+
+    def _load_prices(self, path: Path) -> Dict[bytes, float]:
+        with open(path, "rb") as fh:
+            n = _read_header(fh, path)
+            digests = fh.read(n * _DIGEST)
+            prices = _from_le(fh.read(n * 8))
+        return {digests[i * _DIGEST:(i + 1) * _DIGEST]: prices[i] for i in range(n)}
+
+    def history(self, key: str, source: Optional[str] = None) -> List[PriceObservation]:
+        """Série de preços de um item. `key` = url_hash (hex) ou a própria URL."""
+        hex_key = key if len(key) == 40 and all(c in "0123456789abcdef" for c in key) else url_hash(key)
+        digest = bytes.fromhex(hex_key)
+
+        out: List[PriceObservation] = []
+        for src, path in self._segments(source):
+            if digest not in self._bloom(path):
+                continue
+            with open(path, "rb") as fh:
+                n = _read_header(fh, path)
+                idx = -1
+                for start in range(0, n, _CHUNK):
+                    block = fh.read(min(_CHUNK, n - start) * _DIGEST)
+                    pos = block.find(digest)
+                    while pos != -1 and pos % _DIGEST:
+                        pos = block.find(digest, pos + 1)
+                    if pos != -1:
+                        idx = start + pos // _DIGEST
+                        break
+                if idx < 0:
+                    continue
+
+                base = _HEADER.size + n * _DIGEST
+                fh.seek(base + idx * 8)
+                price = _from_le(fh.read(8))[0]
+                fh.seek(base + n * 8 + idx * 8)
+                epoch = _from_le(fh.read(8))[0]
+
+            out.append(
+                PriceObservation(
+                    url_hash=hex_key,
+                    source=src,
+                    price=None if math.isnan(price) else price,
+                    ts=datetime.fromtimestamp(epoch, tz=timezone.utc),
+                )
+            )
+        out.sort(key=lambda o: o.ts)
+        return out
+
+    def price_drops(self, min_pct: float, source: Optional[str] = None) -> List[PriceDrop]:
+        """
+        Itens do último ciclo de cada fonte cujo preço caiu pelo menos `min_pct`%
+        em relação à observação anterior com preço, em qualquer ciclo mais antigo
+        (no modo incremental um item sem mudança não entra no segmento do ciclo).
+        """
+        drops: List[PriceDrop] = []
+        for src in ([source] if source else self.sources()):
+            cycles = self.cycles(src)
+            if len(cycles) < 2:
+                continue
+            last = self._load_prices(self._source_dir(src) / f"{cycles[-1]}.seg")
+            pending = {d for d, new in last.items() if not math.isnan(new)}
+            previous: Dict[bytes, float] = {}
+            # do mais novo para o mais antigo; o bloom evita abrir segmentos sem nenhum pendente
+            for cycle in reversed(cycles[:-1]):
+                if not pending:
+                    break
+                path = self._source_dir(src) / f"{cycle}.seg"
+                bloom = self._bloom(path)
+                if not any(d in bloom for d in pending):
+                    continue
+                prices = self._load_prices(path)
+                for digest in [d for d in pending if d in prices]:
+                    old = prices[digest]
+                    if not math.isnan(old):
+                        previous[digest] = old
+                        pending.discard(digest)
+            for digest, old in previous.items():
+                new = last[digest]
+                if old <= 0:
+                    continue
+                pct = (old - new) / old * 100.0
+                if pct >= min_pct:
+                    drops.append(PriceDrop(digest.hex(), src, old, new, round(pct, 2)))
+        drops.sort(key=lambda d: d.pct, reverse=True)
+        return drops
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List
+
+
+class ConnectionPool:
+    """
+    Pool simples e thread-safe de conexões DB-API. Abre sob demanda até
+    `max_size` conexões e reaproveita as devolvidas (LIFO, a mais "quente").
+    """
+
+    def __init__(self, connect: Callable[[], Any], max_size: int = 4, timeout: float = 30.0) -> None:
+        self._connect = connect
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._all: List[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _acquire(self) -> Any:
+        if self._closed:
+            raise RuntimeError("ConnectionPool já foi encerrado")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.max_size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            conns, self._all = self._all, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
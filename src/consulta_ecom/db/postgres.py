@@ -1,62 +1,202 @@
-import sys
+from __future__ import annotations
+
 import os
-from pathlib import Path
-
-# --- BOOTSTRAP: AJUSTE DE CAMINHO ---
-# Garante que o Python encontre a pasta 'src/consulta_ecom'
-BASE_DIR = Path(__file__).resolve().parent
-SRC_PATH = str(BASE_DIR / "src")
-
-if SRC_PATH not in sys.path:
-    sys.path.insert(0, SRC_PATH)
-
-# --- IMPORTS SEM DB ---
-try:
-    from src.consulta_ecom.config.env import load_environment
-    from src.consulta_ecom.sites.kabum import KabumClient
-    print("✅ Módulos carregados com sucesso.")
-except ModuleNotFoundError as e:
-    print(f"❌ Erro de importação: {e}")
-    sys.exit(1)
-
-def main():
-    # 1. Carrega variáveis de ambiente (QUERY, LIMIT, etc.)
-    load_environment()
-    
-    query = os.getenv("QUERY", "controle ps5")
-    limit = int(os.getenv("LIMIT", "20"))
-    max_pages = int(os.getenv("MAX_PAGES", "2"))
-    
-    # Rodando com janela aberta (False) para você acompanhar o teste
-    headless = False 
-
-    # 2. Inicializa o Scraper da Kabum
-    # Removida qualquer dependência de banco de dados aqui
-    client = KabumClient(
-        headless=headless,
-        user_data_dir="./chrome_perfil", # Usa seu perfil de cookies
-        verbose=True,
-        page_size=100
-    )
-
-    print(f"\n🔎 Iniciando busca por: '{query}'")
-    print(f"📄 Limite: {limit} produtos | Máximo de páginas: {max_pages}")
-    print("-" * 50)
-
-    # 3. Executa a extração
-    products = client.search(query, limit=limit, max_pages=max_pages)
-
-    # 4. Apenas exibe os resultados no terminal
-    if products:
-        print(f"\n🎯 Resultados Encontrados ({len(products)}):")
-        print("=" * 60)
-        for i, p in enumerate(products, 1):
-            # Formatação limpa para leitura rápida
-            print(f"{i:02d} | R$ {p.price if p.price else 'N/A':>8.2f} | {p.title[:60]}...")
-            print(f"   🔗 URL: {p.url[:70]}...")
-        print("=" * 60)
-    else:
-        print("\n⚠️ Nenhum produto foi extraído.")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from consulta_ecom.clients.base import url_hash
+from consulta_ecom.db.history import PriceHistoryStore
+from consulta_ecom.db.pool import ConnectionPool
+from consulta_ecom.db.sqlite import SqliteBackend
+from consulta_ecom.utils.logger import setup_logger
+
+_COLUMNS = ("url_hash", "source", "title", "price", "url", "image", "page", "first_seen", "last_seen")
+_UPDATE_COLUMNS = ("source", "title", "price", "url", "image", "page", "last_seen")
+
+
+class PostgresBackend:
+    name = "postgres"
+    placeholder = "%s"
+    max_params = 65535
+    max_connections: Optional[int] = None
+
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+
+    def connect(self) -> Any:
+        import psycopg  # só carrega o driver quando o backend é Postgres
+
+        return psycopg.connect(self.dsn)
+
+    def ddl(self) -> list[str]:
+        return [
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                url_hash   CHAR(40) PRIMARY KEY,
+                source     TEXT NOT NULL,
+                title      TEXT NOT NULL,
+                price      NUMERIC(12, 2),
+                url        TEXT NOT NULL,
+                image      TEXT,
+                page       INTEGER,
+                first_seen TIMESTAMPTZ NOT NULL,
+                last_seen  TIMESTAMPTZ NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_products_source ON products (source)",
+        ]
+
+    def ts(self, dt: datetime) -> Any:
+        return dt
+
+
+def _backend_from_url(url: str) -> Any:
+    if url.startswith("sqlite:///"):
+        return SqliteBackend(url[len("sqlite:///"):] or ":memory:")
+    if url.startswith(("postgresql://", "postgres://")):
+        return PostgresBackend(url)
+    raise ValueError(f"DATABASE_URL não suportada: {url!r} (use postgresql://... ou sqlite:///...)")
+
+
+@dataclass
+class DatabaseManager:
+    """
+    Persistência de ProductItem/ProductSchema com UPSERT em lote por url_hash.
+    Um save de N itens vira ceil(N / batch_size) statements multi-row, não N
+    INSERTs. `url` aceita postgresql://... ou sqlite:///caminho.db; por padrão
+    lê DATABASE_URL e cai em SQLite local. Cada save também vira um ciclo no
+    PriceHistoryStore (`history`; None -> PRICE_HISTORY_DIR, PRICE_HISTORY=0 desliga).
+    """
+
+    url: Optional[str] = None
+    pool_size: int = 4
+    batch_size: int = 500
+    log_level: str = "INFO"
+    log_file: str = "logs/consulta_ecom.log"
+    log_console: bool = True
+    history: Optional[PriceHistoryStore] = None
+
+    def __post_init__(self) -> None:
+        self.url = self.url or os.getenv("DATABASE_URL") or "sqlite:///data/consulta_ecom.db"
+        if self.history is None and os.getenv("PRICE_HISTORY", "1").strip().lower() not in ("0", "false", "no", "nao", "não"):
+            self.history = PriceHistoryStore(root=os.getenv("PRICE_HISTORY_DIR", "data/price_history"))
+        self.backend = _backend_from_url(self.url)
+        pool_size = self.pool_size
+        if self.backend.max_connections is not None:
+            pool_size = min(pool_size, self.backend.max_connections)
+        self.pool = ConnectionPool(self.backend.connect, max_size=pool_size)
+        self.logger = setup_logger(
+            name="DatabaseManager",
+            level=self.log_level,
+            log_file=self.log_file,
+            console=self.log_console,
+        )
+
+    def init_db(self) -> None:
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for stmt in self.backend.ddl():
+                cur.execute(stmt)
+        self.logger.info(f"DB pronto ({self.backend.name})")
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _upsert_sql(self, n_rows: int) -> str:
+        ph = self.backend.placeholder
+        row = "(" + ", ".join([ph] * len(_COLUMNS)) + ")"
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _UPDATE_COLUMNS)
+        return (
+            f"INSERT INTO products ({', '.join(_COLUMNS)}) VALUES "
+            + ", ".join([row] * n_rows)
+            + f" ON CONFLICT (url_hash) DO UPDATE SET {updates}"
+        )
+
+    def _rows(self, products: Iterable[Any], now: datetime) -> List[Sequence[Any]]:
+        # mesmo url_hash duas vezes no mesmo statement quebra o ON CONFLICT: fica o último
+        by_hash: Dict[str, Sequence[Any]] = {}
+        ts = self.backend.ts(now)
+        for p in products:
+            h = url_hash(p.url)
+            by_hash[h] = (h, p.source, p.title, p.price, p.url, p.image, p.page, ts, ts)
+        return list(by_hash.values())
+
+    def save_products(self, products: Iterable[Any], history: bool = True) -> int:
+        """
+        Grava (UPSERT) ProductItem ou ProductSchema. Retorna quantas linhas
+        foram enviadas. `history=False` para saves parciais (uma página por
+        vez): o ciclo vai depois, inteiro, por append_history().
+        """
+        t0 = time.perf_counter()
+        products = list(products)
+        now = datetime.now(timezone.utc)
+        rows = self._rows(products, now)
+        if not rows:
+            return 0
+
+        per_stmt = max(1, min(self.batch_size, self.backend.max_params // len(_COLUMNS)))
+        batches = 0
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for i in range(0, len(rows), per_stmt):
+                chunk = rows[i:i + per_stmt]
+                params = [v for row in chunk for v in row]
+                cur.execute(self._upsert_sql(len(chunk)), params)
+                batches += 1
+
+        self.logger.info(
+            f"DB: upsert {len(rows)} itens em {batches} lote(s) | {(time.perf_counter() - t0) * 1000:.0f} ms"
+        )
+        if history:
+            self.append_history(products, now)
+        return len(rows)
+
+    def append_history(self, products: Iterable[Any], ts: Optional[datetime] = None) -> None:
+        """Um ciclo de crawl no histórico de preços (um segmento por fonte)."""
+        if self.history is None:
+            return
+        try:
+            paths = self.history.append(products, ts=ts)
+        except OSError as e:
+            self.logger.warning(f"Histórico de preços: falha ao gravar ciclo ({e})")
+            return
+        if paths:
+            self.logger.info(f"Histórico de preços: {len(paths)} segmento(s) em {self.history.root}")
+
+    def touch(self, hashes: Iterable[str]) -> int:
+        """last_seen = agora para itens vistos sem mudança (modo incremental: ficam fora do save)."""
+        keys = list(dict.fromkeys(hashes))
+        if not keys:
+            return 0
+        ph = self.backend.placeholder
+        now = self.backend.ts(datetime.now(timezone.utc))
+        per_stmt = max(1, min(self.batch_size, self.backend.max_params - 1))
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            for i in range(0, len(keys), per_stmt):
+                chunk = keys[i:i + per_stmt]
+                cur.execute(
+                    f"UPDATE products SET last_seen = {ph} WHERE url_hash IN ({', '.join([ph] * len(chunk))})",
+                    [now, *chunk],
+                )
+        return len(keys)
+
+    def load_prices(self, source: str) -> Dict[str, Optional[float]]:
+        """url_hash -> último preço gravado, para o modo incremental dos clients."""
+        ph = self.backend.placeholder
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"SELECT url_hash, price FROM products WHERE source = {ph}", (source,))
+            return {h.strip(): (float(p) if p is not None else None) for h, p in cur.fetchall()}
+
+    def count(self, source: Optional[str] = None) -> int:
+        ph = self.backend.placeholder
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            if source:
+                cur.execute(f"SELECT COUNT(*) FROM products WHERE source = {ph}", (source,))
+            else:
+                cur.execute("SELECT COUNT(*) FROM products")
+            return int(cur.fetchone()[0])
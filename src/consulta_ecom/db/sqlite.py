@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+class SqliteBackend:
+    """Backend local (sem servidor) com o mesmo schema/UPSERT do Postgres."""
+
+    name = "sqlite"
+    placeholder = "?"
+    # limite clássico de 999 parâmetros por statement
+    max_params = 999
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # cada conexão com ":memory:" abre um banco vazio próprio: o pool fica com uma só
+        self.max_connections: Optional[int] = 1 if path == ":memory:" else None
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    def connect(self) -> Any:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def ddl(self) -> list[str]:
+        return [
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                url_hash   TEXT PRIMARY KEY,
+                source     TEXT NOT NULL,
+                title      TEXT NOT NULL,
+                price      REAL,
+                url        TEXT NOT NULL,
+                image      TEXT,
+                page       INTEGER,
+                first_seen TEXT NOT NULL,
+                last_seen  TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_products_source ON products (source)",
+        ]
+
+    def ts(self, dt: datetime) -> Any:
+        return dt.isoformat()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Separador entre títulos na varredura em lote. Títulos chegam normalizados (uma
+# linha só); com re.MULTILINE, "^"/"$" e "." dos padrões `accept` ficam presos ao título.
+_SEP = "\n"
+
+
+def _alternation(terms: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    # termos mais longos primeiro: "carregamento" antes de "carregador"/"car"
+    uniq = sorted({t.lower() for t in terms if t}, key=len, reverse=True)
+    if not uniq:
+        return None
+    return re.compile("|".join(re.escape(t) for t in uniq))
+
+
+@dataclass(frozen=True)
+class QueryRule:
+    """
+    Regra ativada pela query: vale quando cada grupo de `when` tem ao menos uma
+    keyword presente. `accept` (regex) substitui o teste de keywords do RuleSet;
+    `blacklist`/`required` somam-se às regras do site.
+    """
+
+    name: str
+    when: Tuple[Tuple[str, ...], ...]
+    accept: Optional[str] = None
+    blacklist: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+
+    def applies(self, query_keywords: Sequence[str]) -> bool:
+        kws = set(query_keywords)
+        return all(any(k in kws for k in group) for group in self.when)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """
+    Regras de relevância de um site. `blacklist` e `required` são substrings do
+    título (minúsculo); `keyword_hits` exige que o título cite parte das
+    keywords da query quando nenhuma QueryRule com `accept` estiver ativa.
+    """
+
+    name: str = "default"
+    blacklist: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+    query_rules: Tuple[QueryRule, ...] = ()
+    keyword_hits: bool = True
+
+    def compile(self, query_keywords: Sequence[str]) -> "RelevanceFilter":
+        """Filtro compilado para uma query (cacheado por (RuleSet, keywords))."""
+        return _compile_rules(self, tuple(query_keywords))
+
+
+class RelevanceFilter:
+    """
+    RuleSet compilado para uma query: uma regex única para toda a blacklist,
+    aplicada de uma vez sobre a página inteira de títulos. Imutável, pode ser
+    compartilhado entre threads.
+    """
+
+    def __init__(self, rules: RuleSet, query_keywords: Tuple[str, ...]) -> None:
+        self.rules = rules
+        self.query_keywords = query_keywords
+
+        active = [qr for qr in rules.query_rules if qr.applies(query_keywords)]
+        self.active_rules = tuple(qr.name for qr in active)
+
+        self._blacklist = _alternation([*rules.blacklist, *(t for qr in active for t in qr.blacklist)])
+        self._required = tuple(dict.fromkeys(
+            t.lower() for t in (*rules.required, *(t for qr in active for t in qr.required)) if t
+        ))
+        self._accept = tuple(
+            (qr.name, re.compile(qr.accept, re.IGNORECASE | re.MULTILINE)) for qr in active if qr.accept
+        )
+
+        # keywords: uma regex com lookahead acha as ocorrências (inclusive sobrepostas);
+        # `covers` devolve quais keywords cada ocorrência implica ("ps5" implica "5")
+        kws = sorted(set(query_keywords), key=len, reverse=True)
+        self._use_hits = rules.keyword_hits and not self._accept
+        self._min_hits = min(2, max(1, len(kws) // 2))
+        self._kw_re = re.compile("(?=(" + "|".join(re.escape(k) for k in kws) + "))") if kws else None
+        self._covers: Dict[str, Tuple[str, ...]] = {k: tuple(o for o in kws if o in k) for k in kws}
+
+    def evaluate(self, titles: Sequence[str]) -> List[Optional[str]]:
+        """Motivo de rejeição por título (None = relevante), na ordem recebida."""
+        lowered = [(t or "").replace("\r", " ").replace("\n", " ").lower() for t in titles]
+        n = len(lowered)
+        reasons: List[Optional[str]] = [None] * n
+        if not n:
+            return reasons
+
+        # cada regra roda uma vez sobre a página inteira; o índice do título sai do offset
+        joined = _SEP.join(lowered)
+        ends: List[int] = []
+        pos = -1
+        for t in lowered:
+            pos += len(t) + 1
+            ends.append(pos)
+
+        if self._blacklist is not None:
+            for i, m in _owners(self._blacklist, joined, ends):
+                if reasons[i] is None:
+                    reasons[i] = f"blacklist:{m.group()}"
+
+        if self._required:
+            for i, t in enumerate(lowered):
+                if reasons[i] is None:
+                    missing = next((term for term in self._required if term not in t), None)
+                    if missing is not None:
+                        reasons[i] = f"required:{missing}"
+
+        for name, pattern in self._accept:
+            accepted = [False] * n
+            for i, _ in _owners(pattern, joined, ends):
+                accepted[i] = True
+            for i in range(n):
+                if reasons[i] is None and not accepted[i]:
+                    reasons[i] = name
+
+        if self._use_hits:
+            hits: List[set] = [set() for _ in range(n)]
+            if self._kw_re is not None:
+                covers = self._covers
+                for i, m in _owners(self._kw_re, joined, ends):
+                    hits[i].update(covers[m.group(1)])
+            min_hits = self._min_hits
+            for i in range(n):
+                if reasons[i] is None and len(hits[i]) < min_hits:
+                    reasons[i] = "keywords"
+        return reasons
+
+    def check(self, title: str) -> Optional[str]:
+        return self.evaluate([title])[0]
+
+    def is_relevant(self, title: str) -> bool:
+        return self.check(title) is None
+
+
+def _owners(pattern: "re.Pattern[str]", joined: str, ends: List[int]) -> Iterator[Tuple[int, "re.Match[str]"]]:
+    # finditer devolve matches em ordem crescente: o título dono só avança
+    i = 0
+    for m in pattern.finditer(joined):
+        start = m.start()
+        while ends[i] < start:
+            i += 1
+        yield i, m
+
+
+def count_rejections(reasons: Iterable[Optional[str]]) -> Counter:
+    return Counter(r for r in reasons if r is not None)
+
+
+def format_rejections(rejections: Dict[str, int], top: int = 5) -> str:
+    if not rejections:
+        return "-"
+    ranked = sorted(rejections.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return ", ".join(f"{name}={n}" for name, n in ranked)
+
+
+@lru_cache(maxsize=256)
+def _compile_rules(rules: RuleSet, query_keywords: Tuple[str, ...]) -> RelevanceFilter:
+    return RelevanceFilter(rules, query_keywords)
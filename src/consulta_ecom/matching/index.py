@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import random
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.matching.titles import Attributes, attributes_compatible, jaccard, title_key
+
+_PRIME = (1 << 61) - 1
+_NO_MODELS: FrozenSet[str] = frozenset()
+
+
+class MinHasher:
+    """
+    MinHash com hashing universal (a*h + b mod p). A assinatura de cada token
+    é calculada uma vez e guardada; a de um título é o mínimo elemento a
+    elemento das assinaturas dos seus tokens.
+    """
+
+    def __init__(self, num_perm: int = 80, seed: int = 1) -> None:
+        rnd = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rnd.randrange(1, _PRIME), rnd.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._cache: Dict[str, Tuple[int, ...]] = {}
+
+    def _token(self, token: str) -> Tuple[int, ...]:
+        sig = self._cache.get(token)
+        if sig is None:
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            sig = self._cache[token] = tuple((a * h + b) % _PRIME for a, b in self._perms)
+        return sig
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        sigs = [self._token(t) for t in tokens]
+        if len(sigs) == 1:
+            return sigs[0]
+        return tuple(map(min, *sigs)) if sigs else ()
+
+
+@dataclass
+class ProductGroup:
+    """Itens considerados o mesmo produto, de uma ou mais lojas."""
+
+    title: str                              # título canônico (o mais curto do grupo)
+    items: List[ProductItem] = field(default_factory=list)
+
+    @property
+    def sources(self) -> List[str]:
+        return sorted({it.source for it in self.items})
+
+    def offers(self) -> Dict[str, ProductItem]:
+        """Menor preço por loja."""
+        best: Dict[str, ProductItem] = {}
+        for it in self.items:
+            if it.price is None:
+                continue
+            cur = best.get(it.source)
+            if cur is None or it.price < cur.price:  # type: ignore[operator]
+                best[it.source] = it
+        return best
+
+    @property
+    def best(self) -> Optional[ProductItem]:
+        offers = self.offers()
+        return min(offers.values(), key=lambda it: it.price) if offers else None  # type: ignore[arg-type, return-value]
+
+    @property
+    def spread(self) -> float:
+        """Diferença entre a loja mais cara e a mais barata (0 com uma loja só)."""
+        prices = [it.price for it in self.offers().values()]
+        return round(max(prices) - min(prices), 2) if len(prices) > 1 else 0.0  # type: ignore[operator, type-var]
+
+
+class ProductMatcher:
+    """
+    Agrupa ProductItem equivalentes entre lojas sem comparar todos os pares:
+    títulos com o mesmo conjunto de tokens caem juntos direto; os demais são
+    indexados por MinHash-LSH (`bands` x `rows`) e só os candidatos que
+    dividem algum balde são verificados (Jaccard >= `threshold` e cor/edição/
+    modelo compatíveis com o grupo inteiro). Cada balde separa os itens por
+    cor/edição, então variantes da mesma linha não lotam o espaço de um item
+    que a outra loja ainda vai trazer. Incremental: `add` pode ser chamado a
+    cada página (ex.: com iter_pages).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        bands: int = 20,
+        rows: int = 4,
+        max_bucket: int = 16,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket = max_bucket       # por variante (cor/edição) do balde: só os primeiros viram candidatos
+        self.hasher = MinHasher(bands * rows, seed)
+        self.items: List[ProductItem] = []
+        self._tokens: List[FrozenSet[str]] = []
+        self._parent: List[int] = []
+        self._attrs: Dict[int, Attributes] = {}        # raiz -> atributos do grupo
+        self._exact: Dict[FrozenSet[str], int] = {}
+        # (banda, fatia da assinatura) -> (cores, edições) -> itens
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Dict[Tuple[FrozenSet[str], FrozenSet[str]], List[int]]] = {}
+        self.stats = {"items": 0, "exact": 0, "candidates": 0, "verified": 0, "merged": 0}
+
+    # ------------------------------------------------------------------
+    # union-find
+    # ------------------------------------------------------------------
+    def _find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _union(self, a: int, b: int) -> bool:
+        ra, rb = self._find(a), self._find(b)
+        if ra == rb:
+            return True
+        attrs_a, attrs_b = self._attrs[ra], self._attrs[rb]
+        if not attributes_compatible(attrs_a, attrs_b):
+            return False
+        self._parent[rb] = ra
+        self._attrs[ra] = (attrs_a[0] | attrs_b[0], attrs_a[1], attrs_a[2] | attrs_b[2])
+        del self._attrs[rb]
+        self.stats["merged"] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # indexação
+    # ------------------------------------------------------------------
+    def add(self, items: Iterable[ProductItem]) -> None:
+        rows = self.rows
+        for item in items:
+            key = title_key(item.title)
+            if not key.tokens:
+                continue
+            idx = len(self.items)
+            self.items.append(item)
+            self._tokens.append(key.tokens)
+            self._parent.append(idx)
+            self._attrs[idx] = key.attributes
+            self.stats["items"] += 1
+
+            same = self._exact.get(key.tokens)
+            if same is not None:
+                self.stats["exact"] += 1
+                self._union(same, idx)
+                continue
+            self._exact[key.tokens] = idx
+
+            sig = self.hasher.signature(key.tokens)
+            variant = (key.colors, key.editions)
+            candidates = set()
+            for band in range(self.bands):
+                bucket = self._buckets.setdefault((band, sig[band * rows:(band + 1) * rows]), {})
+                for (colors, editions), members in bucket.items():
+                    if attributes_compatible((colors, editions, _NO_MODELS), (key.colors, key.editions, _NO_MODELS)):
+                        candidates.update(members)
+                members = bucket.setdefault(variant, [])
+                if len(members) < self.max_bucket:
+                    members.append(idx)
+
+            self.stats["candidates"] += len(candidates)
+            for other in candidates:
+                if self._find(other) == self._find(idx):
+                    continue
+                self.stats["verified"] += 1
+                if jaccard(key.tokens, self._tokens[other]) >= self.threshold:
+                    self._union(other, idx)
+
+    def groups(self, min_sources: int = 1) -> List[ProductGroup]:
+        """Grupos na ordem do primeiro item; `min_sources=2` = só o que existe em mais de uma loja."""
+        members: Dict[int, List[int]] = {}
+        for i in range(len(self.items)):
+            members.setdefault(self._find(i), []).append(i)
+
+        out: List[ProductGroup] = []
+        for idxs in members.values():
+            group_items = [self.items[i] for i in idxs]
+            if len({it.source for it in group_items}) < min_sources:
+                continue
+            title = min((it.title for it in group_items), key=len)
+            out.append(ProductGroup(title=title, items=group_items))
+        return out
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (
+            f"itens={s['items']} | títulos idênticos={s['exact']} | candidatos={s['candidates']} "
+            f"| verificados={s['verified']} | uniões={s['merged']} | grupos={len(self._attrs)}"
+        )
+
+
+def match_products(items: Iterable[ProductItem], threshold: float = 0.6, min_sources: int = 1) -> List[ProductGroup]:
+    matcher = ProductMatcher(threshold=threshold)
+    matcher.add(items)
+    return matcher.groups(min_sources=min_sources)
+
+
+def best_price_view(groups: Sequence[ProductGroup], min_sources: int = 2) -> List[ProductGroup]:
+    """Grupos presentes em `min_sources`+ lojas e com preço, do maior spread para o menor."""
+    view = [g for g in groups if len(g.offers()) >= min_sources]
+    view.sort(key=lambda g: (-g.spread, g.best.price if g.best else 0.0))  # type: ignore[union-attr]
+    return view
+
+
+def format_best_prices(groups: Sequence[ProductGroup], top: int = 20) -> str:
+    lines: List[str] = []
+    for g in groups[:top]:
+        best = g.best
+        if best is None:
+            continue
+        offers = " | ".join(f"{src}: R$ {it.price:.2f}" for src, it in sorted(g.offers().items()))
+        lines.append(f"💰 {g.title[:70]}")
+        lines.append(f"   melhor: {best.source} R$ {best.price:.2f} (spread R$ {g.spread:.2f}) | {offers}")
+        lines.append(f"   {best.url}")
+    return "\n".join(lines)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+from consulta_ecom.sites.kabum import STOPWORDS_PT, _norm_spaces
+
+# Expressões que as lojas escrevem de jeitos diferentes -> um token só
+_PHRASES: Tuple[Tuple["re.Pattern[str]", str], ...] = (
+    (re.compile(r"\bplay\s*station\s*([2-5])\b"), r"ps\1"),
+    (re.compile(r"\bx\s*box\b"), "xbox"),
+    (re.compile(r"\bsem\s+fio\b|\bwireless\b"), "wireless"),
+    (re.compile(r"\bnintendo\s+switch\b"), "switch"),
+)
+
+_SYNONYMS = {
+    "white": "branco", "branca": "branco",
+    "black": "preto", "preta": "preto",
+    "blue": "azul",
+    "red": "vermelho", "vermelha": "vermelho",
+    "gray": "cinza", "grey": "cinza",
+    "pink": "rosa",
+    "purple": "roxo", "roxa": "roxo",
+    "green": "verde",
+    "silver": "prata",
+    "gold": "dourado", "dourada": "dourado",
+    "controller": "controle", "joystick": "controle",
+}
+
+COLORS: FrozenSet[str] = frozenset({
+    "branco", "preto", "azul", "vermelho", "cinza", "rosa", "roxo", "verde",
+    "amarelo", "prata", "dourado", "laranja", "camuflado",
+})
+
+# Marcam outro SKU da mesma linha: "DualSense" != "DualSense Edge"
+EDITIONS: FrozenSet[str] = frozenset({
+    "edge", "pro", "slim", "digital", "lite", "mini", "max", "plus", "ultra", "ti", "super", "xl",
+})
+
+# Palavras de vitrine que não identificam o produto
+_NOISE: FrozenSet[str] = frozenset({
+    "novo", "nova", "original", "oficial", "lacrado", "promocao", "oferta", "frete", "gratis", "envio", "imediato",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+_STORE_CODE_RE = re.compile(r"^\d{6,}$")   # código interno da loja ("- 1000038899")
+
+
+def _strip_accents(s: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+
+def normalize_title(title: str) -> str:
+    """Minúsculas, sem acento, expressões unificadas ('PlayStation 5' -> 'ps5')."""
+    t = _strip_accents(_norm_spaces(title).lower())
+    for pattern, repl in _PHRASES:
+        t = pattern.sub(repl, t)
+    return t
+
+
+@dataclass(frozen=True)
+class TitleKey:
+    tokens: FrozenSet[str]
+    colors: FrozenSet[str]
+    editions: FrozenSet[str]
+    models: FrozenSet[str]          # tokens com dígito: ps5, 4060, 1tb, cfizct1w
+
+    @property
+    def attributes(self) -> "Attributes":
+        return (self.colors, self.editions, self.models)
+
+
+Attributes = Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]
+
+
+def attributes_compatible(a: Attributes, b: Attributes) -> bool:
+    """
+    Mesma edição; cores iguais quando as duas informam; e nenhum dos dois
+    lados tem modelo que o outro não tem *e* vice-versa (um título pode omitir
+    o código do fabricante, mas 4060 x 4070 é outro produto).
+    """
+    colors_a, editions_a, models_a = a
+    colors_b, editions_b, models_b = b
+    if editions_a != editions_b:
+        return False
+    if colors_a and colors_b and colors_a != colors_b:
+        return False
+    return not (models_a - models_b and models_b - models_a)
+
+
+@lru_cache(maxsize=65536)
+def title_key(title: str) -> TitleKey:
+    tokens = set()
+    for raw in _TOKEN_RE.findall(normalize_title(title)):
+        parts = [raw.replace("-", "")] if any(c.isdigit() for c in raw) else raw.split("-")
+        for tok in parts:
+            tok = _SYNONYMS.get(tok, tok)
+            if len(tok) < 2 or tok in STOPWORDS_PT or tok in _NOISE or _STORE_CODE_RE.match(tok):
+                continue
+            tokens.add(tok)
+    frozen = frozenset(tokens)
+    return TitleKey(
+        tokens=frozen,
+        colors=frozen & COLORS,
+        editions=frozen & EDITIONS,
+        models=frozenset(t for t in frozen if any(c.isdigit() for c in t)),
+    )
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from lxml import html as lxml_html
+
+# Tags cujo texto o innerText do browser separa em linhas próprias.
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+
+
+def load_html(html: str) -> Optional[Any]:
+    """Parse tolerante (lxml); None para documento vazio."""
+    if not html or not html.strip():
+        return None
+    return lxml_html.fromstring(html)
+
+
+def inner_text(el: Any) -> str:
+    """Aproximação do innerText: quebra de linha nos elementos de bloco, ignora script/style."""
+    parts: list[str] = []
+
+    def walk(node: Any) -> None:
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag is None or tag in ("script", "style", "noscript", "template"):
+            if node.tail:
+                parts.append(node.tail)
+            return
+        block = tag in _BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+        if block:
+            parts.append("\n")
+        if node.tail and node is not el:
+            parts.append(node.tail)
+
+    walk(el)
+    lines = (" ".join(l.split()) for l in "".join(parts).split("\n"))
+    return "\n".join(l for l in lines if l)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterator
+
+from consulta_ecom.clients.base import ProductDetail
+from consulta_ecom.parsers.common import inner_text, load_html
+from consulta_ecom.parsers.price import parse_amount, parse_json_price, parse_price
+
+_LD_JSON_RE = re.compile(
+    r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE
+)
+_NEXT_DATA_RE = re.compile(
+    r"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE
+)
+_MAX_INSTALLMENT_RE = re.compile(r"(\d{1,2})\s*[xX]\s*(?:de\s+)?R\$\s*([\d.]+,\d{2})")
+_SELLER_RE = re.compile(r"(?:vendido e entregue por|vendido por)\s*:?\s*([^\n|]{2,60})", re.IGNORECASE)
+_OUT_OF_STOCK_RE = re.compile(r"\b(?:esgotado|indispon[íi]vel|avise-me quando chegar)\b", re.IGNORECASE)
+_BUY_RE = re.compile(r"\b(?:comprar|adicionar ao carrinho)\b", re.IGNORECASE)
+
+# Texto depois do <h1> que ainda conta como caixa de compra (antes de "quem viu também viu")
+_BUY_BOX_CHARS = 1500
+_MAX_SPECS = 80
+
+
+def _walk(node: Any, depth: int = 0) -> Iterator[dict]:
+    """Todos os dicts de um JSON, decodificando JSON guardado dentro de strings."""
+    if depth > 12:
+        return
+    if isinstance(node, dict):
+        yield node
+        for v in node.values():
+            yield from _walk(v, depth + 1)
+    elif isinstance(node, list):
+        for x in node:
+            yield from _walk(x, depth + 1)
+    elif isinstance(node, str) and node[:1] in ("{", "[") and len(node) > 64:
+        try:
+            yield from _walk(json.loads(node), depth + 1)
+        except ValueError:
+            pass
+
+
+def _json_blocks(pattern: "re.Pattern[str]", html: str) -> Iterator[Any]:
+    for m in pattern.finditer(html):
+        try:
+            yield json.loads(m.group(1))
+        except ValueError:
+            continue
+
+
+def _from_ld_json(html: str, detail: ProductDetail) -> None:
+    """schema.org Product: offers.price/availability/seller e additionalProperty."""
+    for block in _json_blocks(_LD_JSON_RE, html):
+        for node in _walk(block):
+            kind = node.get("@type")
+            if kind != "Product" and not (isinstance(kind, list) and "Product" in kind):
+                continue
+            offers = node.get("offers")
+            offer = offers[0] if isinstance(offers, list) and offers else offers
+            if isinstance(offer, dict):
+                if offer.get("@type") == "AggregateOffer":
+                    detail.price_pix = detail.price_pix or parse_json_price(offer.get("lowPrice"))
+                detail.price_pix = detail.price_pix or parse_json_price(offer.get("price"))
+                availability = str(offer.get("availability") or "")
+                if availability and detail.in_stock is None:
+                    detail.in_stock = availability.rsplit("/", 1)[-1] in ("InStock", "LimitedAvailability", "PreOrder")
+                seller = offer.get("seller")
+                if isinstance(seller, dict) and seller.get("name") and not detail.seller:
+                    detail.seller = str(seller["name"]).strip()
+            for prop in node.get("additionalProperty") or []:
+                if isinstance(prop, dict) and prop.get("name") and prop.get("value") is not None:
+                    detail.specs.setdefault(str(prop["name"]).strip(), str(prop["value"]).strip())
+            return
+
+
+def _from_next_data(html: str, detail: ProductDetail) -> None:
+    """Página de produto da Kabum: o objeto com priceWithDiscount + available/sellerName."""
+    for block in _json_blocks(_NEXT_DATA_RE, html):
+        for node in _walk(block):
+            if "priceWithDiscount" not in node or not ({"available", "sellerName"} & node.keys()):
+                continue
+            detail.price_pix = detail.price_pix or parse_json_price(node.get("priceWithDiscount"))
+            total = parse_json_price(node.get("price"))
+            if total is not None and detail.price_installments is None:
+                detail.price_installments = total
+            if detail.in_stock is None and isinstance(node.get("available"), bool):
+                detail.in_stock = node["available"]
+            if not detail.seller and node.get("sellerName"):
+                detail.seller = str(node["sellerName"]).strip()
+            m = _MAX_INSTALLMENT_RE.search(str(node.get("maxInstallment") or ""))
+            if m and detail.installments is None:
+                detail.installments = int(m.group(1))
+                detail.installment_value = parse_amount(m.group(2))
+            return
+
+
+def _specs_from_doc(doc: Any, specs: Dict[str, str]) -> None:
+    for row in doc.xpath("//table//tr"):
+        cells = row.xpath("./th|./td")
+        if len(cells) == 2:
+            key, value = inner_text(cells[0]).strip(" :"), inner_text(cells[1]).strip()
+            if key and value and len(specs) < _MAX_SPECS:
+                specs.setdefault(key, value)
+    for dl in doc.xpath("//dl"):
+        for dt in dl.xpath("./dt"):
+            dd = dt.xpath("following-sibling::dd[1]")
+            key = inner_text(dt).strip(" :")
+            if key and dd and len(specs) < _MAX_SPECS:
+                specs.setdefault(key, inner_text(dd[0]).strip())
+
+
+def parse_product_detail(html: str, url: str) -> ProductDetail:
+    """
+    HTML de uma página de produto -> ProductDetail. Dados estruturados
+    primeiro (JSON-LD, __NEXT_DATA__); o que faltar sai do texto da caixa de
+    compra (logo depois do <h1>) e das tabelas/listas de especificação.
+    """
+    detail = ProductDetail(url=url)
+    if not html:
+        return detail
+    _from_ld_json(html, detail)
+    _from_next_data(html, detail)
+
+    doc = load_html(html)
+    if doc is None:
+        return detail
+    text = inner_text(doc.body if doc.find("body") is not None else doc)
+    h1 = doc.xpath("//h1")
+    title = inner_text(h1[0]) if h1 else ""
+    start = text.find(title) if title else -1
+    buy_box = text[start:start + _BUY_BOX_CHARS] if start >= 0 else text[:_BUY_BOX_CHARS]
+
+    info = parse_price(buy_box)
+    if detail.price_pix is None:
+        detail.price_pix = info.cash
+    if detail.installments is None and info.installments:
+        detail.installments = info.installments
+        detail.installment_value = info.installment_value
+    if detail.price_installments is None:
+        detail.price_installments = info.installment_total
+
+    if not detail.seller:
+        m = _SELLER_RE.search(buy_box)
+        if m:
+            detail.seller = m.group(1).strip()
+    if detail.in_stock is None:
+        if _OUT_OF_STOCK_RE.search(buy_box):
+            detail.in_stock = False
+        elif _BUY_RE.search(buy_box):
+            detail.in_stock = True
+
+    _specs_from_doc(doc, detail.specs)
+    return detail
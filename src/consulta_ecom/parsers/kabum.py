@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Iterator, List, Mapping, Optional
+
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.parsers.common import inner_text, load_html
+from consulta_ecom.parsers.price import parse_json_price
+from consulta_ecom.filters.relevance import RuleSet
+from consulta_ecom.sites.kabum import KABUM_RELEVANCE, PageResult, _keywords_from_query, _norm_spaces, records_to_page
+
+_TITLE_XPATHS = (".//h2", ".//h3", ".//*[@data-testid='product-title']", ".//span")
+
+_NEXT_DATA_RE = re.compile(
+    r"<script[^>]*\bid=[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>", re.DOTALL | re.IGNORECASE
+)
+
+# Preço à vista primeiro (PIX/desconto), depois o cheio
+_PRICE_KEYS = ("priceWithDiscount", "price_with_discount", "price", "oldPrice")
+
+
+def records_from_html(html: str, max_links: int = 2500) -> tuple[List[dict], int]:
+    """
+    Equivalente offline do _BATCH_EXTRACT_JS: {href, title, image, price_text}
+    por anchor de produto, mais o total de anchors (links_dom).
+    """
+    doc = load_html(html)
+    if doc is None:
+        return [], 0
+
+    anchors = doc.xpath("//a[contains(@href, '/produto/')]")
+    records: List[dict] = []
+    seen = set()
+    for a in anchors[:max_links]:
+        href = a.get("href") or ""
+        if not href or href in seen:
+            continue
+        seen.add(href)
+
+        title: Optional[str] = None
+        for xp in _TITLE_XPATHS:
+            found = a.xpath(xp)
+            if not found:
+                title = None
+                continue
+            title = _norm_spaces(inner_text(found[0]))
+            if title and len(title) >= 6:
+                break
+        if not title:
+            title = _norm_spaces(a.get("title") or a.get("aria-label") or "")
+
+        imgs = a.xpath(".//img")
+        image = (imgs[0].get("src") or imgs[0].get("data-src")) if imgs else None
+
+        card = a.xpath("ancestor::*[self::article or self::div][1]")
+        price_text = inner_text(card[0]) if card else ""
+
+        records.append({"href": href, "title": title, "image": image, "price_text": price_text})
+    return records, len(anchors)
+
+
+def _is_product(node: Any) -> bool:
+    return isinstance(node, dict) and ("code" in node or "id" in node) and ("name" in node or "title" in node)
+
+
+def _product_lists(node: Any, depth: int = 0) -> Iterator[List[dict]]:
+    if depth > 12:
+        return
+    if isinstance(node, str):
+        # o Next da Kabum guarda parte do estado como JSON dentro de string
+        if node[:1] in ("{", "[") and len(node) > 64:
+            try:
+                yield from _product_lists(json.loads(node), depth + 1)
+            except ValueError:
+                pass
+    elif isinstance(node, list):
+        if node and _is_product(node[0]) and all(isinstance(x, dict) for x in node):
+            yield node
+        else:
+            for x in node:
+                yield from _product_lists(x, depth + 1)
+    elif isinstance(node, dict):
+        catalog = node.get("catalogServer")
+        if isinstance(catalog, dict) and isinstance(catalog.get("data"), list):
+            yield catalog["data"]
+            return
+        for v in node.values():
+            yield from _product_lists(v, depth + 1)
+
+
+def _next_data_record(p: dict) -> Optional[dict]:
+    code = p.get("code") or p.get("id")
+    title = p.get("name") or p.get("title")
+    if not code or not title:
+        return None
+    slug = p.get("friendlyName") or p.get("friendly_name") or ""
+    image = p.get("image") or p.get("thumbnail")
+    if not image and isinstance(p.get("images"), list) and p["images"]:
+        image = p["images"][0]
+
+    price: Optional[float] = None
+    offer = p.get("offer")
+    if isinstance(offer, dict):
+        price = parse_json_price(offer.get("priceWithDiscount")) or parse_json_price(offer.get("price"))
+    for key in _PRICE_KEYS:
+        if price is not None:
+            break
+        price = parse_json_price(p.get(key))
+
+    return {
+        "href": f"/produto/{code}/{slug}" if slug else f"/produto/{code}",
+        "title": str(title),
+        "image": image if isinstance(image, str) else None,
+        "price": price,
+    }
+
+
+def records_from_next_data(html: str) -> Optional[tuple[List[dict], int]]:
+    """
+    Produtos do estado do Next.js (<script id="__NEXT_DATA__">) que vem no
+    HTML do servidor, sem esperar hidratação: {href, title, image, price}
+    com o preço numérico do próprio payload. None se não houver payload ou
+    lista de produtos reconhecível.
+    """
+    m = _NEXT_DATA_RE.search(html or "")
+    if not m:
+        return None
+    try:
+        data = json.loads(m.group(1))
+    except ValueError:
+        return None
+
+    products = max(_product_lists(data), key=len, default=None)
+    if not products:
+        return None
+    records = [r for r in (_next_data_record(p) for p in products) if r is not None]
+    return (records, len(products)) if records else None
+
+
+def parse_search_page(
+    html: str,
+    query: str,
+    page_idx: int = 1,
+    known: Optional[Mapping[str, Optional[float]]] = None,
+    rules: RuleSet = KABUM_RELEVANCE,
+) -> PageResult:
+    """HTML de uma página de busca Kabum (page.content(), _dump_debug ou HTTP) -> PageResult."""
+    records, links_dom = records_from_next_data(html) or records_from_html(html)
+    return records_to_page(records, links_dom, _keywords_from_query(_norm_spaces(query)), page_idx, known=known, rules=rules)
+
+
+def parse_search_html(html: str, query: str, page_idx: int = 1) -> List[ProductItem]:
+    return parse_search_page(html, query, page_idx).items
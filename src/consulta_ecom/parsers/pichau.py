@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from typing import List, Optional, Set
+
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.parsers.common import inner_text, load_html
+from consulta_ecom.filters.relevance import RuleSet
+from consulta_ecom.sites.pichau import PICHAU_RELEVANCE, _keywords_from_query, cards_to_items
+
+_CARD_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' MuiCard-root ')]"
+
+
+def records_from_html(html: str) -> List[dict]:
+    """{text, href, title, image} por div.MuiCard-root, como o client extrai no browser."""
+    doc = load_html(html)
+    if doc is None:
+        return []
+
+    records: List[dict] = []
+    for card in doc.xpath(_CARD_XPATH):
+        links = card.xpath(".//a[@href]") or card.xpath("ancestor::a[@href][1]")
+        h2 = card.xpath(".//h2")
+        imgs = card.xpath(".//img")
+        records.append({
+            "text": inner_text(card),
+            "href": links[0].get("href") if links else None,
+            "title": inner_text(h2[0]) if h2 else None,
+            "image": imgs[0].get("src") if imgs else None,
+        })
+    return records
+
+
+def parse_search_html(
+    html: str,
+    query: str,
+    page_idx: int = 1,
+    base_url: str = "https://www.pichau.com.br",
+    seen_urls: Optional[Set[str]] = None,
+    rules: RuleSet = PICHAU_RELEVANCE,
+) -> List[ProductItem]:
+    """HTML de uma página de busca Pichau -> ProductItem com as mesmas regras do client."""
+    return cards_to_items(
+        records_from_html(html),
+        _keywords_from_query(query),
+        page_idx,
+        base_url,
+        seen_urls if seen_urls is not None else set(),
+        rules=rules,
+    )
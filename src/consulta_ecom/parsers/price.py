@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Valor em BRL: 1.234,56 | 1234,56 (centavos obrigatórios, como nos cards)
+_AMOUNT = r"\d{1,3}(?:\.\d{3})+,\d{2}|\d+,\d{2}"
+
+_BRL_RE = re.compile(rf"R\$\s*({_AMOUNT})")
+_BARE_RE = re.compile(rf"({_AMOUNT})")
+
+# "10x de R$ 49,90", "em até 12x R$ 99,00", "12x sem juros de R$ 25,00"
+_INSTALLMENT_RE = re.compile(
+    rf"(\d{{1,2}})\s*[xX]\s*(?:(?:sem|com)\s+juros\s*)?(?:de\s+)?R\$\s*({_AMOUNT})", re.IGNORECASE
+)
+# contexto logo depois do valor
+_CASH_AFTER_RE = re.compile(r"^[\s:]*(?:[àa]\s+vista|no\s+pix|via\s+pix|no\s+boleto|pix\b|boleto\b)", re.IGNORECASE)
+# total a prazo logo depois do valor: "R$ 399,90 em 10x sem juros", "em até 12x"
+# (só na mesma linha: um "12x de" na linha seguinte é outro preço)
+_INSTALLMENT_TOTAL_AFTER_RE = re.compile(r"^[ \t:]*(?:em\s+(?:at[ée]\s+)?)?\d{1,2}\s*[xX]\b", re.IGNORECASE)
+# contexto logo antes do valor
+_LIST_BEFORE_RE = re.compile(r"(?:\bde|\bantes)\s*:?\s*$", re.IGNORECASE)
+_CASH_BEFORE_RE = re.compile(r"(?:\bpor|\bvista|\bpix)\s*:?\s*$", re.IGNORECASE)
+
+_CONTEXT = 40
+MAX_PRICE = 1_000_000.0
+
+
+def parse_amount(raw: str) -> Optional[float]:
+    """'1.234,56' -> 1234.56"""
+    try:
+        value = float(raw.replace(".", "").replace(",", "."))
+    except ValueError:
+        return None
+    return value if 0 < value <= MAX_PRICE else None
+
+
+def parse_json_price(value: Any) -> Optional[float]:
+    """Preço vindo de JSON (payload do site, JSON-LD): número, "1234.56" ou "R$ 1.234,56"."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if 0 < value <= MAX_PRICE else None
+    if isinstance(value, str) and value.strip():
+        try:
+            v = float(value)
+            return v if 0 < v <= MAX_PRICE else None
+        except ValueError:
+            return parse_amount(value.replace("R$", "").strip())
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class PriceInfo:
+    cash: Optional[float] = None                # à vista / PIX / boleto, ou o "por" de "de X por Y"
+    list_price: Optional[float] = None          # preço cheio ("de R$ ... por"), sempre > cash
+    installments: Optional[int] = None
+    installment_value: Optional[float] = None
+    stated_total: Optional[float] = None        # "R$ 2.999,90 em até 10x": total a prazo escrito no card
+
+    @property
+    def installment_total(self) -> Optional[float]:
+        if self.stated_total is not None:
+            return self.stated_total
+        if self.installments and self.installment_value is not None:
+            return round(self.installments * self.installment_value, 2)
+        return None
+
+    @property
+    def price(self) -> Optional[float]:
+        """Preço gravado no ProductItem: à vista; sem ele, o total parcelado."""
+        return self.cash if self.cash is not None else self.installment_total
+
+
+_EMPTY = PriceInfo()
+
+
+def _amounts(text: str) -> List[Tuple[int, int, float]]:
+    found = [(m.start(), m.end(), parse_amount(m.group(1))) for m in _BRL_RE.finditer(text)]
+    if not found:
+        # sem "R$" no texto: aceita valores soltos (alguns cards trazem só "1.299,99")
+        found = [(m.start(), m.end(), parse_amount(m.group(1))) for m in _BARE_RE.finditer(text)]
+    return [(s, e, v) for s, e, v in found if v is not None]
+
+
+def parse_price(text: str) -> PriceInfo:
+    """
+    Classifica os valores do texto de um card em à vista / parcelado / preço
+    cheio pelo contexto ("à vista", "10x de", "de ... por"). Sem nenhum
+    marcador, o primeiro valor que não é parcela vira o preço à vista.
+    """
+    if not text or not any(c.isdigit() for c in text):
+        return _EMPTY
+
+    installments: Optional[int] = None
+    installment_value: Optional[float] = None
+    installment_spans: List[Tuple[int, int]] = []
+    for m in _INSTALLMENT_RE.finditer(text):
+        value = parse_amount(m.group(2))
+        if value is None:
+            continue
+        installment_spans.append(m.span())
+        if installments is None:
+            installments, installment_value = int(m.group(1)), value
+
+    cash: Optional[float] = None
+    stated_total: Optional[float] = None
+    marked_list: List[float] = []
+    others: List[float] = []
+    for start, end, value in _amounts(text):
+        if any(s <= start < e for s, e in installment_spans):
+            continue
+        before = text[max(0, start - _CONTEXT):start]
+        after = text[end:end + _CONTEXT]
+        if _INSTALLMENT_TOTAL_AFTER_RE.match(after):
+            # "R$ 2.999,90 em até 10x": total a prazo, não à vista
+            if stated_total is None:
+                stated_total = value
+            continue
+        if cash is None and (_CASH_AFTER_RE.match(after) or _CASH_BEFORE_RE.search(before)):
+            cash = value
+        elif _LIST_BEFORE_RE.search(before):
+            marked_list.append(value)
+        else:
+            others.append(value)
+
+    if cash is None and others:
+        cash = min(others) if marked_list else others[0]
+        others.remove(cash)
+
+    candidates = [v for v in (*marked_list, *others) if cash is None or v > cash]
+    list_price = max(candidates) if candidates else None
+    if cash is None and list_price is not None and installments is None:
+        # só há o "de R$ X": é o único preço disponível
+        cash, list_price = list_price, None
+
+    if cash is None and list_price is None and installments is None and stated_total is None:
+        return _EMPTY
+    return PriceInfo(cash, list_price, installments, installment_value, stated_total)
+
+
+def parse_prices(texts: Sequence[Optional[str]]) -> List[PriceInfo]:
+    """Uma página inteira de textos de card numa chamada (padrões pré-compilados)."""
+    return [parse_price(t or "") for t in texts]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from consulta_ecom.clients.base import AsyncBaseEcomClient, ProductItem
+from consulta_ecom.clients.columnar import ProductBatch
+from consulta_ecom.utils.logger import setup_logger
+from consulta_ecom.utils.timing import percentile
+
+
+@dataclass
+class SiteLimits:
+    concurrency: int = 2                 # buscas simultâneas no site
+    rate_per_min: float = 30.0           # inícios de busca por minuto (0 = sem limite)
+    max_retries: int = 2                 # retries quando links_dom=0 (bloqueio) ou erro
+    backoff_base: float = 5.0            # segundos; dobra a cada tentativa
+    backoff_max: float = 120.0
+
+
+@dataclass
+class JobResult:
+    site: str
+    query: str
+    items: Sequence[ProductItem] = field(default_factory=ProductBatch)   # colunar: milhares de jobs em memória
+    unchanged: List[str] = field(default_factory=list)   # modo incremental: url_hash fora de items
+    attempts: int = 0
+    latency: float = 0.0                 # duração da última tentativa (s)
+    blocked: bool = False                # terminou ainda com links_dom=0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.blocked
+
+
+@dataclass
+class BatchReport:
+    results: List[JobResult]
+    wall_time: float
+
+    def per_site(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        for site in sorted({r.site for r in self.results}):
+            rs = [r for r in self.results if r.site == site]
+            lat = [r.latency for r in rs if r.attempts]
+            out[site] = {
+                "queries": len(rs),
+                "ok": sum(1 for r in rs if r.ok),
+                "blocked": sum(1 for r in rs if r.blocked),
+                "errors": sum(1 for r in rs if r.error),
+                "retries": sum(max(0, r.attempts - 1) for r in rs),
+                "items": sum(len(r.items) for r in rs),
+                "p50": percentile(lat, 50),
+                "p95": percentile(lat, 95),
+            }
+        return out
+
+    def to_batch(self) -> ProductBatch:
+        """Todos os itens do batch num ProductBatch só (exportar, agregar por loja)."""
+        return ProductBatch.concat(r.items for r in self.results)
+
+    def format(self) -> str:
+        minutes = max(self.wall_time, 1e-9) / 60.0
+        total_items = sum(len(r.items) for r in self.results)
+        lines = [
+            f"Batch: {len(self.results)} queries em {self.wall_time:.1f}s "
+            f"| {len(self.results) / minutes:.1f} queries/min | {total_items / minutes:.1f} itens/min",
+        ]
+        for site, s in self.per_site().items():
+            lines.append(
+                f"  {site:<8} queries={s['queries']:.0f} ok={s['ok']:.0f} bloqueadas={s['blocked']:.0f} "
+                f"erros={s['errors']:.0f} retries={s['retries']:.0f} itens={s['items']:.0f} "
+                f"| p50={s['p50']:.1f}s p95={s['p95']:.1f}s"
+            )
+        return "\n".join(lines)
+
+
+class _RateLimiter:
+    """Espaça inícios de busca em 60/rate_per_min segundos."""
+
+    def __init__(self, rate_per_min: float) -> None:
+        self.interval = 60.0 / rate_per_min if rate_per_min > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BatchRunner:
+    """
+    Agenda jobs (site, query) em um pool de `workers` tarefas asyncio, com
+    limite de concorrência e de taxa por site. Jobs com links_dom=0 na
+    primeira página (ou erro) voltam para a fila com backoff exponencial,
+    sem prender um worker durante a espera.
+    """
+
+    def __init__(
+        self,
+        clients: Mapping[str, AsyncBaseEcomClient],
+        limits: Optional[Mapping[str, SiteLimits]] = None,
+        workers: int = 8,
+        limit: int = 50,
+        max_pages: int = 3,
+        on_result: Optional[Callable[[JobResult], None]] = None,
+        log_file: str = "logs/consulta_ecom.log",
+        log_console: bool = True,
+    ) -> None:
+        self.clients = dict(clients)
+        self.limits = {site: (limits or {}).get(site, SiteLimits()) for site in self.clients}
+        self.workers = max(1, workers)
+        self.limit = limit
+        self.max_pages = max_pages
+        self.on_result = on_result
+        self.logger = setup_logger("BatchRunner", log_file=log_file, console=log_console)
+
+    async def run(self, jobs: Iterable[Tuple[str, str]]) -> BatchReport:
+        t0 = time.perf_counter()
+        sems = {site: asyncio.Semaphore(max(1, lim.concurrency)) for site, lim in self.limits.items()}
+        rates = {site: _RateLimiter(lim.rate_per_min) for site, lim in self.limits.items()}
+
+        queue: "asyncio.Queue[JobResult]" = asyncio.Queue()
+        results: List[JobResult] = []
+        for site, query in jobs:
+            if site not in self.clients:
+                self.logger.warning(f"Site desconhecido '{site}' | query='{query}' ignorada")
+                continue
+            job = JobResult(site=site, query=query)
+            results.append(job)
+            queue.put_nowait(job)
+
+        self.logger.info(f"Batch iniciado: {len(results)} jobs | workers={self.workers}")
+        retry_tasks: set[asyncio.Task[None]] = set()
+
+        async def requeue(job: JobResult, delay: float) -> None:
+            await asyncio.sleep(delay)
+            queue.put_nowait(job)
+            queue.task_done()  # a tentativa anterior só "termina" quando o retry entra na fila
+
+        async def worker() -> None:
+            while True:
+                job = await queue.get()
+                lim = self.limits[job.site]
+                async with sems[job.site]:
+                    await rates[job.site].acquire()
+                    job.attempts += 1
+                    start = time.perf_counter()
+                    try:
+                        report = await self.clients[job.site].search_report(
+                            job.query, limit=self.limit, max_pages=self.max_pages
+                        )
+                        job.items, job.blocked, job.error = ProductBatch(report.items), report.blocked, None
+                        job.unchanged = report.unchanged
+                    except Exception as e:
+                        job.items, job.blocked, job.error = ProductBatch(), False, f"{type(e).__name__}: {e}"
+                    job.latency = time.perf_counter() - start
+
+                if (job.blocked or job.error) and job.attempts <= lim.max_retries:
+                    delay = min(lim.backoff_max, lim.backoff_base * (2 ** (job.attempts - 1)))
+                    motivo = "links_dom=0" if job.blocked else job.error
+                    self.logger.warning(
+                        f"[{job.site}] '{job.query}': {motivo} | retry {job.attempts}/{lim.max_retries} em {delay:.0f}s"
+                    )
+                    task = asyncio.create_task(requeue(job, delay))
+                    retry_tasks.add(task)
+                    task.add_done_callback(retry_tasks.discard)
+                    continue
+
+                self.logger.info(
+                    f"[{job.site}] '{job.query}': itens={len(job.items)} | tentativas={job.attempts} | {job.latency:.1f}s"
+                )
+                if self.on_result is not None:
+                    try:
+                        self.on_result(job)
+                    except Exception as e:
+                        self.logger.error(f"on_result falhou para '{job.query}': {e}")
+                queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(self.workers)]
+        try:
+            await queue.join()
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        report = BatchReport(results=results, wall_time=time.perf_counter() - t0)
+        self.logger.info(report.format())
+        return report
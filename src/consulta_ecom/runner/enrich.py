@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from consulta_ecom.browser.async_runtime import AsyncBrowserRuntime
+from consulta_ecom.browser.blocking import BlockProfile, install_blocking, install_blocking_async
+from consulta_ecom.browser.runtime import BrowserRuntime
+from consulta_ecom.cache.detail_cache import DetailCache
+from consulta_ecom.clients.base import ProductDetail, ProductItem
+from consulta_ecom.parsers.detail import parse_product_detail
+from consulta_ecom.utils.logger import setup_logger
+from consulta_ecom.utils.timing import PhaseTimer
+
+
+@dataclass
+class DetailEnricher:
+    """
+    Estágio opcional depois do search(): abre a página de cada produto
+    (ProductItem.url) com no máximo `concurrency` em voo, nos contexts do
+    BrowserRuntime — os mesmos do search quando o runtime é compartilhado.
+    Com `cache`, só visita o que não tem entrada válida (novo, expirado ou
+    com preço de card diferente), então o custo acompanha as mudanças e não
+    o tamanho do catálogo.
+    """
+
+    runtime: Optional[BrowserRuntime] = None     # None -> launch próprio com `concurrency` contexts
+    concurrency: int = 4
+    cache: Optional[DetailCache] = None
+    block_profile: Optional[BlockProfile] = None
+    timeout_ms: int = 30000
+    timer: Optional[PhaseTimer] = None
+
+    log_level: str = "INFO"
+    log_file: str = "logs/consulta_ecom.log"
+    log_console: bool = True
+
+    def __post_init__(self) -> None:
+        self.logger = setup_logger(
+            name="DetailEnricher",
+            level=self.log_level,
+            log_file=self.log_file,
+            console=self.log_console,
+        )
+        self.stats: Dict[str, int] = {"items": 0, "cached": 0, "fetched": 0, "failed": 0}
+
+    def _plan(self, items: Iterable[ProductItem]) -> Tuple[Dict[str, ProductDetail], List[ProductItem]]:
+        """Separa o que o cache já responde do que precisa de navegação (uma vez por URL)."""
+        details: Dict[str, ProductDetail] = {}
+        todo: List[ProductItem] = []
+        seen = set()
+        for item in items:
+            if not item.url or item.url in seen:
+                continue
+            seen.add(item.url)
+            self.stats["items"] += 1
+            cached = self.cache.get(item.url, item.price) if self.cache is not None else None
+            if cached is not None:
+                details[item.url] = cached
+                self.stats["cached"] += 1
+            else:
+                todo.append(item)
+        if todo:
+            self.logger.info(f"Detalhes: {len(todo)} de {self.stats['items']} produtos a visitar")
+        return details, todo
+
+    def _store(self, item: ProductItem, html: str, details: Dict[str, ProductDetail]) -> None:
+        detail = parse_product_detail(html, item.url)
+        details[item.url] = detail
+        self.stats["fetched"] += 1
+        if self.cache is not None:
+            try:
+                self.cache.put(item.url, item.price, detail)
+            except OSError as e:
+                self.logger.warning(f"Falha ao gravar cache de detalhe ({e})")
+
+    def _failed(self, item: ProductItem, error: BaseException) -> None:
+        self.stats["failed"] += 1
+        self.logger.warning(f"Detalhe falhou: {item.url} ({error})")
+
+    def _record(self, t0: float, source: str) -> None:
+        # o job roda no thread do slot, sem os rótulos do chamador: o site vai explícito
+        if self.timer is not None:
+            self.timer.record("detail", time.perf_counter() - t0, site=source)
+
+    # ------------------------------------------------------------------
+    # sync (BrowserRuntime)
+    # ------------------------------------------------------------------
+    def _read(self, page: Any, url: str, source: str) -> str:
+        t0 = time.perf_counter()
+        if self.block_profile is not None:
+            install_blocking(page, self.block_profile)
+        page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+        html = page.content()
+        self._record(t0, source)
+        return html
+
+    def enrich(self, items: Iterable[ProductItem]) -> Dict[str, ProductDetail]:
+        """url -> ProductDetail para os itens lidos (do cache ou da página); falhas ficam de fora."""
+        details, todo = self._plan(items)
+        if todo:
+            runtime = self.runtime
+            owns_runtime = runtime is None
+            if runtime is None:
+                runtime = BrowserRuntime(
+                    max_contexts=max(1, self.concurrency),
+                    log_file=self.log_file,
+                    log_console=self.log_console,
+                )
+            try:
+                self._fetch_all(runtime, todo, details)
+            finally:
+                if owns_runtime:
+                    runtime.close()
+        self.logger.info(f"Detalhes: {self.format_stats()}")
+        return details
+
+    def _fetch_all(self, runtime: BrowserRuntime, todo: List[ProductItem], details: Dict[str, ProductDetail]) -> None:
+        # janela de `parallel` jobs: não enche a fila do runtime que o search também usa
+        parallel = max(1, min(self.concurrency, runtime.max_contexts))
+        pending: Dict["Future[str]", ProductItem] = {}
+        queue: Iterator[ProductItem] = iter(todo)
+
+        def fill() -> None:
+            while len(pending) < parallel:
+                item = next(queue, None)
+                if item is None:
+                    return
+                pending[runtime.submit(partial(self._read, url=item.url, source=item.source))] = item
+
+        fill()
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                item = pending.pop(fut)
+                try:
+                    html = fut.result()
+                except Exception as e:
+                    self._failed(item, e)
+                    continue
+                # parse aqui, fora do slot: o browser já segue para o próximo produto
+                self._store(item, html, details)
+            fill()
+
+    def format_stats(self) -> str:
+        s = self.stats
+        line = f"produtos={s['items']} | do cache={s['cached']} | visitados={s['fetched']} | falhas={s['failed']}"
+        if self.cache is not None:
+            line += f" | cache: {self.cache.format_stats()}"
+        return line
+
+
+@dataclass
+class AsyncDetailEnricher(DetailEnricher):
+    """DetailEnricher sobre AsyncBrowserRuntime (run_batch)."""
+
+    runtime: Optional[AsyncBrowserRuntime] = None  # type: ignore[assignment]
+
+    async def _read_async(self, runtime: AsyncBrowserRuntime, url: str, source: str) -> str:
+        async with runtime.page() as page:
+            t0 = time.perf_counter()
+            if self.block_profile is not None:
+                await install_blocking_async(page, self.block_profile)
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+            html = await page.content()
+            self._record(t0, source)
+            return html
+
+    async def enrich(self, items: Iterable[ProductItem]) -> Dict[str, ProductDetail]:  # type: ignore[override]
+        details, todo = self._plan(items)
+        if todo:
+            runtime = self.runtime
+            owns_runtime = runtime is None
+            if runtime is None:
+                runtime = AsyncBrowserRuntime(
+                    max_contexts=max(1, self.concurrency),
+                    log_file=self.log_file,
+                    log_console=self.log_console,
+                )
+            sem = asyncio.Semaphore(max(1, min(self.concurrency, runtime.max_contexts)))
+
+            async def one(item: ProductItem) -> None:
+                async with sem:
+                    try:
+                        html = await self._read_async(runtime, item.url, item.source)
+                    except Exception as e:
+                        self._failed(item, e)
+                        return
+                self._store(item, html, details)
+
+            try:
+                await asyncio.gather(*(one(item) for item in todo))
+            finally:
+                if owns_runtime:
+                    await runtime.close()
+        self.logger.info(f"Detalhes: {self.format_stats()}")
+        return details
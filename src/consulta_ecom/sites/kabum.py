@@ -1,16 +1,29 @@
 from __future__ import annotations
 
 import re
-import hashlib
-from dataclasses import dataclass
-from pathlib import Path
-from typing import List, Optional
+import time
+import logging
+from collections import Counter, deque
+from concurrent.futures import Future
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional
 from urllib.parse import quote
 
-from playwright.sync_api import sync_playwright, Page
+from consulta_ecom.browser.blocking import BlockProfile, format_stats, install_blocking
+from consulta_ecom.browser.readiness import ReadyConfig, ReadyResult, wait_ready
+from consulta_ecom.browser.runtime import BrowserRuntime
+from consulta_ecom.cache.page_cache import PageCache
+from consulta_ecom.clients.base import ProductItem, SearchReport, url_hash
+from consulta_ecom.filters.relevance import QueryRule, RuleSet, count_rejections, format_rejections
+from consulta_ecom.parsers.price import parse_price, parse_prices
+from consulta_ecom.utils.debug_capture import DebugCapture, get_debug_capture
+from consulta_ecom.utils.logger import setup_logger
+from consulta_ecom.utils.timing import PhaseTimer
 
-from src.consulta_ecom.clients.base import ProductItem
-from src.consulta_ecom.utils.logger import setup_logger
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 
 STOPWORDS_PT = {
@@ -27,28 +40,16 @@ def _slug_kabum(query: str) -> str:
     return quote(q, safe="-")
 
 
-def _extract_float_price(text: str) -> Optional[float]:
-    if not text:
-        return None
-    m = re.search(r"(\d{1,3}(?:\.\d{3})*(?:,\d{2})|\d+(?:,\d{2}))", text)
-    if not m:
-        return None
-    raw = m.group(1).replace(".", "").replace(",", ".")
-    try:
-        return float(raw)
-    except ValueError:
-        return None
-
-
 def _keywords_from_query(query: str) -> List[str]:
     q = _norm_spaces(query).lower()
     return [p for p in re.split(r"[\s\-_/]+", q) if p and p not in STOPWORDS_PT]
 
 
-def _is_relevant(title: str, query_keywords: List[str]) -> bool:
-    t = (title or "").lower()
-
-    blacklist = (
+# PS5/DualSense: com "controle" + "ps5" na query, aceita DualSense/Edge ou
+# "controle ... sem fio ... ps5" no título, em vez do teste de keywords.
+KABUM_RELEVANCE = RuleSet(
+    name="kabum",
+    blacklist=(
         "mídia", "media",
         "access",
         "carregamento", "carregador", "charging", "dock", "base",
@@ -58,22 +59,56 @@ def _is_relevant(title: str, query_keywords: List[str]) -> bool:
         "película", "pelicula",
         "adaptador", "adapter",
         "volante", "arcade",
-    )
-    if any(b in t for b in blacklist):
-        return False
-
-    has_controle = ("controle" in query_keywords) or ("control" in query_keywords)
-    wants_ps = any(k in query_keywords for k in ("ps5", "playstation", "5"))
+    ),
+    query_rules=(
+        QueryRule(
+            name="ps5_controle",
+            when=(("controle", "control"), ("ps5", "playstation", "5")),
+            accept=r"dualsense|edge|^(?=.*controle)(?=.*(?:sem fio|wireless))(?=.*(?:ps5|playstation))",
+        ),
+    ),
+)
+
+
+# Extrai href/título/imagem/texto do card de todos os anchors em uma única
+# chamada ao browser (mesmas regras do caminho por locator).
+_BATCH_EXTRACT_JS = """
+([selector, maxLinks]) => {
+    const norm = (s) => (s || "").replace(/\\s+/g, " ").trim();
+    const out = [];
+    const seen = new Set();
+    const anchors = document.querySelectorAll(selector);
+    const n = Math.min(anchors.length, maxLinks);
+    for (let i = 0; i < n; i++) {
+        const a = anchors[i];
+        const href = a.getAttribute("href") || "";
+        if (!href || seen.has(href)) continue;
+        seen.add(href);
+
+        let title = null;
+        for (const sel of ["h2", "h3", "[data-testid='product-title']", "span"]) {
+            const el = a.querySelector(sel);
+            if (!el) { title = null; continue; }
+            title = norm(el.innerText);
+            if (title && title.length >= 6) break;
+        }
+        if (!title) title = norm(a.getAttribute("title") || a.getAttribute("aria-label") || "");
+
+        const img = a.querySelector("img");
+        const image = img ? (img.getAttribute("src") || img.getAttribute("data-src")) : null;
+
+        const card = a.parentElement ? a.parentElement.closest("article, div") : null;
+        const priceText = card ? card.innerText : "";
+
+        out.push({ href, title, image, price_text: priceText });
+    }
+    return { links_dom: anchors.length, records: out };
+}
+"""
 
-    if has_controle and wants_ps:
-        is_dualsense = "dualsense" in t
-        is_edge = "edge" in t
-        is_wireless = ("sem fio" in t) or ("wireless" in t)
-        mentions_ps = ("ps5" in t) or ("playstation" in t)
-        return (is_dualsense or is_edge) or (("controle" in t) and is_wireless and mentions_ps)
 
-    hits = sum(1 for k in set(query_keywords) if k in t)
-    return hits >= min(2, max(1, len(set(query_keywords)) // 2))
+# Só usamos o atributo src das imagens: imagem/fonte/mídia e trackers não precisam baixar.
+KABUM_BLOCK_PROFILE = BlockProfile(name="kabum")
 
 
 def _safe_name(s: str) -> str:
@@ -81,8 +116,183 @@ def _safe_name(s: str) -> str:
     return s[:80] if len(s) > 80 else s
 
 
-def _url_hash(url: str) -> str:
-    return hashlib.sha1((url or "").encode("utf-8")).hexdigest()
+_url_hash = url_hash
+
+
+def _same_price(a: Optional[float], b: Optional[float]) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return round(a, 2) == round(b, 2)
+
+
+@dataclass
+class PageResult:
+    page_idx: int
+    items: List[ProductItem]
+    links_dom: int
+    filtered_out: int
+    unchanged: int = 0                    # modo incremental: conhecidos com mesmo preço (não emitidos)
+    rejections: Dict[str, int] = field(default_factory=dict)   # regra de relevância -> títulos descartados
+    unchanged_hashes: List[str] = field(default_factory=list)  # url_hash dos `unchanged`
+
+
+def records_to_page(
+    records: List[dict],
+    links_dom: int,
+    query_keywords: List[str],
+    page_idx: int,
+    known: Optional[Mapping[str, Optional[float]]] = None,
+    rules: RuleSet = KABUM_RELEVANCE,
+) -> PageResult:
+    """
+    Regras de URL/relevância/preço aplicadas a registros {href, title, image,
+    price_text} (ou `price` já numérico), venham do page.evaluate ou do
+    parser offline (parsers.kabum).
+    """
+    candidates: List[tuple[str, str, dict]] = []
+    seen_urls = set()
+
+    for rec in records:
+        href = rec.get("href") or ""
+        if not href:
+            continue
+        if href.startswith("/"):
+            href = "https://www.kabum.com.br" + href
+        if "/produto/" not in href:
+            continue
+
+        if href in seen_urls:
+            continue
+        seen_urls.add(href)
+
+        title = _norm_spaces(rec.get("title") or "")
+        if not title:
+            continue
+        candidates.append((href, title, rec))
+
+    # relevância da página inteira numa chamada só
+    reasons = rules.compile(query_keywords).evaluate([title for _, title, _ in candidates])
+    rejections = count_rejections(reasons)
+
+    accepted = [c for c, reason in zip(candidates, reasons) if reason is None]
+    # registros do __NEXT_DATA__ já trazem "price" numérico: nada a parsear
+    prices = parse_prices([None if "price" in rec else rec.get("price_text") for _, _, rec in accepted])
+
+    items: List[ProductItem] = []
+    unchanged: List[str] = []
+    for (href, title, rec), info in zip(accepted, prices):
+        price = rec["price"] if "price" in rec else info.price
+
+        if known is not None:
+            h = _url_hash(href)
+            if h in known and _same_price(known[h], price):
+                unchanged.append(h)
+                continue
+
+        items.append(
+            ProductItem(
+                title=title,
+                price=price,
+                url=href,
+                image=rec.get("image") or None,
+                source="kabum",
+                page=page_idx,
+            )
+        )
+
+    return PageResult(
+        page_idx, items, links_dom, sum(rejections.values()), len(unchanged), dict(rejections), unchanged
+    )
+
+
+class _PageMerger:
+    """Aplica dedupe (url_hash), limit e zero_streak_stop às páginas na ordem em que chegam."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        limit: int,
+        zero_streak_stop: int,
+        known_stop_ratio: float = 0.0,
+        keep_items: bool = True,
+        on_unchanged: Optional[Callable[[List[str]], None]] = None,
+    ) -> None:
+        self.logger = logger
+        self.limit = limit
+        self.zero_streak_stop = zero_streak_stop
+        self.known_stop_ratio = known_stop_ratio
+        self.keep_items = keep_items          # False no modo streaming: só conta, não acumula
+        self.on_unchanged = on_unchanged
+        self.unchanged: List[str] = []        # modo incremental: url_hash dos conhecidos sem mudança
+        self.results: List[ProductItem] = []
+        self.fresh: List[ProductItem] = []    # itens novos da última página
+        self.count = 0
+        self.links_per_page: List[int] = []
+        self.seen_hashes: set[str] = set()
+        self.zero_streak = 0
+        self.rejections: Counter[str] = Counter()
+
+    def report(self) -> SearchReport:
+        return SearchReport(
+            items=self.results,
+            links_per_page=self.links_per_page,
+            rejections=dict(self.rejections),
+            unchanged=self.unchanged,
+        )
+
+    def add(self, res: PageResult) -> bool:
+        """Retorna True quando a busca deve parar."""
+        page_idx, items = res.page_idx, res.items
+        self.links_per_page.append(res.links_dom)
+        self.rejections.update(res.rejections)
+        if res.unchanged_hashes:
+            if self.keep_items:
+                self.unchanged.extend(res.unchanged_hashes)
+            if self.on_unchanged is not None:
+                self.on_unchanged(res.unchanged_hashes)
+        room = self.limit - self.count
+        fresh: List[ProductItem] = []
+        for it in items:
+            if len(fresh) >= room:
+                break
+            h = _url_hash(it.url)
+            if h in self.seen_hashes:
+                continue
+            self.seen_hashes.add(h)
+            fresh.append(it)
+
+        added = len(fresh)
+        self.fresh = fresh
+        self.count += added
+        if self.keep_items:
+            self.results.extend(fresh)
+
+        self.logger.info(
+            f"Página {page_idx}: links_dom={res.links_dom} | capturados={len(items)} | novos={added} | filtrados={res.filtered_out} | inalterados={res.unchanged} | acumulado={self.count}"
+        )
+        if res.rejections:
+            self.logger.debug(f"Página {page_idx}: filtros de relevância: {format_rejections(res.rejections)}")
+
+        if self.count >= self.limit:
+            return True
+
+        if self.known_stop_ratio > 0 and res.unchanged:
+            ratio = res.unchanged / (res.unchanged + len(items))
+            if ratio >= self.known_stop_ratio:
+                self.logger.warning(
+                    f"Parando: página {page_idx} com {ratio:.0%} de itens já conhecidos e sem mudança de preço."
+                )
+                return True
+
+        if added == 0:
+            self.zero_streak += 1
+            self.logger.warning(f"Página {page_idx}: 0 novos | zero_streak={self.zero_streak}")
+            if self.zero_streak >= self.zero_streak_stop:
+                self.logger.warning("Parando: páginas seguidas sem novos itens.")
+                return True
+        else:
+            self.zero_streak = 0
+        return False
 
 
 @dataclass
@@ -90,6 +300,7 @@ class KabumClient:
     # Browser
     headless: bool = True
     page_size: int = 100
+    base_url: str = "https://www.kabum.com.br"   # outro host só para fixtures/benchmark
 
     # Logs (parametrizados)
     verbose: bool = False                 # True -> DEBUG
@@ -102,10 +313,51 @@ class KabumClient:
     # Debug artifacts
     debug_enabled: bool = True
     debug_dir: str = "logs/debug"
+    # Amostragem/limite por minuto, HTML gzip e escrita em background
+    # (None -> a captura compartilhada de debug_dir, configurada por DEBUG_*)
+    debug_capture: Optional[DebugCapture] = None
+
+    # Extração: "batch" (1 page.evaluate por página), "html" (page.content() + lxml)
+    # ou "locator" (legado, 1 IPC por campo)
+    extraction_mode: str = "batch"
 
     # Controle de paginação/robustez
     zero_streak_stop: int = 2             # para após N páginas seguidas sem novos
     retry_if_links0: int = 1              # retries quando links_dom=0
+    concurrency: int = 1                  # páginas buscadas em paralelo (1 = sequencial)
+
+    # Espera de renderização: "adaptive" (contagem de cards estável + DOM quieto,
+    # scroll só enquanto aparecem cards novos) ou "fixed" (legado: networkidle + scrolls fixos)
+    render_wait: str = "adaptive"
+    ready: Optional[ReadyConfig] = None   # None -> padrão a partir de page_size
+
+    # Lê os produtos do __NEXT_DATA__ do HTML do servidor (sem networkidle,
+    # scroll nem extração no DOM); sem payload, cai na renderização normal
+    next_data: bool = True
+
+    # Browser compartilhado entre buscas (None -> launch por chamada)
+    runtime: Optional[BrowserRuntime] = None
+
+    # Interceptação de requests (None -> sem bloqueio)
+    block_profile: Optional[BlockProfile] = KABUM_BLOCK_PROFILE
+
+    # Modo incremental: url_hash -> último preço persistido (DatabaseManager.load_prices("kabum"),
+    # `consulta.py search --incremental`). search()/iter_pages() devolvem só itens novos ou com
+    # preço alterado; os conhecidos sem mudança saem como url_hash em SearchReport.unchanged e,
+    # página a página, em on_unchanged (ex.: DatabaseManager.touch, que atualiza o last_seen).
+    # A paginação para quando a fração deles na página atinge incremental_stop_ratio.
+    known_prices: Optional[Mapping[str, Optional[float]]] = None
+    incremental_stop_ratio: float = 0.8
+    on_unchanged: Optional[Callable[[List[str]], None]] = None
+
+    # Regras de relevância (blacklist, termos obrigatórios, regras por query)
+    relevance_rules: RuleSet = KABUM_RELEVANCE
+
+    # Cache em disco do HTML renderizado (None -> sempre navega)
+    page_cache: Optional[PageCache] = None
+
+    # Duração por fase (goto/networkidle/render/extract/...) por página e query
+    timer: Optional[PhaseTimer] = None
 
     def __post_init__(self) -> None:
         lvl = "DEBUG" if self.verbose else (self.log_level or "INFO")
@@ -117,55 +369,138 @@ class KabumClient:
             max_bytes=self.log_max_bytes,
             backup_count=self.log_backup_count,
         )
-        if self.debug_enabled:
-            Path(self.debug_dir).mkdir(parents=True, exist_ok=True)
+        if self.debug_enabled and self.debug_capture is None:
+            self.debug_capture = get_debug_capture(self.debug_dir)
 
-    def _goto(self, page: Page, url: str) -> None:
-        self.logger.info(f"GET {url}")
-        page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        try:
-            page.wait_for_load_state("networkidle", timeout=20000)
-        except Exception:
-            pass
+    def _span(self, phase: str) -> Any:
+        return self.timer.span(phase) if self.timer is not None else nullcontext()
 
-    def _kick_render(self, page: Page) -> None:
-        try:
-            page.wait_for_selector("a[href*='/produto/']", timeout=12000)
-            return
-        except Exception:
-            pass
+    def _labels(self, **labels: Any) -> Any:
+        return self.timer.labels(site="kabum", **labels) if self.timer is not None else nullcontext()
 
-        for _ in range(5):
-            page.mouse.wheel(0, 2600)
-            page.wait_for_timeout(900)
+    def _ready_config(self) -> ReadyConfig:
+        if self.ready is not None:
+            return self.ready
+        return ReadyConfig(selector="a[href*='/produto/']", expected=self.page_size, unique_attr="href")
 
-        try:
-            page.wait_for_selector("a[href*='/produto/']", timeout=12000)
-        except Exception:
-            pass
+    def _log_ready(self, page_idx: int, res: ReadyResult) -> None:
+        log = self.logger.info if res.ok else self.logger.warning
+        log(f"Página {page_idx}: {res.describe()}")
 
-    def _dump_debug(self, page: Page, page_idx: int, tag: str, query: str) -> None:
-        if not self.debug_enabled:
+    def _goto(self, page: Page, url: str) -> None:
+        self.logger.info(f"GET {url}")
+        with self._span("goto"):
+            page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        if self.render_wait != "fixed":
             return
+        with self._span("networkidle"):
+            try:
+                page.wait_for_load_state("networkidle", timeout=20000)
+            except Exception:
+                pass
+
+    def _next_data_page(
+        self,
+        page: Page,
+        url: str,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> tuple[Optional[PageResult], Optional[str]]:
+        """
+        Navega só até o primeiro byte (wait_until="commit") e lê o corpo da
+        resposta. Devolve (resultado, html); resultado None quando o HTML não
+        traz __NEXT_DATA__ com produtos, e html None quando nem isso veio.
+        """
+        self.logger.info(f"GET {url}")
         try:
-            stamp = _safe_name(query)
-            html_path = Path(self.debug_dir) / f"kabum_{stamp}_p{page_idx}_{tag}.html"
-            html_path.write_text(page.content(), encoding="utf-8")
-            self.logger.warning(f"DEBUG HTML salvo: {html_path}")
+            with self._span("goto"):
+                resp = page.goto(url, wait_until="commit", timeout=60000)
+                html = resp.text() if resp is not None and resp.ok else None
+        except Exception as e:
+            self.logger.warning(f"Página {page_idx}: falha ao ler HTML do servidor ({e})")
+            return None, None
+        if not html:
+            return None, None
+        return self._from_next_data(html, query_keywords, page_idx), html
+
+    def _from_next_data(self, html: str, query_keywords: List[str], page_idx: int) -> Optional[PageResult]:
+        from consulta_ecom.parsers.kabum import records_from_next_data
+
+        t0 = time.perf_counter()
+        parsed = records_from_next_data(html)
+        if parsed is None:
+            self.logger.info(f"Página {page_idx}: sem __NEXT_DATA__ | fallback=DOM")
+            return None
+
+        records, links_dom = parsed
+        res = self._items_from_records(records, links_dom, query_keywords, page_idx)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self.logger.info(f"Página {page_idx}: extração=next_data em {elapsed_ms:.0f} ms")
+        if self.timer is not None:
+            self.timer.record("extract", elapsed_ms / 1000)
+        return res
+
+    def _kick_render(self, page: Page, page_idx: int = 0) -> None:
+        if self.render_wait != "fixed":
+            with self._span("render"):
+                self._log_ready(page_idx, wait_ready(page, self._ready_config()))
+            return
 
-            png_path = Path(self.debug_dir) / f"kabum_{stamp}_p{page_idx}_{tag}.png"
-            page.screenshot(path=str(png_path), full_page=True)
-            self.logger.warning(f"DEBUG PNG salvo: {png_path}")
+        with self._span("render"):
+            try:
+                page.wait_for_selector("a[href*='/produto/']", timeout=12000)
+                return
+            except Exception:
+                pass
+
+            for _ in range(5):
+                page.mouse.wheel(0, 2600)
+                page.wait_for_timeout(900)
 
             try:
-                self.logger.warning(f"DEBUG title: {page.title()}")
+                page.wait_for_selector("a[href*='/produto/']", timeout=12000)
             except Exception:
                 pass
+
+    def _debug_target(self, page_idx: int, tag: str, query: str) -> Optional[str]:
+        """Nome do dump, ou None quando amostragem/limite por minuto dispensam a captura."""
+        capture = self.debug_capture
+        if not self.debug_enabled or capture is None or not capture.should_capture("kabum"):
+            return None
+        return f"kabum_{_safe_name(query)}_p{page_idx}_{tag}"
+
+    def _submit_debug(self, name: str, html: str, image: Optional[bytes], title: str) -> None:
+        if self.debug_capture.submit(name, html, image):
+            self.logger.warning(f"DEBUG agendado: {self.debug_dir}/{name} | title: {title}")
+        else:
+            self.logger.warning(f"DEBUG descartado (fila cheia): {name}")
+
+    def _dump_debug(self, page: Page, page_idx: int, tag: str, query: str) -> None:
+        # no thread do scraping só ficam content()/screenshot(); gzip e disco vão para o writer
+        name = self._debug_target(page_idx, tag, query)
+        if name is None:
+            return
+        try:
+            html = page.content()
         except Exception as e:
-            self.logger.warning(f"Falha ao salvar debug: {e}")
+            self.logger.warning(f"Falha ao capturar debug: {e}")
+            return
+        # screenshot e título são acessórios: sem eles o HTML ainda vale o dump
+        image: Optional[bytes] = None
+        shot = self.debug_capture.screenshot_options()
+        if shot is not None:
+            try:
+                image = page.screenshot(**shot)
+            except Exception as e:
+                self.logger.warning(f"Falha no screenshot de debug: {e}")
+        try:
+            title = page.title()
+        except Exception:
+            title = ""
+        self._submit_debug(name, html, image, title)
 
     def _build_url_100(self, query: str, page_number: int) -> str:
-        base = f"https://www.kabum.com.br/busca/{_slug_kabum(query)}"
+        base = f"{self.base_url.rstrip('/')}/busca/{_slug_kabum(query)}"
         return (
             f"{base}"
             f"?page_number={page_number}"
@@ -180,7 +515,100 @@ class KabumClient:
         page: Page,
         query_keywords: List[str],
         page_idx: int,
-    ) -> tuple[List[ProductItem], int, int]:
+    ) -> PageResult:
+        mode = self.extraction_mode
+        t0 = time.perf_counter()
+
+        result = None
+        if mode in ("batch", "html"):
+            try:
+                if mode == "html":
+                    result = self._extract_products_html(page, query_keywords, page_idx)
+                else:
+                    result = self._extract_products_batch(page, query_keywords, page_idx)
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: extração {mode} falhou ({e}) | fallback=locator")
+                mode = "locator"
+
+        if result is None:
+            mode = "locator"
+            result = self._extract_products_locator(page, query_keywords, page_idx)
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self.logger.info(f"Página {page_idx}: extração={mode} em {elapsed_ms:.0f} ms")
+        if self.timer is not None:
+            self.timer.record("extract", elapsed_ms / 1000)
+        return result
+
+    def _extract_card_records(self, page: Page, selector: str, max_links: int = 2500) -> tuple[List[dict], int]:
+        payload = page.evaluate(_BATCH_EXTRACT_JS, [selector, max_links])
+        return list(payload.get("records") or []), int(payload.get("links_dom") or 0)
+
+    def _extract_products_batch(
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        selector = "a[href*='/produto/']"
+        records, links_dom = self._extract_card_records(page, selector)
+
+        self.logger.debug(f'Seletor: "{selector}" | links_dom={links_dom} | registros={len(records)}')
+
+        return self._items_from_records(records, links_dom, query_keywords, page_idx)
+
+    def _extract_products_html(
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        # import tardio: parsers.kabum depende deste módulo
+        from consulta_ecom.parsers.kabum import records_from_html
+
+        records, links_dom = records_from_html(page.content())
+        self.logger.debug(f"HTML parseado | links_dom={links_dom} | registros={len(records)}")
+        return self._items_from_records(records, links_dom, query_keywords, page_idx)
+
+    def _from_cache(self, url: str, query_keywords: List[str], page_idx: int) -> Optional[PageResult]:
+        if self.page_cache is None:
+            return None
+        with self._span("cache"):
+            html = self.page_cache.get(url)
+            if html is None:
+                return None
+            from consulta_ecom.parsers.kabum import records_from_html, records_from_next_data
+
+            records, links_dom = records_from_next_data(html) or records_from_html(html)
+        if links_dom == 0:
+            return None
+        self.logger.info(f"Página {page_idx}: cache hit | links_dom={links_dom}")
+        return self._items_from_records(records, links_dom, query_keywords, page_idx)
+
+    def _items_from_records(
+        self,
+        records: List[dict],
+        links_dom: int,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        return records_to_page(
+            records, links_dom, query_keywords, page_idx, known=self.known_prices, rules=self.relevance_rules
+        )
+
+    def _card_price(self, a: Any) -> Optional[float]:
+        try:
+            card = a.locator("xpath=ancestor::*[self::article or self::div][1]")
+            return parse_price(card.inner_text(timeout=600)).price
+        except Exception:
+            return None
+
+    def _extract_products_locator(
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
         selector = "a[href*='/produto/']"
         anchors = page.locator(selector)
         links_dom = anchors.count()
@@ -189,7 +617,10 @@ class KabumClient:
 
         items: List[ProductItem] = []
         seen_urls = set()
-        filtered_out = 0
+        relevance = self.relevance_rules.compile(query_keywords)
+        rejections: Counter[str] = Counter()
+        unchanged: List[str] = []
+        known = self.known_prices
 
         for i in range(min(links_dom, 2500)):
             try:
@@ -210,6 +641,17 @@ class KabumClient:
 
             a = anchors.nth(i)
 
+            # incremental: item conhecido com o mesmo preço dispensa as sondas de título/imagem
+            price: Optional[float] = None
+            price_done = False
+            if known is not None:
+                h = _url_hash(href)
+                if h in known:
+                    price, price_done = self._card_price(a), True
+                    if _same_price(known[h], price):
+                        unchanged.append(h)
+                        continue
+
             title: Optional[str] = None
             for sel in ("h2", "h3", "[data-testid='product-title']", "span"):
                 try:
@@ -225,8 +667,9 @@ class KabumClient:
             if not title:
                 continue
 
-            if not _is_relevant(title, query_keywords):
-                filtered_out += 1
+            reason = relevance.check(title)
+            if reason is not None:
+                rejections[reason] += 1
                 continue
 
             img_url: Optional[str] = None
@@ -236,13 +679,8 @@ class KabumClient:
             except Exception:
                 img_url = None
 
-            price: Optional[float] = None
-            try:
-                card = a.locator("xpath=ancestor::*[self::article or self::div][1]")
-                price_text = card.inner_text(timeout=600)
-                price = _extract_float_price(price_text)
-            except Exception:
-                price = None
+            if not price_done:
+                price = self._card_price(a)
 
             items.append(
                 ProductItem(
@@ -255,74 +693,188 @@ class KabumClient:
                 )
             )
 
-        return items, links_dom, filtered_out
-
-    def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:
-        query = _norm_spaces(query)
-        query_keywords = _keywords_from_query(query)
-
-        self.logger.info(
-            f"SEARCH query='{query}' | limit={limit} | max_pages={max_pages} | page_size={self.page_size} | headless={self.headless}"
+        return PageResult(
+            page_idx, items, links_dom, sum(rejections.values()), len(unchanged), dict(rejections), unchanged
         )
 
-        results: List[ProductItem] = []
-        seen_hashes = set()
+    def _fetch_page(
+        self,
+        page: Page,
+        query: str,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        with self._labels(query=query, page=page_idx), self._span("page"):
+            url = self._build_url_100(query, page_idx)
+            self.logger.info(f"Página {page_idx} | URL(100): {url}")
 
-        zero_streak = 0
+            cached = self._from_cache(url, query_keywords, page_idx)
+            if cached is not None:
+                return cached
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            page = browser.new_page()
+            counter = install_blocking(page, self.block_profile) if self.block_profile else None
+            if counter is not None:
+                counter.reset()
 
-            for page_idx in range(1, max_pages + 1):
-                url = self._build_url_100(query, page_idx)
-                self.logger.info(f"Página {page_idx} | URL(100): {url}")
+            res, server_html = (None, None)
+            if self.next_data:
+                res, server_html = self._next_data_page(page, url, query_keywords, page_idx)
 
-                self._goto(page, url)
-                self._kick_render(page)
+            if res is None:
+                if server_html is None:
+                    self._goto(page, url)
+                else:
+                    # documento já em carregamento desde o commit: só falta o DOM
+                    with self._span("goto"):
+                        page.wait_for_load_state("domcontentloaded", timeout=60000)
+                    server_html = None
+                self._kick_render(page, page_idx)
 
-                items, links_dom, filtered_out = self._extract_products_from_dom(page, query_keywords, page_idx)
+                res = self._extract_products_from_dom(page, query_keywords, page_idx)
 
                 # retry leve se veio 0 links
                 retries = 0
-                while links_dom == 0 and retries < self.retry_if_links0:
+                while res.links_dom == 0 and retries < self.retry_if_links0:
                     retries += 1
                     self.logger.warning(f"Página {page_idx}: links_dom=0 | retry {retries}/{self.retry_if_links0}")
                     self._goto(page, url)
-                    self._kick_render(page)
-                    items, links_dom, filtered_out = self._extract_products_from_dom(page, query_keywords, page_idx)
+                    self._kick_render(page, page_idx)
+                    res = self._extract_products_from_dom(page, query_keywords, page_idx)
 
-                if links_dom == 0:
+            if res.links_dom == 0:
+                with self._span("debug"):
                     self._dump_debug(page, page_idx, "links0", query)
+            elif self.page_cache is not None:
+                try:
+                    with self._span("cache"):
+                        self.page_cache.put(url, server_html or page.content())
+                except Exception as e:
+                    self.logger.warning(f"Página {page_idx}: falha ao gravar cache ({e})")
 
-                added = 0
-                for it in items:
-                    h = _url_hash(it.url)
-                    if h in seen_hashes:
-                        continue
-                    seen_hashes.add(h)
-                    results.append(it)
-                    added += 1
-                    if len(results) >= limit:
-                        break
+            if counter is not None:
+                self.logger.info(f"Página {page_idx}: {format_stats(counter.snapshot())}")
 
-                self.logger.info(
-                    f"Página {page_idx}: links_dom={links_dom} | capturados={len(items)} | novos={added} | filtrados={filtered_out} | acumulado={len(results)}"
-                )
+            return res
 
-                if len(results) >= limit:
-                    break
+    def build_runtime(self, **overrides: Any) -> BrowserRuntime:
+        opts: dict[str, Any] = dict(
+            headless=self.headless,
+            max_contexts=max(1, self.concurrency),
+            log_file=self.log_file,
+            log_console=self.log_console,
+        )
+        opts.update(overrides)
+        return BrowserRuntime(**opts)
 
-                if added == 0:
-                    zero_streak += 1
-                    self.logger.warning(f"Página {page_idx}: 0 novos | zero_streak={zero_streak}")
-                    if zero_streak >= self.zero_streak_stop:
-                        self.logger.warning("Parando: páginas seguidas sem novos itens.")
-                        break
-                else:
-                    zero_streak = 0
+    def _iter_pages(
+        self,
+        runtime: BrowserRuntime,
+        query: str,
+        query_keywords: List[str],
+        max_pages: int,
+    ) -> Iterator[PageResult]:
+        """
+        Mantém até `concurrency` páginas em voo no runtime e entrega na ordem
+        1..max_pages. Ao fechar o gerador (limit/zero_streak), as páginas ainda
+        não iniciadas são canceladas.
+        """
+        parallel = max(1, min(self.concurrency, max_pages, runtime.max_contexts))
+        if parallel > 1:
+            self.logger.info(f"Modo concorrente: {parallel} páginas em paralelo")
+
+        pending: Deque[tuple[int, Future]] = deque()
+        next_idx = 1
+
+        def fill() -> None:
+            nonlocal next_idx
+            while next_idx <= max_pages and len(pending) < parallel:
+                job = partial(self._fetch_page, query=query, query_keywords=query_keywords, page_idx=next_idx)
+                pending.append((next_idx, runtime.submit(job)))
+                next_idx += 1
+
+        try:
+            fill()
+            while pending:
+                _, fut = pending.popleft()
+                yield fut.result()
+                fill()
+        finally:
+            for _, fut in pending:
+                fut.cancel()
+
+    def _new_merger(self, limit: int, keep_items: bool = True) -> _PageMerger:
+        if self.known_prices is not None:
+            self.logger.info(
+                f"Modo incremental: {len(self.known_prices)} itens conhecidos | stop_ratio={self.incremental_stop_ratio}"
+            )
+        return _PageMerger(
+            self.logger,
+            limit,
+            self.zero_streak_stop,
+            known_stop_ratio=self.incremental_stop_ratio if self.known_prices is not None else 0.0,
+            keep_items=keep_items,
+            on_unchanged=self.on_unchanged,
+        )
 
-            browser.close()
+    def _log_final(self, merger: _PageMerger) -> None:
+        self.logger.info(f"FINAL extraídos={merger.count} (limit={merger.limit})")
+        if self.page_cache is not None:
+            self.logger.info(f"Cache: {self.page_cache.format_stats()}")
+        if self.timer is not None:
+            self.logger.debug(f"Tempos: {self.timer.format_summary()}")
 
-        self.logger.info(f"FINAL extraídos={len(results)} (limit={limit})")
-        return results
+    def _iter_merged(self, query: str, max_pages: int, merger: _PageMerger) -> Iterator[List[ProductItem]]:
+        """Itens novos (dedupe/limit aplicados) de cada página, na ordem, assim que a página termina."""
+        query = _norm_spaces(query)
+        query_keywords = _keywords_from_query(query)
+
+        self.logger.info(
+            f"SEARCH query='{query}' | limit={merger.limit} | max_pages={max_pages} | page_size={self.page_size} | headless={self.headless}"
+        )
+
+        # runtime compartilhado; sem ele, launch por chamada (scripts avulsos)
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        pages = self._iter_pages(runtime, query, query_keywords, max_pages)
+        t_query = time.perf_counter()
+
+        try:
+            for res in pages:
+                with self._labels(query=query, page=res.page_idx), self._span("merge"):
+                    stop = merger.add(res)
+                if merger.fresh:
+                    yield merger.fresh
+                if stop:
+                    break
+        finally:
+            pages.close()
+            if owns_runtime:
+                runtime.close()
+            if self.timer is not None:
+                self.timer.record("query", time.perf_counter() - t_query, site="kabum", query=query)
+            self._log_final(merger)
+
+    def iter_pages(self, query: str, limit: int = 10, max_pages: int = 1) -> Iterator[List[ProductItem]]:
+        """
+        Versão streaming de search(): um lote por página, entregue assim que a
+        página é extraída e deduplicada. Nada é acumulado; com concurrency > 1
+        ficam no máximo `concurrency` páginas em voo à frente do consumidor.
+        Parar de iterar (break/close) cancela as páginas ainda não iniciadas.
+        """
+        return self._iter_merged(query, max_pages, self._new_merger(limit, keep_items=False))
+
+    def iter_search(self, query: str, limit: int = 10, max_pages: int = 1) -> Iterator[ProductItem]:
+        for batch in self.iter_pages(query, limit=limit, max_pages=max_pages):
+            yield from batch
+
+    def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:
+        return self.search_report(query, limit=limit, max_pages=max_pages).items
+
+    def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:
+        merger = self._new_merger(limit)
+        for _ in self._iter_merged(query, max_pages, merger):
+            pass
+        return merger.report()
@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, List, Optional
+
+from consulta_ecom.browser.async_runtime import AsyncBrowserRuntime
+from consulta_ecom.browser.blocking import format_stats, install_blocking_async
+from consulta_ecom.browser.readiness import wait_ready_async
+from consulta_ecom.clients.base import ProductItem, SearchReport
+from consulta_ecom.parsers.price import parse_price
+from consulta_ecom.sites.kabum import (
+    KabumClient,
+    PageResult,
+    _BATCH_EXTRACT_JS,
+    _PageMerger,
+    _keywords_from_query,
+    _norm_spaces,
+    _same_price,
+    _url_hash,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+
+@dataclass
+class AsyncKabumClient(KabumClient):
+    """
+    KabumClient sobre playwright.async_api. Reaproveita configuração, montagem
+    de URL e regras de relevância/preço do client síncrono; só o I/O é async.
+    A extração segue `extraction_mode` (batch, html ou locator, com fallback
+    para locator) e o I/O do cache de páginas roda em asyncio.to_thread.
+    """
+
+    runtime: Optional[AsyncBrowserRuntime] = None  # type: ignore[assignment]
+
+    def build_runtime(self, **overrides: Any) -> AsyncBrowserRuntime:  # type: ignore[override]
+        opts: dict[str, Any] = dict(
+            headless=self.headless,
+            max_contexts=max(1, self.concurrency),
+            log_file=self.log_file,
+            log_console=self.log_console,
+        )
+        opts.update(overrides)
+        return AsyncBrowserRuntime(**opts)
+
+    async def _goto(self, page: Page, url: str) -> None:  # type: ignore[override]
+        self.logger.info(f"GET {url}")
+        with self._span("goto"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        if self.render_wait != "fixed":
+            return
+        with self._span("networkidle"):
+            try:
+                await page.wait_for_load_state("networkidle", timeout=20000)
+            except Exception:
+                pass
+
+    async def _next_data_page(  # type: ignore[override]
+        self,
+        page: Page,
+        url: str,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> tuple[Optional[PageResult], Optional[str]]:
+        self.logger.info(f"GET {url}")
+        try:
+            with self._span("goto"):
+                resp = await page.goto(url, wait_until="commit", timeout=60000)
+                html = await resp.text() if resp is not None and resp.ok else None
+        except Exception as e:
+            self.logger.warning(f"Página {page_idx}: falha ao ler HTML do servidor ({e})")
+            return None, None
+        if not html:
+            return None, None
+        return self._from_next_data(html, query_keywords, page_idx), html
+
+    async def _kick_render(self, page: Page, page_idx: int = 0) -> None:  # type: ignore[override]
+        if self.render_wait != "fixed":
+            with self._span("render"):
+                self._log_ready(page_idx, await wait_ready_async(page, self._ready_config()))
+            return
+
+        with self._span("render"):
+            try:
+                await page.wait_for_selector("a[href*='/produto/']", timeout=12000)
+                return
+            except Exception:
+                pass
+
+            for _ in range(5):
+                await page.mouse.wheel(0, 2600)
+                await page.wait_for_timeout(900)
+
+            try:
+                await page.wait_for_selector("a[href*='/produto/']", timeout=12000)
+            except Exception:
+                pass
+
+    async def _dump_debug(self, page: Page, page_idx: int, tag: str, query: str) -> None:  # type: ignore[override]
+        name = self._debug_target(page_idx, tag, query)
+        if name is None:
+            return
+        try:
+            html = await page.content()
+        except Exception as e:
+            self.logger.warning(f"Falha ao capturar debug: {e}")
+            return
+        # screenshot e título são acessórios: sem eles o HTML ainda vale o dump
+        image: Optional[bytes] = None
+        shot = self.debug_capture.screenshot_options()
+        if shot is not None:
+            try:
+                image = await page.screenshot(**shot)
+            except Exception as e:
+                self.logger.warning(f"Falha no screenshot de debug: {e}")
+        try:
+            title = await page.title()
+        except Exception:
+            title = ""
+        self._submit_debug(name, html, image, title)
+
+    async def _extract_products_from_dom(  # type: ignore[override]
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        mode = self.extraction_mode
+        t0 = time.perf_counter()
+
+        result = None
+        if mode in ("batch", "html"):
+            try:
+                if mode == "html":
+                    result = await self._extract_products_html(page, query_keywords, page_idx)
+                else:
+                    result = await self._extract_products_batch(page, query_keywords, page_idx)
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: extração {mode} falhou ({e}) | fallback=locator")
+                mode = "locator"
+
+        if result is None:
+            mode = "locator"
+            result = await self._extract_products_locator(page, query_keywords, page_idx)
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        self.logger.info(f"Página {page_idx}: extração={mode} em {elapsed_ms:.0f} ms")
+        if self.timer is not None:
+            self.timer.record("extract", elapsed_ms / 1000)
+        return result
+
+    async def _extract_products_batch(  # type: ignore[override]
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        selector = "a[href*='/produto/']"
+        payload = await page.evaluate(_BATCH_EXTRACT_JS, [selector, 2500])
+        records = list(payload.get("records") or [])
+        links_dom = int(payload.get("links_dom") or 0)
+
+        self.logger.debug(f'Seletor: "{selector}" | links_dom={links_dom} | registros={len(records)}')
+
+        return self._items_from_records(records, links_dom, query_keywords, page_idx)
+
+    async def _extract_products_html(  # type: ignore[override]
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        # import tardio: parsers.kabum depende de sites.kabum
+        from consulta_ecom.parsers.kabum import records_from_html
+
+        html = await page.content()
+        # parse do lxml fora do event loop, como o cache
+        records, links_dom = await asyncio.to_thread(records_from_html, html)
+        self.logger.debug(f"HTML parseado | links_dom={links_dom} | registros={len(records)}")
+        return self._items_from_records(records, links_dom, query_keywords, page_idx)
+
+    async def _card_price(self, a: Any) -> Optional[float]:  # type: ignore[override]
+        try:
+            card = a.locator("xpath=ancestor::*[self::article or self::div][1]")
+            return parse_price(await card.inner_text(timeout=600)).price
+        except Exception:
+            return None
+
+    async def _extract_products_locator(  # type: ignore[override]
+        self,
+        page: Page,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        selector = "a[href*='/produto/']"
+        anchors = page.locator(selector)
+        links_dom = await anchors.count()
+
+        self.logger.debug(f'Seletor: "{selector}" | links_dom={links_dom}')
+
+        items: List[ProductItem] = []
+        seen_urls = set()
+        relevance = self.relevance_rules.compile(query_keywords)
+        rejections: Counter[str] = Counter()
+        unchanged: List[str] = []
+        known = self.known_prices
+
+        for i in range(min(links_dom, 2500)):
+            try:
+                href = await anchors.nth(i).get_attribute("href") or ""
+            except Exception:
+                continue
+
+            if not href:
+                continue
+            if href.startswith("/"):
+                href = "https://www.kabum.com.br" + href
+            if "/produto/" not in href:
+                continue
+
+            if href in seen_urls:
+                continue
+            seen_urls.add(href)
+
+            a = anchors.nth(i)
+
+            # incremental: item conhecido com o mesmo preço dispensa as sondas de título/imagem
+            price: Optional[float] = None
+            price_done = False
+            if known is not None:
+                h = _url_hash(href)
+                if h in known:
+                    price, price_done = await self._card_price(a), True
+                    if _same_price(known[h], price):
+                        unchanged.append(h)
+                        continue
+
+            title: Optional[str] = None
+            for sel in ("h2", "h3", "[data-testid='product-title']", "span"):
+                try:
+                    title = _norm_spaces(await a.locator(sel).first.inner_text(timeout=350))
+                    if title and len(title) >= 6:
+                        break
+                except Exception:
+                    title = None
+
+            if not title:
+                title = _norm_spaces(await a.get_attribute("title") or await a.get_attribute("aria-label") or "")
+            if not title:
+                continue
+
+            reason = relevance.check(title)
+            if reason is not None:
+                rejections[reason] += 1
+                continue
+
+            img_url: Optional[str] = None
+            try:
+                img = a.locator("img").first
+                img_url = await img.get_attribute("src") or await img.get_attribute("data-src")
+            except Exception:
+                img_url = None
+
+            if not price_done:
+                price = await self._card_price(a)
+
+            items.append(
+                ProductItem(
+                    title=title,
+                    price=price,
+                    url=href,
+                    image=img_url or None,
+                    source="kabum",
+                    page=page_idx,
+                )
+            )
+
+        return PageResult(
+            page_idx, items, links_dom, sum(rejections.values()), len(unchanged), dict(rejections), unchanged
+        )
+
+    async def _fetch_page(  # type: ignore[override]
+        self,
+        runtime: AsyncBrowserRuntime,
+        query: str,
+        query_keywords: List[str],
+        page_idx: int,
+    ) -> PageResult:
+        with self._labels(query=query, page=page_idx), self._span("page"):
+            url = self._build_url_100(query, page_idx)
+            self.logger.info(f"Página {page_idx} | URL(100): {url}")
+
+            # cache hit não ocupa slot do pool; leitura gzip + parse fora do event loop
+            cached = await asyncio.to_thread(self._from_cache, url, query_keywords, page_idx)
+            if cached is not None:
+                return cached
+
+            t_wait = time.perf_counter()
+            async with runtime.page() as page:
+                if self.timer is not None:
+                    self.timer.record("slot_wait", time.perf_counter() - t_wait)
+                counter = await install_blocking_async(page, self.block_profile) if self.block_profile else None
+                if counter is not None:
+                    counter.reset()
+
+                res, server_html = (None, None)
+                if self.next_data:
+                    res, server_html = await self._next_data_page(page, url, query_keywords, page_idx)
+
+                if res is None:
+                    if server_html is None:
+                        await self._goto(page, url)
+                    else:
+                        with self._span("goto"):
+                            await page.wait_for_load_state("domcontentloaded", timeout=60000)
+                        server_html = None
+                    await self._kick_render(page, page_idx)
+
+                    res = await self._extract_products_from_dom(page, query_keywords, page_idx)
+
+                    # retry leve se veio 0 links
+                    retries = 0
+                    while res.links_dom == 0 and retries < self.retry_if_links0:
+                        retries += 1
+                        self.logger.warning(f"Página {page_idx}: links_dom=0 | retry {retries}/{self.retry_if_links0}")
+                        await self._goto(page, url)
+                        await self._kick_render(page, page_idx)
+                        res = await self._extract_products_from_dom(page, query_keywords, page_idx)
+
+                if res.links_dom == 0:
+                    with self._span("debug"):
+                        await self._dump_debug(page, page_idx, "links0", query)
+                elif self.page_cache is not None:
+                    try:
+                        html = server_html or await page.content()
+                        with self._span("cache"):
+                            await asyncio.to_thread(self.page_cache.put, url, html)
+                    except Exception as e:
+                        self.logger.warning(f"Página {page_idx}: falha ao gravar cache ({e})")
+
+                if counter is not None:
+                    self.logger.info(f"Página {page_idx}: {format_stats(counter.snapshot())}")
+
+            return res
+
+    async def _iter_pages(  # type: ignore[override]
+        self,
+        runtime: AsyncBrowserRuntime,
+        query: str,
+        query_keywords: List[str],
+        max_pages: int,
+    ) -> AsyncIterator[PageResult]:
+        parallel = max(1, min(self.concurrency, max_pages, runtime.max_contexts))
+        if parallel > 1:
+            self.logger.info(f"Modo concorrente: {parallel} páginas em paralelo")
+
+        pending: Deque[tuple[int, "asyncio.Task[PageResult]"]] = deque()
+        next_idx = 1
+
+        def fill() -> None:
+            nonlocal next_idx
+            while next_idx <= max_pages and len(pending) < parallel:
+                task = asyncio.create_task(self._fetch_page(runtime, query, query_keywords, next_idx))
+                pending.append((next_idx, task))
+                next_idx += 1
+
+        try:
+            fill()
+            while pending:
+                _, task = pending.popleft()
+                yield await task
+                fill()
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    async def _iter_merged(  # type: ignore[override]
+        self, query: str, max_pages: int, merger: _PageMerger
+    ) -> AsyncIterator[List[ProductItem]]:
+        query = _norm_spaces(query)
+        query_keywords = _keywords_from_query(query)
+
+        self.logger.info(
+            f"SEARCH(async) query='{query}' | limit={merger.limit} | max_pages={max_pages} | page_size={self.page_size} | headless={self.headless}"
+        )
+
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        pages = self._iter_pages(runtime, query, query_keywords, max_pages)
+        t_query = time.perf_counter()
+
+        try:
+            async for res in pages:
+                with self._labels(query=query, page=res.page_idx), self._span("merge"):
+                    stop = merger.add(res)
+                if merger.fresh:
+                    yield merger.fresh
+                if stop:
+                    break
+        finally:
+            await pages.aclose()
+            if owns_runtime:
+                await runtime.close()
+            if self.timer is not None:
+                self.timer.record("query", time.perf_counter() - t_query, site="kabum", query=query)
+            self._log_final(merger)
+
+    def iter_pages(  # type: ignore[override]
+        self, query: str, limit: int = 10, max_pages: int = 1
+    ) -> AsyncIterator[List[ProductItem]]:
+        """Async iterator de lotes por página (ver KabumClient.iter_pages)."""
+        return self._iter_merged(query, max_pages, self._new_merger(limit, keep_items=False))
+
+    async def iter_search(  # type: ignore[override]
+        self, query: str, limit: int = 10, max_pages: int = 1
+    ) -> AsyncIterator[ProductItem]:
+        pages = self.iter_pages(query, limit=limit, max_pages=max_pages)
+        try:
+            async for batch in pages:
+                for item in batch:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    async def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:  # type: ignore[override]
+        return (await self.search_report(query, limit=limit, max_pages=max_pages)).items
+
+    async def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:  # type: ignore[override]
+        merger = self._new_merger(limit)
+        async for _ in self._iter_merged(query, max_pages, merger):
+            pass
+        return merger.report()
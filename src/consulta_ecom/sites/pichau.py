@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import re
+import time
+from collections import Counter
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Set
 from urllib.parse import quote_plus, urljoin
 
-from playwright.sync_api import sync_playwright, Page
-from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.browser.blocking import BlockProfile, format_stats, install_blocking
+from consulta_ecom.browser.readiness import ReadyConfig, ReadyResult, wait_ready
+from consulta_ecom.browser.runtime import BrowserRuntime
+from consulta_ecom.cache.page_cache import PageCache
+from consulta_ecom.clients.base import ProductItem, SearchReport
+from consulta_ecom.clients.stream import BoundedStream
+from consulta_ecom.filters.relevance import QueryRule, RuleSet, count_rejections, format_rejections
+from consulta_ecom.parsers.price import parse_prices
 from consulta_ecom.utils.logger import setup_logger
+from consulta_ecom.utils.timing import PhaseTimer
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 # ==========================================================
 # UTILITÁRIOS
@@ -16,29 +29,117 @@ from consulta_ecom.utils.logger import setup_logger
 def _norm_spaces(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip())
 
-def _extract_float_price(text: str) -> Optional[float]:
-    if not text: return None
-    # Busca R$ 1.000,00 ou 1.000,00
-    m = re.search(r"R\$\s?(\d{1,3}(?:\.\d{3})*(?:,\d{2})|\d+(?:,\d{2}))", text)
-    if not m:
-        m = re.search(r"(\d{1,3}(?:\.\d{3})*(?:,\d{2})|\d+(?:,\d{2}))", text)
-    if not m: return None
-    raw = m.group(1).replace(".", "").replace(",", ".")
-    try: return float(raw)
-    except ValueError: return None
-
 def _keywords_from_query(query: str) -> List[str]:
     q = _norm_spaces(query).lower()
     return [p for p in re.split(r"[\s\-_/]+", q) if p and len(p) >= 2]
 
-def _is_relevant(title: str, query_keywords: List[str]) -> bool:
-    t = (title or "").lower()
-    blacklist = ("mídia", "media", "access", "carregador", "dock", "base", "suporte", "cabo", "capa", "case", "película", "skin", "adesivo", "borracha", "ventoinha")
-    if any(b in t for b in blacklist): return False
-    
-    if "controle" in query_keywords:
-        return "controle" in t or "dualsense" in t or "joystick" in t
-    return True
+# Com "controle" na query, o título precisa falar de controle/DualSense/joystick.
+PICHAU_RELEVANCE = RuleSet(
+    name="pichau",
+    blacklist=("mídia", "media", "access", "carregador", "dock", "base", "suporte", "cabo", "capa", "case", "película", "skin", "adesivo", "borracha", "ventoinha"),
+    query_rules=(
+        QueryRule(name="controle", when=(("controle",),), accept=r"controle|dualsense|joystick"),
+    ),
+    keyword_hits=False,
+)
+
+def cards_to_items(
+    records: List[dict],
+    query_keywords: List[str],
+    page_idx: int,
+    base_url: str,
+    seen_urls: Set[str],
+    limit: Optional[int] = None,
+    rules: RuleSet = PICHAU_RELEVANCE,
+    rejections: Optional[Counter] = None,
+) -> List[ProductItem]:
+    """
+    Regras de card da Pichau sobre registros {text, href, title, image}, venham
+    do browser ou do parser offline (parsers.pichau). `seen_urls` e
+    `rejections` (regra -> descartes) são atualizados.
+    """
+    candidates: List[tuple[str, str, dict]] = []
+    for rec in records:
+        text_content = rec.get("text") or ""
+        if "R$" not in text_content:
+            continue
+
+        href = rec.get("href")
+        if not href:
+            continue
+        full_url = urljoin(base_url, href)
+
+        # Tenta pegar h2, se não, pega do texto bruto
+        title = rec.get("title")
+        if title is None:
+            lines = [l for l in text_content.split('\n') if len(l) > 15]
+            title = lines[0] if lines else "Sem Título"
+        candidates.append((full_url, _norm_spaces(title), rec))
+
+    reasons = rules.compile(query_keywords).evaluate([title for _, title, _ in candidates])
+    if rejections is not None:
+        rejections.update(count_rejections(reasons))
+
+    accepted: List[tuple[str, str, dict]] = []
+    for (full_url, title, rec), reason in zip(candidates, reasons):
+        if reason is not None or full_url in seen_urls:
+            continue
+        seen_urls.add(full_url)
+        accepted.append((full_url, title, rec))
+        if limit is not None and len(accepted) >= limit:
+            break
+
+    prices = parse_prices([rec.get("text") for _, _, rec in accepted])
+
+    items: List[ProductItem] = []
+    for (full_url, title, rec), info in zip(accepted, prices):
+        items.append(ProductItem(
+            title=title,
+            price=info.price,
+            url=full_url,
+            image=rec.get("image"),
+            source="pichau",
+            page=page_idx,
+        ))
+    return items
+
+# Um único page.evaluate por página: devolve {text, href, title, image} de todos
+# os cards. Link: <a> interno OU <a> pai (closest), como no caminho por locator.
+_CARDS_EXTRACT_JS = """(selector) => {
+    const out = [];
+    for (const card of document.querySelectorAll(selector)) {
+        const inside = card.querySelector('a');
+        const link = inside || card.closest('a');
+        const h2 = card.querySelector('h2');
+        const img = card.querySelector('img');
+        out.push({
+            text: card.innerText || '',
+            href: link ? link.getAttribute('href') : null,
+            title: h2 ? h2.innerText : null,
+            image: img ? img.getAttribute('src') : null,
+        });
+    }
+    return out;
+}"""
+
+_CARD_LINK_JS = """element => {
+    const linkInside = element.querySelector('a');
+    if (linkInside) return linkInside.getAttribute('href');
+
+    const linkWrapper = element.closest('a');
+    if (linkWrapper) return linkWrapper.getAttribute('href');
+
+    return null;
+}"""
+
+_CARD_SELECTOR = "div.MuiCard-root"
+
+# Imagens carregam via lazy-load, mas só o atributo src é usado. Os scripts do
+# Cloudflare precisam passar, senão o desafio do perfil persistente falha.
+PICHAU_BLOCK_PROFILE = BlockProfile(
+    name="pichau",
+    allow_patterns=(r"challenges\.cloudflare\.com", r"/cdn-cgi/"),
+)
 
 @dataclass
 class PichauClient:
@@ -56,118 +157,256 @@ class PichauClient:
     BASE_URL: str = "https://www.pichau.com.br"
     USER_DATA_DIR: str = "./chrome_perfil"
 
+    # Espera de renderização: "adaptive" (cards estáveis + DOM quieto, scroll só
+    # enquanto aparecem cards novos) ou "fixed" (legado: 4 scrolls de 500 ms)
+    render_wait: str = "adaptive"
+    ready: Optional[ReadyConfig] = None   # None -> padrão a partir de page_size
+
+    # Browser compartilhado entre buscas (None -> launch por chamada)
+    runtime: Optional[BrowserRuntime] = None
+
+    # Interceptação de requests (None -> sem bloqueio)
+    block_profile: Optional[BlockProfile] = PICHAU_BLOCK_PROFILE
+
+    # Regras de relevância (blacklist, termos obrigatórios, regras por query)
+    relevance_rules: RuleSet = PICHAU_RELEVANCE
+
+    # Cache em disco do HTML renderizado (None -> sempre navega)
+    page_cache: Optional[PageCache] = None
+
+    # Duração por fase (goto/render/extract/...) por página e query
+    timer: Optional[PhaseTimer] = None
+
     def __post_init__(self) -> None:
         lvl = "DEBUG" if self.verbose else self.log_level
         self.logger = setup_logger("PichauClient", level=lvl, log_file=self.log_file, console=self.log_console)
 
+    def _span(self, phase: str) -> Any:
+        return self.timer.span(phase) if self.timer is not None else nullcontext()
+
+    def _labels(self, **labels: Any) -> Any:
+        return self.timer.labels(site="pichau", **labels) if self.timer is not None else nullcontext()
+
+    def _ready_config(self) -> ReadyConfig:
+        if self.ready is not None:
+            return self.ready
+        return ReadyConfig(selector=_CARD_SELECTOR, expected=self.page_size, scroll_px=1600)
+
+    def _log_ready(self, page_idx: int, res: ReadyResult) -> None:
+        log = self.logger.info if res.ok else self.logger.warning
+        log(f"Página {page_idx}: {res.describe()}")
+
+    def build_runtime(self, **overrides: Any) -> BrowserRuntime:
+        opts: dict[str, Any] = dict(
+            headless=self.headless,
+            max_contexts=1,
+            user_data_dir=self.USER_DATA_DIR,
+            launch_args=["--disable-blink-features=AutomationControlled", "--start-maximized"],
+            context_options={"viewport": None},
+            log_file=self.log_file,
+            log_console=self.log_console,
+        )
+        opts.update(overrides)
+        return BrowserRuntime(**opts)
+
     def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:
-        results: List[ProductItem] = []
-        
+        return self.search_report(query, limit=limit, max_pages=max_pages).items
+
+    def iter_pages(
+        self, query: str, limit: int = 10, max_pages: int = 1, buffer: int = 1
+    ) -> Iterator[List[ProductItem]]:
+        """
+        Versão streaming de search(): um lote por página assim que extraído.
+        A navegação roda no slot do runtime e entrega por uma fila de até
+        `buffer` páginas; com a fila cheia o browser espera o consumidor.
+        """
         if not Path(self.USER_DATA_DIR).exists():
             self.logger.critical(f"🛑 Perfil '{self.USER_DATA_DIR}' não encontrado. Rode setup_perfil.py.")
-            return []
+            return
+
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        stream: BoundedStream[List[ProductItem]] = BoundedStream(buffer)
+
+        def produce(page: Page) -> None:
+            try:
+                for batch in self._iter_on_page(page, query, limit, max_pages, SearchReport()):
+                    if not stream.put(batch):
+                        break
+            except BaseException as e:
+                stream.finish(e)
+                return
+            stream.finish()
+
+        job = runtime.submit(produce)
+        # job que nem chegou a rodar (browser não subiu) também encerra o stream
+        job.add_done_callback(lambda f: stream.finish(None if f.cancelled() else f.exception()))
+        try:
+            yield from stream
+        finally:
+            stream.close()
+            try:
+                job.result()
+            except Exception:
+                pass  # já entregue ao consumidor pelo stream
+            if owns_runtime:
+                runtime.close()
+
+    def iter_search(self, query: str, limit: int = 10, max_pages: int = 1) -> Iterator[ProductItem]:
+        for batch in self.iter_pages(query, limit=limit, max_pages=max_pages):
+            yield from batch
+
+    def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:
+        if not Path(self.USER_DATA_DIR).exists():
+            self.logger.critical(f"🛑 Perfil '{self.USER_DATA_DIR}' não encontrado. Rode setup_perfil.py.")
+            return SearchReport()
 
         self.logger.info(f"🔓 Usando Perfil Persistente...")
 
-        with sync_playwright() as p:
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=self.USER_DATA_DIR,
-                headless=self.headless,
-                args=["--disable-blink-features=AutomationControlled", "--start-maximized"],
-                viewport=None
-            )
-            
-            page = context.pages[0] if context.pages else context.new_page()
+        # runtime compartilhado; sem ele, launch por chamada (scripts avulsos)
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        try:
+            return runtime.run(lambda page: self._search_on_page(page, query, limit, max_pages))
+        finally:
+            if owns_runtime:
+                runtime.close()
+
+    def _extract_card_records(self, page: Page) -> List[dict]:
+        return page.evaluate(_CARDS_EXTRACT_JS, _CARD_SELECTOR) or []
+
+    def _extract_card_records_locator(self, page: Page) -> List[dict]:
+        # Caminho legado (várias chamadas por card); só usado se o evaluate falhar
+        cards = page.locator(_CARD_SELECTOR)
+        records: List[dict] = []
+        for i in range(cards.count()):
+            try:
+                card = cards.nth(i)
+                h2 = card.locator("h2")
+                img = card.locator("img").first
+                records.append({
+                    "text": card.inner_text(),
+                    "href": card.evaluate(_CARD_LINK_JS),
+                    "title": h2.first.inner_text() if h2.count() else None,
+                    "image": img.get_attribute("src") if img.count() else None,
+                })
+            except Exception:
+                continue
+        return records
+
+    def _cached_records(self, url: str) -> Optional[List[dict]]:
+        if self.page_cache is None:
+            return None
+        with self._span("cache"):
+            html = self.page_cache.get(url)
+            if html is None:
+                return None
+            # import tardio: parsers.pichau depende deste módulo
+            from consulta_ecom.parsers.pichau import records_from_html
 
+            return records_from_html(html) or None
+
+    def _fixed_render_wait(self, page: Page) -> None:
+        try:
+            page.wait_for_selector(_CARD_SELECTOR, timeout=15000)
+        except:
+            pass # Segue mesmo se der timeout, tenta pegar o que tem
+
+        # Scroll para carregar imagens e preços
+        for _ in range(4):
+            page.mouse.wheel(0, 800)
+            page.wait_for_timeout(500)
+
+    def _load_records(self, page: Page, url: str, page_idx: int, counter: Any) -> Optional[List[dict]]:
+        """Navega e extrai os cards; None se a navegação falhou."""
+        if counter is not None:
+            counter.reset()
+
+        try:
+            with self._span("goto"):
+                page.goto(url, wait_until="commit", timeout=30000)
+            with self._span("render"):
+                if self.render_wait != "fixed":
+                    self._log_ready(page_idx, wait_ready(page, self._ready_config()))
+                else:
+                    self._fixed_render_wait(page)
+        except Exception as e:
+            self.logger.error(f"Erro navegação: {e}")
+            return None
+
+        with self._span("extract"):
+            try:
+                records = self._extract_card_records(page)
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: extração batch falhou ({e}) | fallback=locator")
+                records = self._extract_card_records_locator(page)
+
+        if counter is not None:
+            self.logger.info(f"Página {page_idx}: {format_stats(counter.snapshot())}")
+        if records and self.page_cache is not None:
+            try:
+                with self._span("cache"):
+                    self.page_cache.put(url, page.content())
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: falha ao gravar cache ({e})")
+        return records
+
+    def _iter_on_page(
+        self, page: Page, query: str, limit: int, max_pages: int, report: SearchReport
+    ) -> Iterator[List[ProductItem]]:
+        """Itens novos de cada página assim que extraídos; links e rejeições vão para `report`."""
+        counter = install_blocking(page, self.block_profile) if self.block_profile else None
+        query_keywords = _keywords_from_query(query)
+        seen_urls: Set[str] = set()
+        rejections: Counter[str] = Counter()
+        total = 0
+        t_query = time.perf_counter()
+
+        try:
             for page_idx in range(1, max_pages + 1):
-                url = f"{self.BASE_URL}/search?q={quote_plus(query)}&p={page_idx}"
-                self.logger.info(f"Página {page_idx}: {url}")
-                
-                try:
-                    page.goto(url, wait_until="commit", timeout=30000)
-                    try:
-                        page.wait_for_selector("div.MuiCard-root", timeout=15000)
-                    except:
-                        pass # Segue mesmo se der timeout, tenta pegar o que tem
-                    
-                    # Scroll para carregar imagens e preços
-                    for _ in range(4):
-                        page.mouse.wheel(0, 800)
-                        page.wait_for_timeout(500)
-
-                except Exception as e:
-                    self.logger.error(f"Erro navegação: {e}")
+                with self._labels(query=query, page=page_idx), self._span("page"):
+                    url = f"{self.BASE_URL}/search?q={quote_plus(query)}&p={page_idx}"
+                    self.logger.info(f"Página {page_idx}: {url}")
+
+                    records = self._cached_records(url)
+                    if records is not None:
+                        self.logger.info(f"Página {page_idx}: cache hit | cards={len(records)}")
+                    else:
+                        records = self._load_records(page, url, page_idx, counter)
+
+                    if records is not None:
+                        report.links_per_page.append(len(records))
+                        self.logger.info(f"Cards na tela: {len(records)}")
+
+                        batch = cards_to_items(
+                            records, query_keywords, page_idx, self.BASE_URL, seen_urls, limit=limit - total,
+                            rules=self.relevance_rules, rejections=rejections,
+                        )
+                        total += len(batch)
+                        self.logger.info(f"✅ Itens capturados: {total} | filtrados: {format_rejections(rejections)}")
+
+                if records is None:
+                    break
+                if batch:
+                    yield batch
+                if total >= limit:
                     break
+        finally:
+            report.rejections = dict(rejections)
+            if self.timer is not None:
+                self.timer.record("query", time.perf_counter() - t_query, site="pichau", query=query)
+                self.logger.debug(f"Tempos: {self.timer.format_summary()}")
+            if self.page_cache is not None:
+                self.logger.info(f"Cache: {self.page_cache.format_stats()}")
 
-                # ALVO: Container do Card
-                cards = page.locator("div.MuiCard-root")
-                count = cards.count()
-                self.logger.info(f"Cards na tela: {count}")
-
-                for i in range(count):
-                    try:
-                        card = cards.nth(i)
-                        
-                        # Extração de Texto
-                        text_content = card.inner_text()
-                        
-                        if "R$" not in text_content: 
-                            continue
-
-                        # --- ESTRATÉGIA HÍBRIDA DE LINK (A MÁGICA) ---
-                        # Procura link dentro (querySelector) OU link pai (closest)
-                        # Isso resolve o problema de timeout
-                        href = card.evaluate("""element => {
-                            const linkInside = element.querySelector('a');
-                            if (linkInside) return linkInside.getAttribute('href');
-                            
-                            const linkWrapper = element.closest('a');
-                            if (linkWrapper) return linkWrapper.getAttribute('href');
-                            
-                            return null;
-                        }""")
-
-                        if not href:
-                            # self.logger.warning(f"Card {i} sem link. Pulando.")
-                            continue
-
-                        full_url = urljoin(self.BASE_URL, href)
-
-                        # Extração de Título
-                        # Tenta pegar h2, se não, pega do texto bruto
-                        h2 = card.locator("h2")
-                        if h2.count():
-                            title = h2.first.inner_text()
-                        else:
-                            lines = [l for l in text_content.split('\n') if len(l) > 15]
-                            title = lines[0] if lines else "Sem Título"
-                        
-                        title = _norm_spaces(title)
-
-                        if not _is_relevant(title, _keywords_from_query(query)): 
-                            continue
-
-                        # Evita duplicatas
-                        if any(p.url == full_url for p in results): continue
-
-                        price = _extract_float_price(text_content)
-                        
-                        # Imagem
-                        img_el = card.locator("img").first
-                        img = img_el.get_attribute("src") if img_el.count() else None
-
-                        results.append(ProductItem(
-                            title=title, price=price, url=full_url, image=img, source="pichau", page=page_idx
-                        ))
-
-                        if len(results) >= limit: break
-                    except Exception as e:
-                        # self.logger.error(f"Erro processando card {i}: {e}")
-                        continue
-                
-                self.logger.info(f"✅ Itens capturados: {len(results)}")
-                if len(results) >= limit: break
-
-            context.close()
-            
-        return results
\ No newline at end of file
+    def _search_on_page(self, page: Page, query: str, limit: int, max_pages: int) -> SearchReport:
+        report = SearchReport()
+        for batch in self._iter_on_page(page, query, limit, max_pages, report):
+            report.items.extend(batch)
+        return report
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Set
+from urllib.parse import quote_plus
+
+from consulta_ecom.browser.async_runtime import AsyncBrowserRuntime
+from consulta_ecom.browser.blocking import format_stats, install_blocking_async
+from consulta_ecom.browser.readiness import wait_ready_async
+from consulta_ecom.clients.base import ProductItem, SearchReport
+from consulta_ecom.filters.relevance import format_rejections
+from consulta_ecom.sites.pichau import (
+    _CARD_LINK_JS,
+    _CARD_SELECTOR,
+    _CARDS_EXTRACT_JS,
+    PichauClient,
+    _keywords_from_query,
+    cards_to_items,
+)
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+@dataclass
+class AsyncPichauClient(PichauClient):
+    """PichauClient sobre playwright.async_api (mesmo perfil persistente e regras)."""
+
+    runtime: Optional[AsyncBrowserRuntime] = None  # type: ignore[assignment]
+
+    def build_runtime(self, **overrides: Any) -> AsyncBrowserRuntime:  # type: ignore[override]
+        opts: dict[str, Any] = dict(
+            headless=self.headless,
+            max_contexts=1,
+            user_data_dir=self.USER_DATA_DIR,
+            launch_args=["--disable-blink-features=AutomationControlled", "--start-maximized"],
+            context_options={"viewport": None},
+            log_file=self.log_file,
+            log_console=self.log_console,
+        )
+        opts.update(overrides)
+        return AsyncBrowserRuntime(**opts)
+
+    async def search(self, query: str, limit: int = 10, max_pages: int = 1) -> List[ProductItem]:  # type: ignore[override]
+        return (await self.search_report(query, limit=limit, max_pages=max_pages)).items
+
+    async def iter_pages(  # type: ignore[override]
+        self, query: str, limit: int = 10, max_pages: int = 1
+    ) -> AsyncIterator[List[ProductItem]]:
+        """Async iterator de lotes por página; a página do runtime fica emprestada até o fim da iteração."""
+        if not Path(self.USER_DATA_DIR).exists():
+            self.logger.critical(f"🛑 Perfil '{self.USER_DATA_DIR}' não encontrado. Rode setup_perfil.py.")
+            return
+
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        try:
+            async with runtime.page() as page:
+                pages = self._iter_on_page(page, query, limit, max_pages, SearchReport())
+                try:
+                    async for batch in pages:
+                        yield batch
+                finally:
+                    await pages.aclose()
+        finally:
+            if owns_runtime:
+                await runtime.close()
+
+    async def iter_search(  # type: ignore[override]
+        self, query: str, limit: int = 10, max_pages: int = 1
+    ) -> AsyncIterator[ProductItem]:
+        pages = self.iter_pages(query, limit=limit, max_pages=max_pages)
+        try:
+            async for batch in pages:
+                for item in batch:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    async def search_report(self, query: str, limit: int = 10, max_pages: int = 1) -> SearchReport:  # type: ignore[override]
+        if not Path(self.USER_DATA_DIR).exists():
+            self.logger.critical(f"🛑 Perfil '{self.USER_DATA_DIR}' não encontrado. Rode setup_perfil.py.")
+            return SearchReport()
+
+        self.logger.info(f"🔓 Usando Perfil Persistente (async)...")
+
+        runtime = self.runtime
+        owns_runtime = runtime is None
+        if runtime is None:
+            runtime = self.build_runtime()
+
+        try:
+            async with runtime.page() as page:
+                return await self._search_on_page(page, query, limit, max_pages)
+        finally:
+            if owns_runtime:
+                await runtime.close()
+
+    async def _extract_card_records(self, page: Page) -> List[dict]:  # type: ignore[override]
+        return await page.evaluate(_CARDS_EXTRACT_JS, _CARD_SELECTOR) or []
+
+    async def _extract_card_records_locator(self, page: Page) -> List[dict]:  # type: ignore[override]
+        cards = page.locator(_CARD_SELECTOR)
+        records: List[dict] = []
+        for i in range(await cards.count()):
+            try:
+                card = cards.nth(i)
+                h2 = card.locator("h2")
+                img = card.locator("img").first
+                records.append({
+                    "text": await card.inner_text(),
+                    "href": await card.evaluate(_CARD_LINK_JS),
+                    "title": await h2.first.inner_text() if await h2.count() else None,
+                    "image": await img.get_attribute("src") if await img.count() else None,
+                })
+            except Exception:
+                continue
+        return records
+
+    async def _fixed_render_wait(self, page: Page) -> None:  # type: ignore[override]
+        try:
+            await page.wait_for_selector(_CARD_SELECTOR, timeout=15000)
+        except Exception:
+            pass  # Segue mesmo se der timeout, tenta pegar o que tem
+
+        # Scroll para carregar imagens e preços
+        for _ in range(4):
+            await page.mouse.wheel(0, 800)
+            await page.wait_for_timeout(500)
+
+    async def _load_records(self, page: Page, url: str, page_idx: int, counter: Any) -> Optional[List[dict]]:  # type: ignore[override]
+        if counter is not None:
+            counter.reset()
+
+        try:
+            with self._span("goto"):
+                await page.goto(url, wait_until="commit", timeout=30000)
+            with self._span("render"):
+                if self.render_wait != "fixed":
+                    self._log_ready(page_idx, await wait_ready_async(page, self._ready_config()))
+                else:
+                    await self._fixed_render_wait(page)
+        except Exception as e:
+            self.logger.error(f"Erro navegação: {e}")
+            return None
+
+        with self._span("extract"):
+            try:
+                records = await self._extract_card_records(page)
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: extração batch falhou ({e}) | fallback=locator")
+                records = await self._extract_card_records_locator(page)
+
+        if counter is not None:
+            self.logger.info(f"Página {page_idx}: {format_stats(counter.snapshot())}")
+        if records and self.page_cache is not None:
+            try:
+                html = await page.content()
+                with self._span("cache"):
+                    await asyncio.to_thread(self.page_cache.put, url, html)
+            except Exception as e:
+                self.logger.warning(f"Página {page_idx}: falha ao gravar cache ({e})")
+        return records
+
+    async def _iter_on_page(  # type: ignore[override]
+        self, page: Page, query: str, limit: int, max_pages: int, report: SearchReport
+    ) -> AsyncIterator[List[ProductItem]]:
+        counter = await install_blocking_async(page, self.block_profile) if self.block_profile else None
+        query_keywords = _keywords_from_query(query)
+        seen_urls: Set[str] = set()
+        rejections: Counter[str] = Counter()
+        total = 0
+        t_query = time.perf_counter()
+
+        try:
+            for page_idx in range(1, max_pages + 1):
+                with self._labels(query=query, page=page_idx), self._span("page"):
+                    url = f"{self.BASE_URL}/search?q={quote_plus(query)}&p={page_idx}"
+                    self.logger.info(f"Página {page_idx}: {url}")
+
+                    # leitura gzip + parse fora do event loop
+                    records = await asyncio.to_thread(self._cached_records, url)
+                    if records is not None:
+                        self.logger.info(f"Página {page_idx}: cache hit | cards={len(records)}")
+                    else:
+                        records = await self._load_records(page, url, page_idx, counter)
+
+                    if records is not None:
+                        report.links_per_page.append(len(records))
+                        self.logger.info(f"Cards na tela: {len(records)}")
+
+                        batch = cards_to_items(
+                            records, query_keywords, page_idx, self.BASE_URL, seen_urls, limit=limit - total,
+                            rules=self.relevance_rules, rejections=rejections,
+                        )
+                        total += len(batch)
+                        self.logger.info(f"✅ Itens capturados: {total} | filtrados: {format_rejections(rejections)}")
+
+                if records is None:
+                    break
+                if batch:
+                    yield batch
+                if total >= limit:
+                    break
+        finally:
+            report.rejections = dict(rejections)
+            if self.timer is not None:
+                self.timer.record("query", time.perf_counter() - t_query, site="pichau", query=query)
+                self.logger.debug(f"Tempos: {self.timer.format_summary()}")
+            if self.page_cache is not None:
+                self.logger.info(f"Cache: {self.page_cache.format_stats()}")
+
+    async def _search_on_page(self, page: Page, query: str, limit: int, max_pages: int) -> SearchReport:  # type: ignore[override]
+        report = SearchReport()
+        async for batch in self._iter_on_page(page, query, limit, max_pages, report):
+            report.items.extend(batch)
+        return report
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import importlib
+import warnings
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+# Pacotes de terceiros podem expor sites com um entry point deste grupo
+# apontando para um SiteSpec (ex.: "mercado = meu_pacote.site:SPEC").
+ENTRY_POINT_GROUP = "consulta_ecom.sites"
+
+
+def _load(path: str) -> Any:
+    """'pacote.modulo:Atributo' -> objeto; o módulo só é importado aqui."""
+    module, _, attr = path.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in attr.split(".") if attr else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    """
+    Onde achar as peças de um site, por caminho de módulo. Nada é importado
+    no registro: Playwright, lxml etc. só carregam quando o client ou o
+    parser são pedidos.
+    """
+
+    name: str
+    client: str                           # "modulo:Classe" do client síncrono
+    async_client: str = ""                # "modulo:Classe" do client asyncio
+    parser: str = ""                      # "modulo:funcao" (html, query, page_idx) -> List[ProductItem]
+    description: str = ""
+
+    def client_class(self, use_async: bool = False) -> type:
+        path = self.async_client if use_async else self.client
+        if not path:
+            kind = "async" if use_async else "síncrono"
+            raise ValueError(f"Site '{self.name}' não tem client {kind}")
+        return _load(path)
+
+    def parse_function(self) -> Callable[..., Any]:
+        if not self.parser:
+            raise ValueError(f"Site '{self.name}' não tem parser offline")
+        return _load(self.parser)
+
+
+_SITES: Dict[str, SiteSpec] = {}
+_entry_points_loaded = False
+
+
+def register(spec: SiteSpec, replace: bool = False) -> SiteSpec:
+    key = spec.name.strip().lower()
+    if key in _SITES and not replace:
+        raise ValueError(f"Site '{spec.name}' já registrado")
+    _SITES[key] = spec
+    return spec
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    # varrer os metadados dos pacotes custa alguns ms: só quando o nome não é embutido
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name.lower() in _SITES:
+            continue
+        try:
+            spec = ep.load()
+        except Exception as e:
+            warnings.warn(f"Plugin de site '{ep.name}' não carregou: {e}")
+            continue
+        if isinstance(spec, SiteSpec):
+            _SITES[ep.name.lower()] = spec
+
+
+def get_site(name: str) -> SiteSpec:
+    key = (name or "").strip().lower()
+    if key not in _SITES:
+        _load_entry_points()
+    try:
+        return _SITES[key]
+    except KeyError:
+        raise ValueError(f"Site desconhecido: '{name}' (disponíveis: {', '.join(available_sites())})") from None
+
+
+def available_sites() -> List[str]:
+    _load_entry_points()
+    return sorted(_SITES)
+
+
+def create_client(name: str, use_async: bool = False, **kwargs: Any) -> Any:
+    """Instancia o client do site (kwargs vão direto para o dataclass)."""
+    return get_site(name).client_class(use_async)(**kwargs)
+
+
+register(SiteSpec(
+    name="kabum",
+    client="consulta_ecom.sites.kabum:KabumClient",
+    async_client="consulta_ecom.sites.kabum_async:AsyncKabumClient",
+    parser="consulta_ecom.parsers.kabum:parse_search_html",
+    description="Kabum (Next.js; __NEXT_DATA__ com fallback para o DOM)",
+))
+
+register(SiteSpec(
+    name="pichau",
+    client="consulta_ecom.sites.pichau:PichauClient",
+    async_client="consulta_ecom.sites.pichau_async:AsyncPichauClient",
+    parser="consulta_ecom.parsers.pichau:parse_search_html",
+    description="Pichau (perfil persistente; Cloudflare)",
+))
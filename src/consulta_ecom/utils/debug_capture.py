@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import os
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, NamedTuple, Optional
+
+# Extensões que o writer gera (e que contam no orçamento do diretório)
+_ARTIFACT_SUFFIXES = (".html", ".gz", ".png", ".jpg")
+
+
+class _Dump(NamedTuple):
+    name: str
+    html: str
+    image: Optional[bytes]
+    image_ext: str
+
+
+def read_debug_html(path: Path) -> str:
+    """HTML de um dump (.html ou .html.gz)."""
+    data = path.read_bytes()
+    if path.suffix == ".gz":
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="replace")
+
+
+@dataclass
+class DebugCapture:
+    """
+    Dumps de páginas que falharam (HTML + screenshot) sem travar o scraping:
+    amostragem e limite por minuto por site decidem *antes* de tocar na
+    página; compressão e escrita ficam num thread próprio, com fila
+    limitada (cheia -> o dump é descartado). O diretório tem orçamento em
+    bytes e os arquivos mais antigos saem primeiro.
+    """
+
+    root: str = "logs/debug"
+    sample_rate: float = 1.0          # fração das falhas que viram dump
+    max_per_minute: int = 6           # por site; 0 = sem limite
+    compress: bool = True             # HTML em .html.gz
+    screenshot: str = "viewport"      # "off" | "viewport" (JPEG da área visível) | "full" (PNG da página inteira)
+    jpeg_quality: int = 50
+    max_bytes: int = 50_000_000       # orçamento de debug_dir
+    queue_size: int = 32
+
+    def __post_init__(self) -> None:
+        self.stats: Dict[str, int] = {
+            "captured": 0, "sampled_out": 0, "rate_limited": 0, "dropped": 0,
+            "written": 0, "bytes": 0, "evicted": 0, "errors": 0,
+        }
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._recent: Dict[str, Deque[float]] = {}
+        self._queue: "queue.Queue[Optional[_Dump]]" = queue.Queue(maxsize=max(1, self.queue_size))
+        self._thread: Optional[threading.Thread] = None
+        # só o writer mexe aqui: arquivo -> tamanho, do mais antigo para o mais novo
+        self._files: "OrderedDict[Path, int]" = OrderedDict()
+        self._total = 0
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    # ------------------------------------------------------------------
+    # lado do scraping
+    # ------------------------------------------------------------------
+    def should_capture(self, site: str) -> bool:
+        """Amostragem + limite por minuto do site; chamar antes de page.content()."""
+        with self._lock:
+            if self.sample_rate < 1.0 and self._random.random() >= self.sample_rate:
+                self.stats["sampled_out"] += 1
+                return False
+            if self.max_per_minute > 0:
+                now = time.monotonic()
+                recent = self._recent.setdefault(site, deque())
+                while recent and now - recent[0] >= 60.0:
+                    recent.popleft()
+                if len(recent) >= self.max_per_minute:
+                    self.stats["rate_limited"] += 1
+                    return False
+                recent.append(now)
+            return True
+
+    def screenshot_options(self) -> Optional[Dict[str, Any]]:
+        """kwargs de page.screenshot() (sem path: os bytes vão para o writer); None = sem screenshot."""
+        if self.screenshot == "off":
+            return None
+        if self.screenshot == "full":
+            return {"full_page": True, "type": "png"}
+        return {"full_page": False, "type": "jpeg", "quality": self.jpeg_quality}
+
+    def submit(self, name: str, html: str, image: Optional[bytes] = None) -> bool:
+        """Enfileira o dump `name` (sem extensão); False se a fila estava cheia."""
+        self._ensure_writer()
+        ext = "png" if self.screenshot == "full" else "jpg"
+        try:
+            self._queue.put_nowait(_Dump(name, html, image, ext))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("captured")
+        return True
+
+    def flush(self) -> None:
+        """Espera o writer gravar tudo o que já foi enfileirado."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # writer
+    # ------------------------------------------------------------------
+    def _ensure_writer(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        self._scan()
+        while True:
+            dump = self._queue.get()
+            try:
+                if dump is None:
+                    return
+                self._write(dump)
+            except OSError:
+                self._count("errors")
+            finally:
+                self._queue.task_done()
+
+    def _scan(self) -> None:
+        """Dumps de execuções anteriores entram no orçamento, pelo mtime."""
+        # recomeça do zero: um writer novo depois de close() reencontra os próprios arquivos
+        self._files.clear()
+        self._total = 0
+        base = Path(self.root)
+        if not base.exists():
+            return
+        found = []
+        for p in base.iterdir():
+            if p.suffix in _ARTIFACT_SUFFIXES:
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, p, st.st_size))
+        for _, p, size in sorted(found, key=lambda f: f[0]):
+            self._files[p] = size
+            self._total += size
+
+    def _write(self, dump: _Dump) -> None:
+        base = Path(self.root)
+        base.mkdir(parents=True, exist_ok=True)
+        data = dump.html.encode("utf-8")
+        if self.compress:
+            self._store(base / f"{dump.name}.html.gz", gzip.compress(data, compresslevel=6))
+        else:
+            self._store(base / f"{dump.name}.html", data)
+        if dump.image is not None:
+            self._store(base / f"{dump.name}.{dump.image_ext}", dump.image)
+        self._evict()
+
+    def _store(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        # mesmo nome (mesma query/página) sobrescreve: sai da posição antiga
+        self._total -= self._files.pop(path, 0)
+        self._files[path] = len(data)
+        self._total += len(data)
+        with self._lock:
+            self.stats["written"] += 1
+            self.stats["bytes"] += len(data)
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and len(self._files) > 1:
+            path, size = self._files.popitem(last=False)
+            self._total -= size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self._count("evicted")
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (
+            f"dumps={s['captured']} | amostragem={s['sampled_out']} | limite/min={s['rate_limited']} "
+            f"| fila cheia={s['dropped']} | gravados={s['written']} ({s['bytes'] / 1e6:.1f} MB) "
+            f"| removidos={s['evicted']} | erros={s['errors']}"
+        )
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+# Uma captura (e um writer) por diretório: limite por site e orçamento valem
+# para todos os clients que gravam ali.
+_CAPTURES: Dict[str, DebugCapture] = {}
+_CAPTURES_LOCK = threading.Lock()
+
+
+def get_debug_capture(root: str = "logs/debug") -> DebugCapture:
+    """
+    DebugCapture compartilhada de `root`, configurada na criação por
+    DEBUG_SAMPLE, DEBUG_PER_MIN, DEBUG_SCREENSHOT, DEBUG_COMPRESS e DEBUG_MAX_MB.
+    """
+    key = str(Path(root).resolve())
+    with _CAPTURES_LOCK:
+        capture = _CAPTURES.get(key)
+        if capture is None:
+            capture = DebugCapture(
+                root=root,
+                sample_rate=_env_float("DEBUG_SAMPLE", 1.0),
+                max_per_minute=int(_env_float("DEBUG_PER_MIN", 6)),
+                compress=os.getenv("DEBUG_COMPRESS", "1").strip().lower() not in ("0", "false", "no", "nao", "não"),
+                screenshot=(os.getenv("DEBUG_SCREENSHOT") or "viewport").strip().lower(),
+                max_bytes=int(_env_float("DEBUG_MAX_MB", 50) * 1_000_000),
+            )
+            if not _CAPTURES:
+                atexit.register(shutdown_debug_capture)
+            _CAPTURES[key] = capture
+        return capture
+
+
+def shutdown_debug_capture() -> None:
+    """Grava o que estiver na fila e encerra os writers (chamado também no atexit)."""
+    with _CAPTURES_LOCK:
+        captures = list(_CAPTURES.values())
+        _CAPTURES.clear()
+    for capture in captures:
+        capture.close()
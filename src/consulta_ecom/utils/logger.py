@@ -1,8 +1,134 @@
 from __future__ import annotations
 
+import atexit
+import itertools
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from consulta_ecom.utils.timing import current_labels
+
+_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _env_flag(name: str) -> Optional[bool]:
+    v = os.getenv(name)
+    if v is None or not v.strip():
+        return None
+    return v.strip().lower() in ("1", "true", "yes", "sim", "y")
+
+
+def _env_rate(name: str) -> Optional[float]:
+    v = os.getenv(name)
+    if v is None or not v.strip():
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os rótulos site/query/page do PhaseTimer quando houver."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        labels = record.__dict__.get("labels")
+        data.update(current_labels() if labels is None else labels)
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _DebugSampler(logging.Filter):
+    """Deixa passar 1 a cada N registros DEBUG (linhas por item); INFO+ sempre passa."""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._n = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        return bool(self.every) and next(self._n) % self.every == 0
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    A fila é em memória: nada de format/cópia do registro no thread do
+    scraping. Só congela a mensagem e os rótulos do contexto atual (o
+    listener roda em outro thread e não enxerga o ContextVar).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        record.labels = current_labels()
+        return record
+
+
+def _build_handlers(
+    log_file: str, console: bool, json_format: bool, max_bytes: int, backup_count: int
+) -> List[logging.Handler]:
+    fmt: logging.Formatter = JsonFormatter() if json_format else logging.Formatter(_FORMAT, _DATEFMT)
+
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    fh = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    fh.setFormatter(fmt)
+    handlers: List[logging.Handler] = [fh]
+
+    if console:
+        sh = logging.StreamHandler()
+        sh.setFormatter(fmt)
+        handlers.append(sh)
+    return handlers
+
+
+# Um listener (thread) por destino: loggers que escrevem no mesmo arquivo
+# dividem a fila, e a rotação acontece só no thread do listener.
+_SINKS: Dict[Tuple[Any, ...], Tuple["queue.SimpleQueue[Any]", QueueListener]] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def _sink_queue(
+    log_file: str, console: bool, json_format: bool, max_bytes: int, backup_count: int
+) -> "queue.SimpleQueue[Any]":
+    key = (str(Path(log_file).resolve()), console, json_format, max_bytes, backup_count)
+    with _SINKS_LOCK:
+        found = _SINKS.get(key)
+        if found is not None:
+            return found[0]
+        q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        listener = QueueListener(q, *_build_handlers(log_file, console, json_format, max_bytes, backup_count))
+        listener.start()
+        if not _SINKS:
+            atexit.register(shutdown_logging)
+        _SINKS[key] = (q, listener)
+        return q
+
+
+def shutdown_logging() -> None:
+    """Esvazia as filas e fecha os arquivos (chamado também no atexit)."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+        _SINKS.clear()
+    for _, listener in sinks:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
 
 
 def setup_logger(
@@ -12,7 +138,16 @@ def setup_logger(
     console: bool = True,
     max_bytes: int = 2_000_000,
     backup_count: int = 5,
+    queued: Optional[bool] = None,
+    json_format: Optional[bool] = None,
+    debug_sample: Optional[float] = None,
 ) -> logging.Logger:
+    """
+    `queued=True` manda os registros por uma fila para um listener em
+    background (I/O e rotação fora do thread que loga). `json_format` grava
+    JSON lines. `debug_sample` (0..1) é a fração de linhas DEBUG mantidas.
+    None em qualquer um -> LOG_QUEUE / LOG_JSON / LOG_DEBUG_SAMPLE do ambiente.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     logger.propagate = False
@@ -20,16 +155,17 @@ def setup_logger(
     if logger.handlers:
         return logger
 
-    fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S")
+    queued = bool(_env_flag("LOG_QUEUE")) if queued is None else queued
+    json_format = bool(_env_flag("LOG_JSON")) if json_format is None else json_format
+    debug_sample = _env_rate("LOG_DEBUG_SAMPLE") if debug_sample is None else debug_sample
 
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-    fh = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    if debug_sample is not None and debug_sample < 1:
+        logger.addFilter(_DebugSampler(debug_sample))
 
-    if console:
-        sh = logging.StreamHandler()
-        sh.setFormatter(fmt)
-        logger.addHandler(sh)
+    if queued:
+        logger.addHandler(_InProcessQueueHandler(_sink_queue(log_file, console, json_format, max_bytes, backup_count)))
+    else:
+        for h in _build_handlers(log_file, console, json_format, max_bytes, backup_count):
+            logger.addHandler(h)
 
     return logger
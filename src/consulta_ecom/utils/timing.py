@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+# Rótulos (site, query, page) da unidade de trabalho atual. ContextVar isola
+# threads do BrowserRuntime e tasks asyncio sem passar nada pelas assinaturas.
+_LABELS: ContextVar[Dict[str, Any]] = ContextVar("consulta_ecom_timing_labels", default={})
+
+
+def current_labels() -> Dict[str, Any]:
+    """Rótulos (site/query/page) ativos neste thread/task; usados também pelos logs."""
+    return _LABELS.get()
+
+
+# Limites (s) do histograma exportado em texto Prometheus
+BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank: o menor valor com pelo menos `pct`% das amostras <= ele (0.0 sem amostras)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[min(k, len(ordered) - 1)]
+
+
+@dataclass(frozen=True)
+class Span:
+    phase: str
+    seconds: float
+    ts: float                       # epoch do fim da fase
+    site: str = ""
+    query: str = ""
+    page: Optional[int] = None
+
+
+class _Agg:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+
+class PhaseTimer:
+    """
+    Coletor de duração por fase (goto, networkidle, render, extract, ...).
+    `labels()` marca site/query/página da unidade atual e `span(fase)` mede
+    um trecho. Guarda agregados por (site, fase) para o export Prometheus e os
+    últimos `max_spans` spans para JSON lines; com `jsonl_path`, os spans vão
+    para o arquivo em lotes de `flush_every` (um handle aberto, escrita fora
+    do lock) e o resto em flush()/close(). Thread-safe.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, max_spans: int = 10_000, flush_every: int = 500) -> None:
+        self.jsonl_path = jsonl_path
+        self.flush_every = max(1, flush_every)
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._aggs: Dict[Tuple[str, str], _Agg] = {}
+        self._hooks: List[Callable[[Span], None]] = []
+        self._lock = threading.Lock()
+        self._pending: List[Span] = []        # ainda não gravados no jsonl_path
+        self._io_lock = threading.Lock()      # ordem das escritas entre threads
+        self._fh: Optional[TextIO] = None
+        if jsonl_path:
+            Path(jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def add_hook(self, fn: Callable[[Span], None]) -> None:
+        """fn(span) é chamado a cada fase medida (fora do lock)."""
+        self._hooks.append(fn)
+
+    @contextmanager
+    def labels(self, **labels: Any) -> Iterator[None]:
+        token = _LABELS.set({**_LABELS.get(), **labels})
+        try:
+            yield
+        finally:
+            _LABELS.reset(token)
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - t0)
+
+    def record(self, phase: str, seconds: float, **labels: Any) -> Span:
+        lb = {**_LABELS.get(), **labels} if labels else _LABELS.get()
+        span = Span(
+            phase=phase,
+            seconds=round(seconds, 6),
+            ts=time.time(),
+            site=str(lb.get("site", "")),
+            query=str(lb.get("query", "")),
+            page=lb.get("page"),
+        )
+        with self._lock:
+            self._spans.append(span)
+            agg = self._aggs.get((span.site, phase))
+            if agg is None:
+                agg = self._aggs[(span.site, phase)] = _Agg()
+            agg.add(seconds)
+            batch: Optional[List[Span]] = None
+            if self.jsonl_path:
+                self._pending.append(span)
+                if len(self._pending) >= self.flush_every:
+                    batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+        for hook in self._hooks:
+            try:
+                hook(span)
+            except Exception:
+                pass
+        return span
+
+    def _write(self, batch: List[Span]) -> None:
+        lines = "".join(json.dumps(asdict(s), ensure_ascii=False) + "\n" for s in batch)
+        with self._io_lock:
+            if self._fh is None:
+                self._fh = open(self.jsonl_path, "a", encoding="utf-8")  # type: ignore[arg-type]
+            self._fh.write(lines)
+            self._fh.flush()
+
+    def flush(self) -> None:
+        """Grava no jsonl_path os spans ainda em memória."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+
+    def close(self) -> None:
+        self.flush()
+        with self._io_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ------------------------------------------------------------------
+    # export
+    # ------------------------------------------------------------------
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(asdict(s), ensure_ascii=False) + "\n" for s in self.spans())
+
+    def prometheus_text(self, prefix: str = "consulta_ecom_phase_seconds") -> str:
+        with self._lock:
+            aggs = sorted(self._aggs.items())
+            lines = [
+                f"# HELP {prefix} Duração das fases do scraping por site.",
+                f"# TYPE {prefix} histogram",
+            ]
+            for (site, phase), agg in aggs:
+                lb = f'site="{site}",phase="{phase}"'
+                cumulative = 0
+                for le, n in zip((*BUCKETS, None), agg.buckets):
+                    cumulative += n
+                    le_txt = "+Inf" if le is None else repr(le)
+                    lines.append(f'{prefix}_bucket{{{lb},le="{le_txt}"}} {cumulative}')
+                lines.append(f"{prefix}_sum{{{lb}}} {agg.total:.6f}")
+                lines.append(f"{prefix}_count{{{lb}}} {agg.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """'site/fase' -> {count, total, avg, max} (segundos)."""
+        with self._lock:
+            return {
+                f"{site}/{phase}": {
+                    "count": agg.count,
+                    "total": round(agg.total, 3),
+                    "avg": round(agg.total / agg.count, 3) if agg.count else 0.0,
+                    "max": round(agg.max, 3),
+                }
+                for (site, phase), agg in sorted(self._aggs.items())
+            }
+
+    def format_summary(self) -> str:
+        return " | ".join(
+            f"{key}: n={v['count']} avg={v['avg'] * 1000:.0f}ms max={v['max'] * 1000:.0f}ms"
+            for key, v in self.summary().items()
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._aggs.clear()
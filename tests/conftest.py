@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# o pacote fica em src/ (sem instalação): os testes importam direto de lá
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
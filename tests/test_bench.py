@@ -0,0 +1,28 @@
+import importlib
+import sys
+
+from consulta_ecom.bench import runner
+
+
+def test_runner_imports_and_samples_without_resource(monkeypatch):
+    # Windows: não há módulo resource (None em sys.modules faz o import falhar)
+    monkeypatch.setitem(sys.modules, "resource", None)
+    mod = importlib.reload(runner)
+    try:
+        sampler = mod._RssSampler()
+        sampler._proc = None
+        assert sampler._sample() == 0
+        result = mod.BenchResult(mod.BenchConfig("pichau"), wall=1.0, pages=2)
+        assert "n/a" in mod.format_results([result])
+    finally:
+        monkeypatch.undo()
+        importlib.reload(runner)
+
+
+def test_dom_mode_configs_run_without_next_data():
+    configs = runner.default_matrix(("kabum",), concurrency=(1,))
+    assert [(c.extraction_mode, c.next_data) for c in configs] == [
+        ("batch", False), ("html", False), ("locator", False)
+    ]
+    with_json = runner.default_matrix(("kabum",), concurrency=(1,), next_data=True)
+    assert [c.name for c in with_json if c.next_data] == ["kabum/headless/batch/c1/next_data"]
@@ -0,0 +1,35 @@
+import pytest
+
+from consulta_ecom import cli
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.db.postgres import DatabaseManager
+
+
+class _FailingClient:
+    """Entrega uma página e falha na segunda."""
+
+    def iter_pages(self, query, limit=10, max_pages=1):
+        yield [ProductItem("Controle DualSense", 399.9, "https://www.kabum.com.br/produto/1/x", None, "kabum", 1)]
+        raise RuntimeError("página 2 caiu")
+
+
+def test_search_closes_the_db_even_when_the_search_fails(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'db.sqlite'}")
+    monkeypatch.setenv("PRICE_HISTORY", "0")
+    monkeypatch.setenv("LOG_CONSOLE", "0")
+    monkeypatch.setattr(cli, "create_client", lambda site, **kw: _FailingClient())
+    closed = []
+    real_close = DatabaseManager.close
+    monkeypatch.setattr(DatabaseManager, "close", lambda self: (closed.append(self), real_close(self)))
+
+    with pytest.raises(RuntimeError, match="página 2"):
+        cli.main(["search", "kabum", "controle ps5", "--save"])
+
+    assert len(closed) == 1
+    # a página 1 já estava gravada antes da falha
+    db = DatabaseManager(log_console=False, log_file=str(tmp_path / "log.txt"))
+    try:
+        assert len(db.load_prices("kabum")) == 1
+    finally:
+        db.close()
@@ -0,0 +1,93 @@
+import io
+import math
+
+import pytest
+
+from consulta_ecom.clients import columnar
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.clients.columnar import ProductBatch
+
+ITEMS = [
+    ProductItem("Controle DualSense Branco", 399.9, "https://www.kabum.com.br/produto/1/branco",
+                "https://images.kabum.com.br/produtos/1.jpg", "kabum", 1),
+    ProductItem("Controle DualSense Edge", None, "https://www.kabum.com.br/produto/2/edge", None, "kabum", 1),
+    ProductItem("Controle DualSense Preto", 379.9, "https://www.pichau.com.br/controle-preto",
+                "https://media.pichau.com.br/p.jpg", "pichau", 2),
+    ProductItem("Controle DualSense Cosmic Red", 349.9, "https://www.kabum.com.br/produto/3/red", None, "kabum", 3),
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def agg_backend(request, monkeypatch):
+    """Agregações pelos dois caminhos: NumPy (quando instalado) e Python puro."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "_numpy", lambda: None)
+    return request.param
+
+
+def test_list_round_trip():
+    batch = ProductBatch(ITEMS)
+    assert len(batch) == 4
+    assert list(batch) == ITEMS
+    assert batch[-1] == ITEMS[-1]
+    assert batch.sources == ["kabum", "pichau"]
+    with pytest.raises(IndexError):
+        batch[4]
+
+
+def test_slice_take_and_by_source():
+    batch = ProductBatch(ITEMS)
+    assert list(batch[1:3]) == ITEMS[1:3]
+    assert list(batch[::-1]) == ITEMS[::-1]
+    assert list(batch.by_source("pichau")) == [ITEMS[2]]
+    assert len(batch.by_source("dafiti")) == 0
+
+
+def test_extend_remaps_tables():
+    a = ProductBatch(ITEMS[2:3])          # pichau primeiro: códigos diferentes de b
+    b = ProductBatch(ITEMS[:2])
+    merged = ProductBatch.concat([a, b, ITEMS[3:]])
+    assert list(merged) == [ITEMS[2], *ITEMS[:2], ITEMS[3]]
+    assert merged.count_by_source() == {"pichau": 1, "kabum": 3}
+
+
+def test_csv_round_trip(tmp_path):
+    batch = ProductBatch(ITEMS)
+    buf = io.StringIO()
+    batch.to_csv(buf)
+    assert buf.getvalue().splitlines()[0] == ",".join(columnar.CSV_COLUMNS)
+    assert list(ProductBatch.from_csv(io.StringIO(buf.getvalue()))) == ITEMS
+
+    path = tmp_path / "out" / "itens.csv"
+    batch.to_csv(path)
+    assert list(ProductBatch.from_csv(path)) == ITEMS
+
+
+def test_aggregations_by_source(agg_backend):
+    batch = ProductBatch(ITEMS)
+    assert batch.min_price_by_source() == {"kabum": 349.9, "pichau": 379.9}
+    assert batch.cheapest_by_source() == {"kabum": ITEMS[3], "pichau": ITEMS[2]}
+    # loja só com itens sem preço fica de fora
+    only_none = ProductBatch([ITEMS[1]])
+    assert only_none.min_price_by_source() == {}
+    assert only_none.cheapest_by_source() == {}
+
+
+def test_numpy_round_trip():
+    np = pytest.importorskip("numpy")
+    cols = ProductBatch(ITEMS).to_numpy()
+    assert cols["price"].dtype == np.float64 and math.isnan(cols["price"][1])
+    assert list(cols["source"]) == ["kabum", "kabum", "pichau", "kabum"]
+    assert list(ProductBatch.from_numpy(cols)) == ITEMS
+
+
+def test_arrow_round_trip_and_sliced_tables():
+    pytest.importorskip("pyarrow")
+    table = ProductBatch(ITEMS).to_arrow()
+    assert table.column("price").null_count == 1
+    assert table.column("image").to_pylist() == [it.image for it in ITEMS]
+    assert list(ProductBatch.from_arrow(table)) == ITEMS
+    # fatia com offset != 0 nos buffers
+    assert list(ProductBatch.from_arrow(table.slice(1, 2))) == ITEMS[1:3]
@@ -0,0 +1,41 @@
+import threading
+
+from consulta_ecom.clients.base import ProductItem, url_hash
+from consulta_ecom.db.postgres import DatabaseManager
+
+
+def _item(n: int, price: float) -> ProductItem:
+    return ProductItem(
+        title=f"Produto {n}", price=price, url=f"https://www.kabum.com.br/produto/{n}/x", image=None, source="kabum", page=1
+    )
+
+
+def test_memory_database_is_shared_by_the_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRICE_HISTORY", "0")
+    db = DatabaseManager(url="sqlite:///:memory:", pool_size=4, log_console=False, log_file=str(tmp_path / "log.txt"))
+    db.init_db()
+    assert db.pool.max_size == 1
+
+    threads = [threading.Thread(target=db.save_products, args=([_item(i, 10.0 + i)],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert db.count("kabum") == 8
+    assert db.load_prices("kabum")[url_hash(_item(3, 0).url)] == 13.0
+    db.close()
+
+
+def test_touch_updates_last_seen_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRICE_HISTORY", "0")
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'db.sqlite'}", log_console=False, log_file=str(tmp_path / "log.txt"))
+    db.init_db()
+    db.save_products([_item(1, 10.0)])
+    with db.pool.connection() as conn:
+        first, seen = conn.execute("SELECT first_seen, last_seen FROM products").fetchone()
+    assert db.touch([url_hash(_item(1, 0).url)] * 2) == 1
+    with db.pool.connection() as conn:
+        first2, seen2 = conn.execute("SELECT first_seen, last_seen FROM products").fetchone()
+    assert first2 == first and seen2 >= seen
+    db.close()
@@ -0,0 +1,68 @@
+from consulta_ecom.bench.fixtures import FixtureSet
+from consulta_ecom.utils.debug_capture import DebugCapture, read_debug_html
+
+
+def test_dumps_are_gzipped_and_usable_as_fixtures(tmp_path):
+    capture = DebugCapture(root=str(tmp_path), screenshot="off")
+    assert capture.should_capture("kabum")
+    html = "<html><body>" + "<a href='/produto/1/x'>Controle</a>" * 200 + "</body></html>"
+    assert capture.submit("kabum_controle_ps5_p2_links0", html)
+    capture.close()
+
+    path = tmp_path / "kabum_controle_ps5_p2_links0.html.gz"
+    assert path.stat().st_size < len(html)
+    assert read_debug_html(path) == html
+    assert FixtureSet(str(tmp_path)).lookup("kabum", "controle ps5", 2) == path
+
+
+def test_rate_limit_and_sampling_per_site(tmp_path):
+    capture = DebugCapture(root=str(tmp_path), max_per_minute=2)
+    assert [capture.should_capture("kabum") for _ in range(3)] == [True, True, False]
+    assert capture.should_capture("pichau")
+    assert not DebugCapture(root=str(tmp_path), sample_rate=0.0).should_capture("kabum")
+
+
+def test_budget_evicts_oldest_first(tmp_path):
+    capture = DebugCapture(root=str(tmp_path), compress=False, screenshot="off", max_per_minute=0, max_bytes=2500)
+    for i in range(4):
+        capture.submit(f"kabum_q_p{i}_links0", "x" * 1000)
+        capture.flush()
+    capture.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["kabum_q_p2_links0.html", "kabum_q_p3_links0.html"]
+    assert capture.stats["evicted"] == 2
+
+
+def test_writer_restart_does_not_count_existing_dumps_twice(tmp_path):
+    capture = DebugCapture(root=str(tmp_path), compress=False, screenshot="off", max_per_minute=0, max_bytes=2500)
+    capture.submit("a", "x" * 1000)
+    capture.close()
+    capture.submit("b", "x" * 1000)
+    capture.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.html", "b.html"]
+    assert capture.stats["evicted"] == 0
+
+
+class _TitlelessPage:
+    def content(self) -> str:
+        return "<html><body>vazio</body></html>"
+
+    def screenshot(self, **kw) -> bytes:
+        return b"\xff\xd8jpeg"
+
+    def title(self) -> str:
+        raise RuntimeError("page closed")
+
+
+def test_dump_debug_survives_title_failure(tmp_path):
+    from consulta_ecom.sites.kabum import KabumClient
+
+    capture = DebugCapture(root=str(tmp_path / "debug"), max_per_minute=0)
+    client = KabumClient(
+        log_file=str(tmp_path / "kabum.log"), log_console=False, debug_dir=str(tmp_path / "debug"),
+        debug_capture=capture,
+    )
+    client._dump_debug(_TitlelessPage(), 1, "links0", "controle ps5")
+    capture.close()
+    assert sorted(p.name for p in (tmp_path / "debug").iterdir()) == [
+        "kabum_controle_ps5_p1_links0.html.gz", "kabum_controle_ps5_p1_links0.jpg"
+    ]
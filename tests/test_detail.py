@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from consulta_ecom.cache.detail_cache import DetailCache
+from consulta_ecom.clients.base import ProductDetail
+from consulta_ecom.parsers.detail import parse_product_detail
+
+FIXTURES = Path(__file__).parent / "fixtures"
+URL = "https://www.kabum.com.br/produto/234567/controle-sony-dualsense-edge-ps5"
+
+
+def _detail(name: str) -> ProductDetail:
+    return parse_product_detail((FIXTURES / name).read_text(encoding="utf-8"), URL)
+
+
+def test_detail_from_ld_json():
+    d = _detail("pichau_product_ld.html")
+    assert (d.price_pix, d.in_stock, d.seller) == (379.90, True, "Pichau")
+    assert (d.installments, d.installment_value, d.price_installments) == (12, 36.66, 439.90)
+    # JSON-LD primeiro; a tabela só completa o que faltava
+    assert d.specs == {"Conectividade": "Bluetooth 5.1", "Bateria": "1560 mAh", "Marca": "Sony"}
+
+
+def test_detail_from_next_data():
+    d = _detail("kabum_product_next_data.html")
+    assert (d.price_pix, d.price_installments, d.in_stock, d.seller) == (1299.99, 1529.40, True, "KaBuM!")
+    assert (d.installments, d.installment_value) == (10, 152.94)
+
+
+def test_detail_from_buy_box_text():
+    d = _detail("kabum_product_dom.html")
+    # o "R$ 9,90" do menu fica fora da caixa de compra
+    assert (d.price_pix, d.installments, d.installment_value) == (349.90, 10, 41.16)
+    assert (d.in_stock, d.seller) == (False, "KaBuM!")
+    assert d.specs == {"Cor": "Cosmic Red", "Garantia": "12 meses"}
+
+
+def test_detail_empty_html():
+    assert parse_product_detail("", URL) == ProductDetail(url=URL)
+
+
+def test_detail_cache_is_keyed_by_card_price(tmp_path):
+    cache = DetailCache(root=str(tmp_path))
+    detail = _detail("kabum_product_next_data.html")
+    cache.put(URL, 1299.99, detail)
+
+    assert cache.get(URL, 1299.99) == detail
+    # preço do card mudou: a página do produto precisa ser lida de novo
+    assert cache.get(URL, 1199.99) is None
+    assert (cache.stats["hits"], cache.stats["changed"]) == (1, 1)
+
+
+def test_detail_cache_expires(tmp_path):
+    cache = DetailCache(root=str(tmp_path), ttl=-1.0)
+    cache.put(URL, 10.0, ProductDetail(url=URL))
+    assert cache.get(URL, 10.0) is None
+    assert cache.stats["expired"] == 1
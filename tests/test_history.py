@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+from consulta_ecom.clients.base import ProductItem, url_hash
+from consulta_ecom.db.history import PriceHistoryStore
+from consulta_ecom.db.postgres import DatabaseManager
+
+
+def _item(n: int, price: float, source: str = "kabum") -> ProductItem:
+    return ProductItem(
+        title=f"Produto {n}", price=price, url=f"https://www.kabum.com.br/produto/{n}/x", image=None, source=source, page=1
+    )
+
+
+def test_history_skips_segments_without_the_url(tmp_path, monkeypatch):
+    store = PriceHistoryStore(root=str(tmp_path))
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    store.append([_item(1, 100.0), _item(2, 50.0)], ts=t0)
+    store.append([_item(2, 45.0)], ts=t0 + timedelta(hours=1))
+    store.append([_item(1, 80.0)], ts=t0 + timedelta(hours=2))
+    assert len(list(tmp_path.glob("source=kabum/*.bloom"))) == 3
+
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *a, **kw):
+        opened.append(str(path))
+        return real_open(path, *a, **kw)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    series = PriceHistoryStore(root=str(tmp_path)).history(_item(1, 0).url)
+    assert [o.price for o in series] == [100.0, 80.0]
+    assert sum(p.endswith(".seg") for p in opened) == 2
+
+
+def test_missing_bloom_is_rebuilt(tmp_path):
+    store = PriceHistoryStore(root=str(tmp_path))
+    store.append([_item(1, 100.0)])
+    for p in tmp_path.glob("source=kabum/*.bloom"):
+        p.unlink()
+    assert [o.price for o in PriceHistoryStore(root=str(tmp_path)).history(url_hash(_item(1, 0).url))] == [100.0]
+    assert len(list(tmp_path.glob("source=kabum/*.bloom"))) == 1
+
+
+def test_save_products_appends_a_cycle(tmp_path):
+    store = PriceHistoryStore(root=str(tmp_path / "history"))
+    db = DatabaseManager(url=f"sqlite:///{tmp_path / 'db.sqlite'}", history=store, log_console=False,
+                         log_file=str(tmp_path / "log.txt"))
+    db.init_db()
+    db.save_products([_item(1, 100.0), _item(2, 50.0)])
+    db.save_products([_item(1, 70.0), _item(2, 50.0)])
+    db.save_products([_item(3, 10.0)], history=False)
+    db.close()
+
+    assert len(store.cycles("kabum")) == 2
+    drops = store.price_drops(10)
+    assert [(d.url_hash, d.old_price, d.new_price) for d in drops] == [(url_hash(_item(1, 0).url), 100.0, 70.0)]
+
+
+def test_price_drops_compare_with_last_observation_in_older_cycles(tmp_path):
+    # incremental: o item 1 não muda no 2º ciclo e fica fora do segmento
+    store = PriceHistoryStore(root=str(tmp_path))
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    store.append([_item(1, 100.0), _item(2, 50.0)], ts=t0)
+    store.append([_item(2, 48.0)], ts=t0 + timedelta(hours=1))
+    store.append([_item(1, 70.0), _item(2, 47.0), _item(3, 10.0)], ts=t0 + timedelta(hours=2))
+
+    drops = store.price_drops(10)
+    assert [(d.url_hash, d.old_price, d.new_price, d.pct) for d in drops] == [
+        (url_hash(_item(1, 0).url), 100.0, 70.0, 30.0)
+    ]
+    assert [d.old_price for d in store.price_drops(2)] == [100.0, 48.0]
@@ -0,0 +1,51 @@
+import asyncio
+from pathlib import Path
+
+from consulta_ecom.cache.page_cache import PageCache
+from consulta_ecom.sites.kabum_async import AsyncKabumClient
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _FakePage:
+    """Só o que os caminhos html/batch usam; evaluate falha para forçar o fallback."""
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self.evaluated = 0
+
+    async def content(self) -> str:
+        return self.html
+
+    async def evaluate(self, *args):
+        self.evaluated += 1
+        raise RuntimeError("sem JS")
+
+
+def _client(tmp_path, **kw) -> AsyncKabumClient:
+    return AsyncKabumClient(log_file=str(tmp_path / "kabum.log"), log_console=False, debug_enabled=False, **kw)
+
+
+def test_async_html_mode_parses_page_content(tmp_path):
+    client = _client(tmp_path, extraction_mode="html")
+    page = _FakePage((FIXTURES / "kabum_search.html").read_text(encoding="utf-8"))
+
+    res = asyncio.run(client._extract_products_from_dom(page, ["controle", "ps5"], 1))
+
+    assert page.evaluated == 0
+    assert res.links_dom == 4
+    assert [it.price for it in res.items] == [399.90, 1299.99, 2999.90]
+
+
+def test_async_cache_hit_reads_off_the_event_loop(tmp_path):
+    cache = PageCache(root=str(tmp_path / "cache"))
+    client = _client(tmp_path, page_cache=cache)
+    url = client._build_url_100("controle ps5", 1)
+    cache.put(url, (FIXTURES / "kabum_search.html").read_text(encoding="utf-8"))
+
+    # runtime=None: um cache hit não pode chegar a pedir página ao browser
+    res = asyncio.run(client._fetch_page(None, "controle ps5", ["controle", "ps5"], 1))
+
+    assert cache.stats["hits"] == 1
+    assert res.links_dom == 4
+    assert len(res.items) == 3
@@ -0,0 +1,51 @@
+from consulta_ecom.clients.base import ProductItem
+from consulta_ecom.matching.index import ProductMatcher, best_price_view, match_products
+
+
+def _item(title: str, price: float, source: str, n: int) -> ProductItem:
+    host = "https://www.kabum.com.br/produto" if source == "kabum" else "https://www.pichau.com.br"
+    return ProductItem(title=title, price=price, url=f"{host}/{n}", image=None, source=source, page=1)
+
+
+def _titles(groups):
+    return sorted(sorted(it.title for it in g.items) for g in groups)
+
+
+def test_same_product_merges_across_sources():
+    groups = match_products([
+        _item("Controle Sony DualSense PS5, Sem Fio, Branco", 399.90, "kabum", 1),
+        _item("Controle PlayStation 5 DualSense Wireless Branco Sony - 1000038899", 379.90, "pichau", 2),
+        _item("Headset Gamer HyperX Cloud II", 499.90, "kabum", 3),
+    ])
+    cross = [g for g in groups if len(g.sources) == 2]
+    assert len(groups) == 2 and len(cross) == 1
+    (g,) = best_price_view(groups)
+    assert (g.best.source, g.spread) == ("pichau", 20.0)
+
+
+def test_edition_and_color_variants_stay_apart():
+    groups = match_products([
+        _item("Controle Sony DualSense PS5 Sem Fio Branco", 399.90, "kabum", 1),
+        _item("Controle Sony DualSense PS5 Sem Fio Preto", 409.90, "kabum", 2),
+        _item("Controle Sony DualSense Edge PS5 Sem Fio Branco", 1299.90, "pichau", 3),
+        _item("Controle Sony DualSense PS5 Sem Fio Preto", 389.90, "pichau", 4),
+    ])
+    assert _titles(groups) == [
+        ["Controle Sony DualSense Edge PS5 Sem Fio Branco"],
+        ["Controle Sony DualSense PS5 Sem Fio Branco"],
+        ["Controle Sony DualSense PS5 Sem Fio Preto", "Controle Sony DualSense PS5 Sem Fio Preto"],
+    ]
+
+
+def test_full_bucket_does_not_hide_a_later_match():
+    # variantes de cor enchem os (poucos) baldes antes do item que a outra loja também tem
+    matcher = ProductMatcher(bands=2, rows=1, max_bucket=2)
+    colors = ["Branco", "Preto", "Azul", "Rosa", "Verde", "Cinza"]
+    matcher.add(_item(f"Controle Sony DualSense PS5 Sem Fio {c}", 399.90, "kabum", n) for n, c in enumerate(colors))
+    matcher.add([_item("Controle Sony DualSense PS5 Sem Fio Roxo", 429.90, "kabum", 10)])
+    matcher.add([_item("Controle DualSense Sony PS5 Wireless Roxo CFI-ZCT1W", 399.00, "pichau", 11)])
+
+    (group,) = matcher.groups(min_sources=2)
+    assert [it.url for it in group.items] == [
+        "https://www.kabum.com.br/produto/10", "https://www.pichau.com.br/11"
+    ]
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from consulta_ecom.parsers import kabum, pichau
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _html(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def _rows(items):
+    return [(it.title, it.price, it.url, it.image) for it in items]
+
+
+def test_kabum_search_page_from_dom():
+    page = kabum.parse_search_page(_html("kabum_search.html"), "controle ps5")
+    assert page.links_dom == 4
+    assert _rows(page.items) == [
+        (
+            "Controle Sony DualSense PS5, Sem Fio, Branco",
+            399.90,
+            "https://www.kabum.com.br/produto/123456/controle-sony-dualsense-ps5-branco",
+            "https://images.kabum.com.br/produtos/fotos/123456/controle-dualsense_m.jpg",
+        ),
+        (
+            "Controle Sony DualSense Edge PS5, Sem Fio, Preto",
+            1299.99,
+            "https://www.kabum.com.br/produto/234567/controle-sony-dualsense-edge-ps5",
+            "https://images.kabum.com.br/produtos/fotos/234567/dualsense-edge_m.jpg",
+        ),
+        (
+            # só "R$ 2.999,90 em até 10x": o total a prazo é o preço
+            "Controle Sony DualSense PS5 Cosmic Red",
+            2999.90,
+            "https://www.kabum.com.br/produto/345678/controle-dualsense-ps5-cosmic-red",
+            "https://images.kabum.com.br/produtos/fotos/345678/cosmic-red_m.jpg",
+        ),
+    ]
+    assert all(it.source == "kabum" and it.page == 1 for it in page.items)
+
+
+def test_kabum_next_data_payload():
+    records, total = kabum.records_from_next_data(_html("kabum_next_data.html"))
+    assert total == 2
+    assert [r["href"] for r in records] == [
+        "/produto/123456/controle-sony-dualsense-ps5-branco",
+        "/produto/234567/controle-sony-dualsense-edge-ps5",
+    ]
+
+    items = kabum.parse_search_html(_html("kabum_next_data.html"), "controle ps5", page_idx=2)
+    assert _rows(items) == [
+        (
+            "Controle Sony DualSense PS5, Sem Fio, Branco",
+            399.90,
+            "https://www.kabum.com.br/produto/123456/controle-sony-dualsense-ps5-branco",
+            "https://images.kabum.com.br/produtos/fotos/123456/controle-dualsense_m.jpg",
+        ),
+        (
+            # offer.priceWithDiscount vale mais que o price do produto
+            "Controle Sony DualSense Edge PS5, Sem Fio, Preto",
+            1199.99,
+            "https://www.kabum.com.br/produto/234567/controle-sony-dualsense-edge-ps5",
+            "https://images.kabum.com.br/produtos/fotos/234567/dualsense-edge_m.jpg",
+        ),
+    ]
+    assert {it.page for it in items} == {2}
+
+
+def test_kabum_without_next_data_falls_back_to_dom():
+    assert kabum.records_from_next_data(_html("kabum_search.html")) is None
+
+
+def test_pichau_search_page():
+    items = pichau.parse_search_html(_html("pichau_search.html"), "controle ps5")
+    assert _rows(items) == [
+        (
+            "Controle Sony DualSense PS5 Branco, CFI-ZCT1W",
+            419.90,
+            "https://www.pichau.com.br/controle-sony-dualsense-ps5-branco-cfi-zct1w",
+            "https://media.pichau.com.br/media/catalog/product/cache/dualsense-branco.jpg",
+        ),
+        (
+            "Controle Sony DualSense PS5 Midnight Black",
+            449.90,
+            "https://www.pichau.com.br/controle-sony-dualsense-ps5-midnight-black",
+            "https://media.pichau.com.br/media/catalog/product/cache/dualsense-black.jpg",
+        ),
+    ]
+    assert all(it.source == "pichau" for it in items)
+
+
+@pytest.mark.parametrize("html", ["", "<html><body><main></main></body></html>"])
+def test_empty_pages(html):
+    assert kabum.parse_search_page(html, "controle ps5").items == []
+    assert pichau.parse_search_html(html, "controle ps5") == []
+
+
+def test_kabum_incremental_reports_unchanged_hashes():
+    from consulta_ecom.clients.base import url_hash
+
+    url = "https://www.kabum.com.br/produto/123456/controle-sony-dualsense-ps5-branco"
+    changed = "https://www.kabum.com.br/produto/234567/controle-sony-dualsense-edge-ps5"
+    known = {url_hash(url): 399.90, url_hash(changed): 1399.99}
+    page = kabum.parse_search_page(_html("kabum_search.html"), "controle ps5", known=known)
+
+    assert page.unchanged == 1
+    assert page.unchanged_hashes == [url_hash(url)]
+    assert [it.url for it in page.items][:1] == [changed]
@@ -0,0 +1,24 @@
+import asyncio
+from pathlib import Path
+from urllib.parse import quote_plus
+
+from consulta_ecom.cache.page_cache import PageCache
+from consulta_ecom.sites.pichau_async import AsyncPichauClient
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_async_cache_hit_reads_off_the_event_loop(tmp_path):
+    cache = PageCache(root=str(tmp_path / "cache"))
+    client = AsyncPichauClient(
+        log_file=str(tmp_path / "pichau.log"), log_console=False, page_cache=cache, block_profile=None
+    )
+    url = f"{client.BASE_URL}/search?q={quote_plus('controle ps5')}&p=1"
+    cache.put(url, (FIXTURES / "pichau_search.html").read_text(encoding="utf-8"))
+
+    # page=None: um cache hit não pode chegar a usar o browser
+    report = asyncio.run(client._search_on_page(None, "controle ps5", limit=10, max_pages=1))
+
+    assert cache.stats["hits"] == 1
+    assert report.links_per_page == [3]
+    assert len(report.items) == 2
@@ -0,0 +1,64 @@
+import pytest
+
+from consulta_ecom.parsers.price import parse_json_price, parse_price
+
+
+@pytest.mark.parametrize(
+    "text, price",
+    [
+        ("R$ 399,90 à vista", 399.90),
+        ("de R$ 500,00 por R$ 399,90 no PIX", 399.90),
+        ("R$ 499,90\nR$ 399,90\nÀ vista no PIX\n10x de R$ 44,43", 399.90),
+        ("R$ 1.299,99", 1299.99),
+        ("1.299,99", 1299.99),
+        # valor numa linha, parcelas na seguinte: o valor é o à vista
+        ("Controle DualSense\nR$ 399,90\n12x de R$ 38,45 sem juros", 399.90),
+        # só o total a prazo no card: é o preço que sobra
+        ("R$ 2.999,90 em até 10x sem juros", 2999.90),
+        ("10x de R$ 49,90", 499.00),
+        ("sem preço", None),
+    ],
+)
+def test_parse_price(text, price):
+    assert parse_price(text).price == price
+
+
+def test_cash_line_before_installments():
+    info = parse_price("Controle DualSense\nR$ 399,90\n12x de R$ 38,45 sem juros")
+    assert info.cash == 399.90
+    assert (info.installments, info.installment_value) == (12, 38.45)
+    assert info.installment_total == 461.40
+
+
+def test_stated_installment_total_kept():
+    info = parse_price("R$ 1.999,90 à vista\nR$ 2.299,90 em até 10x de R$ 229,99")
+    assert info.cash == 1999.90
+    assert info.stated_total == 2299.90
+    assert info.installment_total == 2299.90
+
+
+def test_list_price_only_above_cash():
+    info = parse_price("de R$ 500,00 por R$ 399,90 no PIX")
+    assert (info.cash, info.list_price) == (399.90, 500.0)
+
+
+@pytest.mark.parametrize(
+    "value, price",
+    [(1234.56, 1234.56), ("1234.56", 1234.56), ("R$ 1.234,56", 1234.56), (True, None), (0, None), ("", None)],
+)
+def test_parse_json_price(value, price):
+    assert parse_json_price(value) == price
+
+
+def test_installment_with_filler_words():
+    info = parse_price("12x sem juros de R$ 25,00")
+    assert info.cash is None
+    assert (info.installments, info.installment_value) == (12, 25.0)
+    assert info.price == 300.0
+
+
+def test_installment_total_with_em_nx():
+    info = parse_price("R$ 399,90 em 10x sem juros")
+    assert info.cash is None
+    assert info.stated_total == 399.90
+    assert info.price == 399.90
@@ -0,0 +1,27 @@
+import sys
+import types
+
+import pytest
+
+from consulta_ecom.browser.runtime import BrowserRuntime
+
+
+def test_playwright_start_failure_fails_jobs_instead_of_hanging(tmp_path, monkeypatch):
+    def sync_playwright():
+        raise RuntimeError("Executable doesn't exist")
+
+    fake = types.ModuleType("playwright.sync_api")
+    fake.sync_playwright = sync_playwright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.sync_api", fake)
+
+    runtime = BrowserRuntime(max_contexts=2, log_file=str(tmp_path / "log.txt"), log_console=False)
+    try:
+        runtime.warm_up(timeout=5)
+        futures = [runtime.submit(lambda page: page) for _ in range(3)]
+        for fut in futures:
+            with pytest.raises(RuntimeError, match="Executable"):
+                fut.result(timeout=5)
+    finally:
+        runtime.close()
+    assert runtime.stats["jobs"] == 0
@@ -0,0 +1,63 @@
+import re
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from consulta_ecom.cache.page_cache import PageCache
+from consulta_ecom.clients.stream import BoundedStream
+from consulta_ecom.sites.kabum import KabumClient
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class _InlineRuntime:
+    """Roda cada job na hora, sem browser (as páginas vêm do cache)."""
+
+    max_contexts = 1
+
+    def __init__(self) -> None:
+        self.jobs = 0
+
+    def submit(self, fn) -> Future:
+        self.jobs += 1
+        fut: Future = Future()
+        fut.set_result(fn(None))
+        return fut
+
+
+def _client(tmp_path) -> KabumClient:
+    cache = PageCache(root=str(tmp_path / "cache"))
+    client = KabumClient(
+        log_file=str(tmp_path / "kabum.log"), log_console=False, debug_enabled=False, page_cache=cache,
+        runtime=_InlineRuntime(),
+    )
+    html = (FIXTURES / "kabum_search.html").read_text(encoding="utf-8")
+    for page in (1, 2, 3):
+        # produtos diferentes por página
+        cache.put(
+            client._build_url_100("controle ps5", page),
+            re.sub(r"/produto/(\d+)", lambda m: f"/produto/{page}{m.group(1)}", html),
+        )
+    return client
+
+
+def test_iter_pages_yields_one_batch_per_page_and_stops_at_limit(tmp_path):
+    client = _client(tmp_path)
+
+    batches = list(client.iter_pages("controle ps5", limit=5, max_pages=3))
+
+    assert [len(b) for b in batches] == [3, 2]
+    assert [b[0].page for b in batches] == [1, 2]
+    assert client.runtime.jobs == 2  # a página 3 nem é pedida
+
+
+def test_bounded_stream_delivers_producer_error():
+    stream: BoundedStream[int] = BoundedStream(2)
+    stream.put(1)
+    stream.finish(ValueError("falhou"))
+    got = []
+    with pytest.raises(ValueError, match="falhou"):
+        for item in stream:
+            got.append(item)
+    assert got == [1]
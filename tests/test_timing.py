@@ -0,0 +1,36 @@
+import pytest
+
+from consulta_ecom.utils.timing import percentile
+
+
+@pytest.mark.parametrize(
+    "values, pct, expected",
+    [
+        ([1, 2], 50, 1),
+        (range(1, 7), 50, 3),
+        (range(1, 21), 95, 19),
+        (range(1, 21), 100, 20),
+        ([5.0], 95, 5.0),
+        ([3, 1, 2], 50, 2),
+        ([], 50, 0.0),
+    ],
+)
+def test_percentile_nearest_rank(values, pct, expected):
+    assert percentile(list(values), pct) == expected
+
+
+def test_jsonl_spans_are_buffered_until_flush(tmp_path):
+    import json
+
+    from consulta_ecom.utils.timing import PhaseTimer
+
+    path = tmp_path / "spans.jsonl"
+    timer = PhaseTimer(jsonl_path=str(path), flush_every=3)
+    for i in range(4):
+        timer.record("goto", 0.1 * i, site="kabum")
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    timer.close()
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [r["seconds"] for r in rows] == [0.0, 0.1, 0.2, 0.3]
+    assert {r["site"] for r in rows} == {"kabum"}